@@ -3,16 +3,22 @@
 
 import streamlit as st
 import pandas as pd
-import requests
 from datetime import datetime, date, time
-import time as time_module
 from urllib.parse import quote_plus, urlencode
 import base64
 import pytz
 
 # --- IMPORT DER STREAM UI FUNKTIONEN ---
 # (Stelle sicher, dass src/stream_ui.py existiert)
-from src.stream_ui import render_obs_starting5, render_obs_potg, render_obs_standings, render_obs_comparison
+from src.stream_ui import render_obs_starting5, render_obs_potg, render_obs_standings, render_obs_comparison, render_obs_final_banner, render_obs_scoreboard
+from src import tracing
+from src.config import require_api_key
+
+# Ohne API-Key (Secrets) kontrolliert abbrechen, bevor eine Seite lädt
+require_api_key()
+
+# Laufzeitmessung für diesen Durchlauf neu beginnen (Entwickler-Panel, siehe src/tracing.py)
+tracing.begin_run()
 
 # 1. OBS ROUTING (GANZ OBEN)
 # Fängt Anfragen für OBS ab, bevor das normale Dashboard geladen wird.
@@ -30,6 +36,12 @@ if "view" in st.query_params:
     elif view_mode == "obs_potg":
         render_obs_potg()
         st.stop()
+    elif view_mode == "obs_final_banner":
+        render_obs_final_banner()
+        st.stop()
+    elif view_mode == "obs_scoreboard":
+        render_obs_scoreboard()
+        st.stop()
 
 # --- STANDARDFUNKTIONEN & IMPORTE ---
 try:
@@ -38,19 +50,24 @@ try:
 except ImportError:
     HAS_PDFKIT = False
 
-from src.config import VERSION, TEAMS_DB, SEASON_ID, CSS_STYLES
+from src.config import VERSION, TEAMS_DB, SEASON_ID, CSS_STYLES, LIVE_POLL_S, LIVE_UI_REFRESH_S, DEV_PANEL
 from src.utils import get_logo_url
 from src.api import (
     fetch_team_data, get_player_metadata_cached, fetch_schedule, 
     fetch_game_boxscore, fetch_game_details, fetch_team_info_basic,
-    get_best_team_logo, fetch_league_standings
+    get_best_team_logo, fetch_league_standings, fetch_games_from_recent
 )
-from src.html_gen import (
-    generate_header_html, generate_top3_html, generate_card_html, 
-    generate_team_stats_html, generate_custom_sections_html,
-    generate_comparison_html
+from src.warehouse import load_league_warehouse, top_players, team_rankings
+from src.prefetch import start_background_prefetcher
+from src.api_async import (
+    run_async, gather, fetch_team_data_async, fetch_schedule_async, fetch_team_logo_async
 )
+from src.html_gen import generate_comparison_html
 from src.state_manager import export_session_state, load_session_state
+from src.report import build_report_sections, submit_report_pdf, fragment_stats
+from src import pdf_service, live_engine, cache_registry
+from src.swr import render_as_of, format_as_of
+from src.game_events import events_for
 from src.analysis_ui import (
     render_game_header, render_boxscore_table_pro, render_charts_and_stats, 
     get_team_name, render_game_top_performers, generate_game_summary,
@@ -64,6 +81,9 @@ BASKETBALL_ICON = "🏀"
 
 st.set_page_config(page_title=f"DBBL Scouting Pro {VERSION}", layout="wide", page_icon=BASKETBALL_ICON)
 
+# Nächste Gegner nachts vorab laden (nur wenn OWN_TEAM_ID gesetzt ist, ein Thread pro Prozess)
+start_background_prefetcher()
+
 # --- STANDARDWERTE FÜR SCOUTING REPORT ---
 DEFAULT_OFFENSE = [{"Fokus": "Run", "Beschreibung": "fastbreaks & quick inbounds"}, {"Fokus": "Spacing", "Beschreibung": "swing or skip the ball to get it inside"}, {"Fokus": "Rules", "Beschreibung": "Stick to our offense rules"}, {"Fokus": "Automatics", "Beschreibung": "use cuts and shifts to get movement on court"}, {"Fokus": "Share", "Beschreibung": "the ball / always look for an extra pass"}, {"Fokus": "Set Offense", "Beschreibung": "look inside a lot"}, {"Fokus": "Pick´n Roll", "Beschreibung": "watch out for the half rol against the hetch"}, {"Fokus": "Pace", "Beschreibung": "Execution over speed, take care of the ball"}]
 DEFAULT_DEFENSE = [{"Fokus": "Rebound", "Beschreibung": "box out!"}, {"Fokus": "Transition", "Beschreibung": "Slow the ball down! Pick up the ball early!"}, {"Fokus": "Communication", "Beschreibung": "Talk on positioning, helpside & on screens"}, {"Fokus": "Positioning", "Beschreibung": "close the middle on close outs and drives"}, {"Fokus": "Pick´n Roll", "Beschreibung": "red (yellow, last 8 sec. from shot clock)"}, {"Fokus": "DHO", "Beschreibung": "aggressive switch - same size / gap - small and big"}, {"Fokus": "Offball screens", "Beschreibung": "yellow"}]
@@ -81,7 +101,8 @@ for key, default in [
     ("selected_game_id", None), ("generated_ai_report", None), 
     ("live_game_id", None), ("stats_team_id", None), 
     ("live_view_mode", "today"), ("live_date_filter", date.today()), 
-    ("analysis_team_id", None), ("stats_league_selection", None)
+    ("analysis_team_id", None), ("stats_league_selection", None),
+    ("pdf_job", None)
 ]:
     if key not in st.session_state: st.session_state[key] = default
 
@@ -95,6 +116,7 @@ def go_game_venue(): st.session_state.current_page = "game_venue"
 def go_prep(): st.session_state.current_page = "prep"
 def go_live(): st.session_state.current_page = "live"
 def go_streaminfos(): st.session_state.current_page = "streaminfos"
+def go_cache_admin(): st.session_state.current_page = "cache_admin"
 def go_team_stats(): 
     st.session_state.current_page = "team_stats"
     st.session_state.stats_team_id = None
@@ -149,49 +171,7 @@ def render_page_header(page_title):
     st.divider()
 
 # --- HELPER FUNCTIONS ---
-def fetch_games_from_recent():
-    from src.config import API_HEADERS
-    endpoints = [
-        "https://api-s.dbbl.scb.world/games/recent?slotSize=400",
-        "https://api-n.dbbl.scb.world/games/recent?slotSize=400"
-    ]
-    games_map = {} 
-    for url in endpoints:
-        try:
-            r = requests.get(url, headers=API_HEADERS, timeout=3)
-            if r.status_code == 200:
-                data = r.json()
-                lists_to_check = []
-                if isinstance(data.get("past"), list): lists_to_check.extend(data["past"])
-                if isinstance(data.get("present"), list): lists_to_check.extend(data["present"])
-                if isinstance(data.get("future"), list): lists_to_check.extend(data["future"])
-                for g in lists_to_check:
-                    gid = g.get("id")
-                    if not gid or gid in games_map: continue 
-                    raw_d = g.get("scheduledTime", "")
-                    dt_obj = None; d_disp = "-"; date_only = "-"
-                    if raw_d:
-                        try:
-                            clean_ts = raw_d.replace("Z", "+00:00")
-                            dt_obj = datetime.fromisoformat(clean_ts).astimezone(pytz.timezone("Europe/Berlin"))
-                            d_disp = dt_obj.strftime("%d.%m.%Y %H:%M")
-                            date_only = dt_obj.strftime("%d.%m.%Y")
-                        except: pass
-                    res = g.get("result", {}) or {}
-                    h_s = res.get("homeScore") if res.get("homeScore") is not None else res.get("homeTeamFinalScore")
-                    g_s = res.get("guestScore") if res.get("guestScore") is not None else res.get("guestTeamFinalScore")
-                    score_str = f"{h_s}:{g_s}" if (h_s is not None and g_s is not None) else "-:-"
-                    status = g.get("status", "SCHEDULED")
-                    if h_s is not None and g_s is not None and status == "SCHEDULED": status = "ENDED"
-                    games_map[gid] = {
-                        "id": gid, "date": d_disp, "date_only": date_only, "datetime": dt_obj,
-                        "home": g.get("homeTeam", {}).get("name", "?"), "guest": g.get("guestTeam", {}).get("name", "?"),
-                        "score": score_str, "status": status, "home_score": h_s, "guest_score": g_s
-                    }
-        except Exception as e: pass
-    result_list = list(games_map.values())
-    result_list.sort(key=lambda x: x['datetime'] if x['datetime'] else datetime.min)
-    return result_list
+# fetch_games_from_recent kommt aus src/api.py (gemeinsamer HTTP-Pool)
 
 # --- SEITEN LOGIK ---
 
@@ -298,8 +278,31 @@ def render_streaminfos_page():
             sel_g = st.selectbox("Spiel wählen", list(game_opts.keys()))
             if st.button("🔗 Link Player of the Game"):
                 st.code(f"/?view=obs_potg&game_id={game_opts[sel_g]}")
+            if st.button("🔗 Link Live-Scoreboard"):
+                st.code(f"/?view=obs_scoreboard&game_id={game_opts[sel_g]}")
+                st.caption("Mit dem OBS-Server (python -m src.obs_server) ohne Neuladen: http://<rechner>:8502/obs/scoreboard?game_id=" + str(game_opts[sel_g]))
         else: st.warning("Keine Spiele gefunden.")
 
+def render_live_game(gid):
+    snap = live_engine.get_live_box(gid)
+    if snap["box"]: render_live_view(snap["box"], snap["events"])
+    else: st.info("Warte auf Datenverbindung...")
+
+@st.fragment(run_every=LIVE_UI_REFRESH_S)
+def render_live_game_auto(gid):
+    render_live_game(gid)
+
+@st.fragment(run_every=1)
+def render_pdf_job_status():
+    job = st.session_state.pdf_job
+    info = pdf_service.status(job)
+    if info["state"] == "done":
+        st.session_state.pdf_bytes = pdf_service.result(job); st.session_state.pdf_job = None; pdf_service.forget(job); st.rerun()
+    elif info["state"] == "error": st.session_state.pdf_job = None; pdf_service.forget(job); st.error(f"PDF Error: {info.get('error')}")
+    elif info["state"] == "unknown": st.session_state.pdf_job = None; st.warning("PDF Fehler.")
+    elif info["state"] == "queued": st.info(f"⏳ PDF wartet ({info.get('ahead', 0)} Aufträge davor)...")
+    else: st.info(f"⏳ PDF wird erstellt... ({info.get('waiting', 0):.0f}s)")
+
 def render_scouting_page():
     render_page_header("📝 PreGame Report") 
     if st.session_state.print_mode:
@@ -309,6 +312,7 @@ def render_scouting_page():
             if st.button("⬅️ Bearbeiten", key="exit_print"): st.session_state.print_mode = False; st.rerun()
         with c2:
             if st.session_state.pdf_bytes: st.download_button("📄 Download PDF", st.session_state.pdf_bytes, st.session_state.report_filename, "application/pdf")
+            elif st.session_state.pdf_job: render_pdf_job_status()
             else: st.warning("PDF Fehler.")
         st.divider()
         if st.session_state.final_html: st.markdown("### HTML-Vorschau"); st.markdown(CSS_STYLES + st.session_state.final_html, unsafe_allow_html=True)
@@ -346,9 +350,10 @@ def render_scouting_page():
         
         if click_load or (st.session_state.roster_df is None and cur_tid != tid) or (st.session_state.roster_df is not None and cur_tid != tid):
             with st.spinner("Lade Daten..."):
-                df, ts = fetch_team_data(tid, CURRENT_SEASON_ID)
+                df, ts = run_async(fetch_team_data_async(tid, CURRENT_SEASON_ID))
                 if df is not None and not df.empty: 
                     st.session_state.roster_df = df; st.session_state.team_stats = ts; st.session_state.current_tid = tid 
+                    st.session_state.roster_as_of = fetch_team_data.state(tid, CURRENT_SEASON_ID)
                     dummy_dt = datetime.combine(date.today(), t_inp)
                     time_str_de = t_inp.strftime("%H:%M Uhr")
                     time_str_us = dummy_dt.strftime("%I %p").lower() # z.B. 04 pm
@@ -360,6 +365,8 @@ def render_scouting_page():
         
         if st.session_state.roster_df is not None and not st.session_state.roster_df.empty: 
             st.subheader("3. Auswahl & Notizen")
+            roster_as_of = format_as_of(st.session_state.get("roster_as_of"))
+            if roster_as_of: st.caption(roster_as_of)
             cols = { "select": st.column_config.CheckboxColumn("Auswahl", default=False, width="small"), "NR": st.column_config.TextColumn("#", width="small"), "NAME_FULL": st.column_config.TextColumn("Name"), "GP": st.column_config.NumberColumn("GP", format="%d"), "PPG": st.column_config.NumberColumn("PPG", format="%.1f"), "FG%": st.column_config.NumberColumn("FG%", format="%.1f %%"), "TOT": st.column_config.NumberColumn("REB", format="%.1f") }
             edited = st.data_editor(st.session_state.roster_df[["select", "NR", "NAME_FULL", "GP", "PPG", "FG%", "TOT"]], column_config=cols, disabled=["NR", "NAME_FULL", "GP", "PPG", "FG%", "TOT"], hide_index=True, key="player_table_scout") 
             sel_idx = edited[edited["select"]].index
@@ -385,31 +392,16 @@ def render_scouting_page():
                             for k, v in item["notes"].items(): st.session_state.saved_notes[f"{k}_{item['pid']}"] = v
                         tn = (gn if target == "Gastteam (Gegner)" else hn).replace(" ", "_")
                         st.session_state.report_filename = f"Scouting_Report_{tn}_{d_inp.strftime('%d.%m.%Y')}.pdf"
-                        html = generate_header_html(st.session_state.game_meta); html += generate_top3_html(st.session_state.roster_df)
-                        for item in res: meta = get_player_metadata_cached(item["pid"]); html += generate_card_html(item["row"].to_dict(), meta, item["notes"], cmap[item["color"]])
-                        html += generate_team_stats_html(st.session_state.team_stats)
-                        if up:
-                            html += "<div style='page-break-before:always'><h2>Plays</h2>"; 
-                            for f in up: b64 = base64.b64encode(f.getvalue()).decode(); html += f"<div style='margin-bottom:20px'><img src='data:image/png;base64,{b64}' style='max-width:100%;max-height:900px;border:1px solid #ccc'></div>"
-                        html += generate_custom_sections_html(eo, ed, ea); st.session_state.final_html = html
+                        with st.spinner("Lade Bilder..."):
+                            sections = build_report_sections(st.session_state.game_meta, st.session_state.roster_df, res, st.session_state.team_stats, cmap, eo, ed, ea, up)
+                        st.session_state.final_html = "".join(h for _, h in sections)
+                        st.session_state.pdf_bytes = None; st.session_state.pdf_job = None
                         if HAS_PDFKIT:
-                            try:
-                                opts = {
-                                    "page-size": "A4",
-                                    "orientation": "Portrait",
-                                    "margin-top": "5mm",
-                                    "margin-right": "5mm",
-                                    "margin-bottom": "5mm",
-                                    "margin-left": "5mm",
-                                    "encoding": "UTF-8",
-                                    "zoom": "0.65",
-                                    "no-outline": None,
-                                    "disable-smart-shrinking": None,
-                                    "quiet": ""
-                                }
-                                st.session_state.pdf_bytes = pdfkit.from_string(f"<!DOCTYPE html><html><head><meta charset='utf-8'>{CSS_STYLES}</head><body>{html}</body></html>", False, options=opts); st.session_state.print_mode = True; st.rerun()
-                            except Exception as e: st.error(f"PDF Error: {e}"); st.session_state.pdf_bytes = None; st.session_state.print_mode = True; st.rerun()
-                        else: st.warning("PDFKit fehlt."); st.session_state.pdf_bytes = None; st.session_state.print_mode = True; st.rerun()
+                            # Rendern läuft im PDF-Worker-Pool; die Vorschau fragt den Stand ab
+                            try: st.session_state.pdf_job = submit_report_pdf(sections)
+                            except Exception as e: st.error(f"PDF Error: {e}")
+                        else: st.warning("PDFKit fehlt.")
+                        st.session_state.print_mode = True; st.rerun()
 
 def render_live_page():
     if st.session_state.live_game_id:
@@ -420,17 +412,11 @@ def render_live_page():
         gid = st.session_state.live_game_id
         c_ref, _ = st.columns([1, 4])
         with c_ref:
-            auto = st.checkbox("🔄 Auto-Refresh (15s)", value=False, key="live_auto_refresh")
+            auto = st.checkbox(f"🔄 Auto-Refresh ({LIVE_POLL_S}s)", value=False, key="live_auto_refresh")
         st.divider()
-        box = fetch_game_boxscore(gid)
-        det = fetch_game_details(gid)
-        if box and det:
-            box["gameTime"] = det.get("gameTime")
-            box["period"] = det.get("period")
-            box["result"] = det.get("result")
-            render_live_view(box)
-            if auto: time_module.sleep(15); st.rerun()
-        else: st.info("Warte auf Datenverbindung...")
+        # Gemeinsamer Poller pro Spiel (src/live_engine.py); die Ansicht liest nur dessen letzten Stand
+        if auto: render_live_game_auto(gid)
+        else: render_live_game(gid)
     else:
         render_page_header("🏀 Game Center Übersicht")
         c_mode1, c_mode2, c_space = st.columns([1, 1, 3])
@@ -487,6 +473,7 @@ def render_game_venue_page():
                 if venue.get('address'): u = f"https://www.google.com/maps/search/?api=1&query={quote_plus(f'{venue.get('name', '')}, {venue.get('address', '')}')}"; st.markdown(f"**Route:** [Google Maps öffnen]({u})", unsafe_allow_html=True)
             else: st.warning("Nicht gefunden.")
         st.divider(); st.subheader(f"Alle Spiele von {tn}"); games = fetch_schedule(tid, CURRENT_SEASON_ID)
+        render_as_of(fetch_schedule, tid, CURRENT_SEASON_ID)
         if games:
             games.sort(key=lambda x: datetime.strptime(x['date'], "%d.%m.%Y %H:%M") if x['date'] != "-" else datetime.min, reverse=True)
             for g in games:
@@ -518,7 +505,7 @@ def render_analysis_page():
             if st.session_state.selected_game_id == gid:
                 st.divider()
                 with st.spinner("Lade Daten..."):
-                    box = fetch_game_boxscore(gid); details = fetch_game_details(gid)
+                    details = fetch_game_details(gid); box = fetch_game_boxscore(gid, details=details)
                     if box and details: 
                         box["venue"] = details.get("venue"); box["result"] = details.get("result"); box["referee1"] = details.get("referee1"); box["referee2"] = details.get("referee2"); box["referee3"] = details.get("referee3"); box["scheduledTime"] = details.get("scheduledTime"); box["attendance"] = details.get("result", {}).get("spectators"); box["id"] = details.get("id") 
                         render_game_header(box); st.markdown("### 📝 Spielberichte & PBP"); t1, t2, t3 = st.tabs(["⚡ Kurzbericht", "📋 Prompt Kopieren", "📜 Play-by-Play"])
@@ -526,7 +513,7 @@ def render_analysis_page():
                             st.markdown(generate_game_summary(box)); st.divider(); hn = get_team_name(box.get("homeTeam", {}), "Heim"); gn = get_team_name(box.get("guestTeam", {}), "Gast"); hc = box.get("homeTeam", {}).get("headCoachName", "-"); gc = box.get("guestTeam", {}).get("headCoachName", "-")
                             render_boxscore_table_pro(box.get("homeTeam", {}).get("playerStats", []), box.get("homeTeam", {}).get("gameStat", {}), hn, hc); st.write(""); render_boxscore_table_pro(box.get("guestTeam", {}).get("playerStats", []), box.get("guestTeam", {}).get("gameStat", {}), gn, gc); st.divider(); render_game_top_performers(box); st.divider(); render_charts_and_stats(box)
                         with t2: st.info("ChatGPT Prompt:"); st.code(generate_complex_ai_prompt(box), language="text")
-                        with t3: render_full_play_by_play(box)
+                        with t3: render_full_play_by_play(box, events=events_for(box, gid))
                     else: st.error("Fehler beim Laden.")
         else: st.warning("Keine Spiele.")
 
@@ -563,16 +550,17 @@ def render_team_stats_page():
         col_back, col_head = st.columns([1, 5])
         with col_back:
             if st.button("⬅️ Zur Übersicht", key="back_from_stats"): st.session_state.stats_team_id = None; st.rerun()
-        with st.spinner("Lade Team Statistiken..."): df, ts = fetch_team_data(tid, CURRENT_SEASON_ID); games_data = fetch_schedule(tid, CURRENT_SEASON_ID)
+        with st.spinner("Lade Team Statistiken..."):
+            (df, ts), games_data, logo_b64 = run_async(gather(fetch_team_data_async(tid, CURRENT_SEASON_ID), fetch_schedule_async(tid, CURRENT_SEASON_ID), fetch_team_logo_async(tid)))
         has_data = (df is not None and not df.empty) or (ts and len(ts) > 0)
         if has_data:
             t_info = TEAMS_DB.get(tid, {})
-            name = t_info.get("name", "Team"); logo_b64 = get_best_team_logo(tid)
+            name = t_info.get("name", "Team")
             c1, c2 = st.columns([1, 4])
             with c1: 
                 if logo_b64: st.image(logo_b64, width=100)
                 else: st.markdown(BASKETBALL_ICON, unsafe_allow_html=True)
-            with c2: st.title(f"Statistik: {name}")
+            with c2: st.title(f"Statistik: {name}"); render_as_of(fetch_team_data, tid, CURRENT_SEASON_ID)
             st.divider(); st.subheader(f"Saison Durchschnittswerte (Saison {CURRENT_SEASON_ID})")
             if ts:
                 m1, m2, m3, m4, m5, m6 = st.columns(6)
@@ -617,7 +605,7 @@ def render_team_stats_page():
         with c_tbl:
             st.subheader("Tabelle")
             with st.spinner("Lade Tabelle..."): df = fetch_league_standings(CURRENT_SEASON_ID, sel)
-            if not df.empty: st.dataframe(df, hide_index=True, use_container_width=True, height=600)
+            if not df.empty: st.dataframe(df, hide_index=True, use_container_width=True, height=600); render_as_of(fetch_league_standings, CURRENT_SEASON_ID, sel)
             else: st.info("Tabelle nicht verfügbar.")
         with c_grid:
             st.subheader("Teams")
@@ -633,6 +621,25 @@ def render_team_stats_page():
                             else: c_i.write(BASKETBALL_ICON)
                             c_t.markdown(f"**{info['name']}**")
                             if st.button("Stats ➜", key=f"btn_stats_{tid}", use_container_width=True): st.session_state.stats_team_id = tid; st.rerun()
+        if teams:
+            st.divider(); st.subheader("📊 Liga-Ranglisten")
+            if st.button("Ranglisten laden", key="load_rankings") or st.session_state.get("rankings_loaded") == sel:
+                st.session_state.rankings_loaded = sel
+                with st.spinner("Lade alle Teams der Staffel..."): wh = load_league_warehouse(CURRENT_SEASON_ID, sel)
+                r1, r2 = st.columns([1, 1], gap="large")
+                with r1:
+                    st.markdown("**Teams**")
+                    t_stat = st.selectbox("Sortieren nach:", ["PPG", "TOT", "AS", "ST", "TO", "FGPCT", "3PCT", "FTPCT"], key="rank_team_stat")
+                    df_t = team_rankings(wh, t_stat, ascending=(t_stat == "TO"))
+                    if not df_t.empty: st.dataframe(df_t[["RANG", "TEAM_NAME", "W", "L", t_stat]].round(1), hide_index=True, use_container_width=True)
+                    else: st.info("Keine Teamdaten.")
+                with r2:
+                    st.markdown("**Spieler (Top 10)**")
+                    p_opts = {"Punkte": "PPG", "Rebounds": "TOT", "Assists": "AS", "Steals": "ST", "Blocks": "BS", "FG%": "FG%", "3P%": "3PCT", "FT%": "FTPCT"}
+                    p_lbl = st.selectbox("Kategorie:", list(p_opts.keys()), key="rank_player_stat"); p_stat = p_opts[p_lbl]
+                    df_p = top_players(wh, p_stat, n=10, min_games=3)
+                    if not df_p.empty: st.dataframe(df_p[["NAME_FULL", "TEAM_NAME", "GP", p_stat]], hide_index=True, use_container_width=True)
+                    else: st.info("Keine Spielerdaten.")
 
 def render_comparison_page():
     render_page_header("📊 Head-to-Head Vergleich") 
@@ -652,7 +659,7 @@ def render_comparison_page():
     st.divider()
     if st.button("Vergleich starten", type="primary"):
         with st.spinner("Lade Daten..."):
-            _, ts_h = fetch_team_data(h_id, CURRENT_SEASON_ID); _, ts_g = fetch_team_data(g_id, CURRENT_SEASON_ID)
+            (_, ts_h), (_, ts_g) = run_async(gather(fetch_team_data_async(h_id, CURRENT_SEASON_ID), fetch_team_data_async(g_id, CURRENT_SEASON_ID)))
             if ts_h and ts_g: st.markdown(generate_comparison_html(ts_h, ts_g, h_name, g_name), unsafe_allow_html=True)
             else: st.error("Daten nicht verfügbar.")
 
@@ -709,54 +716,10 @@ def render_prep_page():
         opp_name = st.selectbox("Gegner-Team:", list({v["name"]: k for k, v in t.items()}.keys()), key="prep_team"); opp_id = {v["name"]: k for k, v in t.items()}[opp_name]
     if st.button("Vorbereitung starten", type="primary"):
         with st.spinner("Lade Daten..."):
-            df, _ = fetch_team_data(opp_id, CURRENT_SEASON_ID); sched = fetch_schedule(opp_id, CURRENT_SEASON_ID)
+            (df, _), sched = run_async(gather(fetch_team_data_async(opp_id, CURRENT_SEASON_ID), fetch_schedule_async(opp_id, CURRENT_SEASON_ID)))
             if df is not None: render_prep_dashboard(opp_id, opp_name, df, sched, metadata_callback=get_player_metadata_cached)
             else: st.error("Fehler beim Laden der Spielerdaten.")
 
-def fetch_games_from_recent():
-    from src.config import API_HEADERS
-    endpoints = [
-        "https://api-s.dbbl.scb.world/games/recent?slotSize=400",
-        "https://api-n.dbbl.scb.world/games/recent?slotSize=400"
-    ]
-    games_map = {} 
-    for url in endpoints:
-        try:
-            r = requests.get(url, headers=API_HEADERS, timeout=3)
-            if r.status_code == 200:
-                data = r.json()
-                lists_to_check = []
-                if isinstance(data.get("past"), list): lists_to_check.extend(data["past"])
-                if isinstance(data.get("present"), list): lists_to_check.extend(data["present"])
-                if isinstance(data.get("future"), list): lists_to_check.extend(data["future"])
-                for g in lists_to_check:
-                    gid = g.get("id")
-                    if not gid or gid in games_map: continue 
-                    raw_d = g.get("scheduledTime", "")
-                    dt_obj = None; d_disp = "-"; date_only = "-"
-                    if raw_d:
-                        try:
-                            clean_ts = raw_d.replace("Z", "+00:00")
-                            dt_obj = datetime.fromisoformat(clean_ts).astimezone(pytz.timezone("Europe/Berlin"))
-                            d_disp = dt_obj.strftime("%d.%m.%Y %H:%M")
-                            date_only = dt_obj.strftime("%d.%m.%Y")
-                        except: pass
-                    res = g.get("result", {}) or {}
-                    h_s = res.get("homeScore") if res.get("homeScore") is not None else res.get("homeTeamFinalScore")
-                    g_s = res.get("guestScore") if res.get("guestScore") is not None else res.get("guestTeamFinalScore")
-                    score_str = f"{h_s}:{g_s}" if (h_s is not None and g_s is not None) else "-:-"
-                    status = g.get("status", "SCHEDULED")
-                    if h_s is not None and g_s is not None and status == "SCHEDULED": status = "ENDED"
-                    games_map[gid] = {
-                        "id": gid, "date": d_disp, "date_only": date_only, "datetime": dt_obj,
-                        "home": g.get("homeTeam", {}).get("name", "?"), "guest": g.get("guestTeam", {}).get("name", "?"),
-                        "score": score_str, "status": status, "home_score": h_s, "guest_score": g_s
-                    }
-        except Exception as e: pass
-    result_list = list(games_map.values())
-    result_list.sort(key=lambda x: x['datetime'] if x['datetime'] else datetime.min)
-    return result_list
-
 def render_live_page():
     if st.session_state.live_game_id:
         c_back, c_title = st.columns([1, 5])
@@ -766,17 +729,11 @@ def render_live_page():
         gid = st.session_state.live_game_id
         c_ref, _ = st.columns([1, 4])
         with c_ref:
-            auto = st.checkbox("🔄 Auto-Refresh (15s)", value=False, key="live_auto_refresh")
+            auto = st.checkbox(f"🔄 Auto-Refresh ({LIVE_POLL_S}s)", value=False, key="live_auto_refresh")
         st.divider()
-        box = fetch_game_boxscore(gid)
-        det = fetch_game_details(gid)
-        if box and det:
-            box["gameTime"] = det.get("gameTime")
-            box["period"] = det.get("period")
-            box["result"] = det.get("result")
-            render_live_view(box)
-            if auto: time_module.sleep(15); st.rerun()
-        else: st.info("Warte auf Datenverbindung...")
+        # Gemeinsamer Poller pro Spiel (src/live_engine.py); die Ansicht liest nur dessen letzten Stand
+        if auto: render_live_game_auto(gid)
+        else: render_live_game(gid)
     else:
         render_page_header("🏀 Game Center Übersicht")
         c_mode1, c_mode2, c_space = st.columns([1, 1, 3])
@@ -833,6 +790,7 @@ def render_game_venue_page():
                 if venue.get('address'): u = f"https://www.google.com/maps/search/?api=1&query={quote_plus(f'{venue.get('name', '')}, {venue.get('address', '')}')}"; st.markdown(f"**Route:** [Google Maps öffnen]({u})", unsafe_allow_html=True)
             else: st.warning("Nicht gefunden.")
         st.divider(); st.subheader(f"Alle Spiele von {tn}"); games = fetch_schedule(tid, CURRENT_SEASON_ID)
+        render_as_of(fetch_schedule, tid, CURRENT_SEASON_ID)
         if games:
             games.sort(key=lambda x: datetime.strptime(x['date'], "%d.%m.%Y %H:%M") if x['date'] != "-" else datetime.min, reverse=True)
             for g in games:
@@ -864,7 +822,7 @@ def render_analysis_page():
             if st.session_state.selected_game_id == gid:
                 st.divider()
                 with st.spinner("Lade Daten..."):
-                    box = fetch_game_boxscore(gid); details = fetch_game_details(gid)
+                    details = fetch_game_details(gid); box = fetch_game_boxscore(gid, details=details)
                     if box and details: 
                         box["venue"] = details.get("venue"); box["result"] = details.get("result"); box["referee1"] = details.get("referee1"); box["referee2"] = details.get("referee2"); box["referee3"] = details.get("referee3"); box["scheduledTime"] = details.get("scheduledTime"); box["attendance"] = details.get("result", {}).get("spectators"); box["id"] = details.get("id") 
                         render_game_header(box); st.markdown("### 📝 Spielberichte & PBP"); t1, t2, t3 = st.tabs(["⚡ Kurzbericht", "📋 Prompt Kopieren", "📜 Play-by-Play"])
@@ -872,7 +830,7 @@ def render_analysis_page():
                             st.markdown(generate_game_summary(box)); st.divider(); hn = get_team_name(box.get("homeTeam", {}), "Heim"); gn = get_team_name(box.get("guestTeam", {}), "Gast"); hc = box.get("homeTeam", {}).get("headCoachName", "-"); gc = box.get("guestTeam", {}).get("headCoachName", "-")
                             render_boxscore_table_pro(box.get("homeTeam", {}).get("playerStats", []), box.get("homeTeam", {}).get("gameStat", {}), hn, hc); st.write(""); render_boxscore_table_pro(box.get("guestTeam", {}).get("playerStats", []), box.get("guestTeam", {}).get("gameStat", {}), gn, gc); st.divider(); render_game_top_performers(box); st.divider(); render_charts_and_stats(box)
                         with t2: st.info("ChatGPT Prompt:"); st.code(generate_complex_ai_prompt(box), language="text")
-                        with t3: render_full_play_by_play(box)
+                        with t3: render_full_play_by_play(box, events=events_for(box, gid))
                     else: st.error("Fehler beim Laden.")
         else: st.warning("Keine Spiele.")
 
@@ -970,8 +928,17 @@ def render_streaminfos_page():
             sel_g = st.selectbox("Spiel wählen", list(game_opts.keys()))
             if st.button("🔗 Link Player of the Game"):
                 st.code(f"/?view=obs_potg&game_id={game_opts[sel_g]}")
+            if st.button("🔗 Link Live-Scoreboard"):
+                st.code(f"/?view=obs_scoreboard&game_id={game_opts[sel_g]}")
+                st.caption("Mit dem OBS-Server (python -m src.obs_server) ohne Neuladen: http://<rechner>:8502/obs/scoreboard?game_id=" + str(game_opts[sel_g]))
         else: st.warning("Keine Spiele gefunden.")
 
+def render_cache_admin_page():
+    render_page_header("🗄️ Cache-Verwaltung")
+    cache_registry.render_cache_admin()
+    fs = fragment_stats()
+    st.caption(f"Report-Abschnitte im Speicher: {fs['entries']} · Treffer {fs['hits']} · neu gebaut {fs['misses']}")
+
 # --- HAUPT ROUTER ---
 if st.session_state.current_page == "home": render_home()
 elif st.session_state.current_page == "scouting": render_scouting_page()
@@ -984,3 +951,9 @@ elif st.session_state.current_page == "live": render_live_page()
 elif st.session_state.current_page == "team_stats": render_team_stats_page()
 elif st.session_state.current_page == "team_analysis": render_team_analysis_page()
 elif st.session_state.current_page == "streaminfos": render_streaminfos_page()
+elif st.session_state.current_page == "cache_admin": render_cache_admin_page()
+
+# --- ENTWICKLER-PANEL (opt-in: SCOUTING_DEV_PANEL=1 oder ?dev=1) ---
+if DEV_PANEL or st.query_params.get("dev") == "1":
+    tracing.render_dev_panel()
+    st.sidebar.button("🗄️ Cache-Verwaltung", on_click=go_cache_admin, key="dev_cache_admin")
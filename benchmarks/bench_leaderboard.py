@@ -0,0 +1,62 @@
+# --- START OF FILE benchmarks/bench_leaderboard.py ---
+# Vergleicht die bisherigen Top-3-Listen (neunmal sort_values + head) mit der Ranglisten-Engine
+# aus src/leaderboard.py - für einen Kader und für einen ligaweiten Spielerbestand.
+#
+#   python benchmarks/bench_leaderboard.py [--players 15] [--league 400] [--repeat 50]
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.leaderboard import leaders, REPORT_CATEGORIES
+
+def synth_players(n, rnd):
+    cols = ["PPG", "TOT", "3M", "3PCT", "FTA", "FTPCT", "AS", "ST", "TO", "BS", "PF"]
+    df = pd.DataFrame({c: [round(rnd.random() * 20, 1) for _ in range(n)] for c in cols})
+    df.insert(0, "NAME_FULL", [f"Spielerin {i}" for i in range(n)])
+    return df
+
+def legacy_leaders(df, k=3):
+    """Stand vor der Engine (aus generate_top3_html), stabil sortiert."""
+    out = {}
+    for name, (stat, ascending, flt) in REPORT_CATEGORIES.items():
+        d = df[df[flt[0]] >= flt[1]] if flt else df
+        if d.empty: d = df
+        out[name] = d.sort_values(by=stat, ascending=ascending, kind="stable").head(k)
+    return out
+
+def engine_leaders(df, k=3):
+    return {name: df.iloc[pos] for name, pos in leaders(df, REPORT_CATEGORIES, k).items()}
+
+def timed(fn, args, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(*args); best = min(best, time.perf_counter() - t)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Ranglisten: sort_values je Kategorie vs. ein Durchgang")
+    parser.add_argument("--players", type=int, default=15)
+    parser.add_argument("--league", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(2025)
+    results = {}
+    for label, n, k in [(f"Kader ({args.players}, Top 3)", args.players, 3), (f"Liga ({args.league}, Top 10)", args.league, 10)]:
+        df = synth_players(n, rnd)
+        old, new = legacy_leaders(df, k), engine_leaders(df, k)
+        for name in REPORT_CATEGORIES: pd.testing.assert_frame_equal(old[name], new[name])
+        t_old = timed(legacy_leaders, (df, k), args.repeat); t_new = timed(engine_leaders, (df, k), args.repeat)
+        t_pos = timed(leaders, (df, REPORT_CATEGORIES, k), args.repeat)
+        print(f"{label:24} alt {t_old * 1000:7.2f} ms   neu {t_new * 1000:7.2f} ms (nur Positionen {t_pos * 1000:5.2f} ms)   Faktor {t_old / t_new:5.1f}x / {t_old / t_pos:5.1f}x")
+        results[label] = {"legacy_s": t_old, "engine_s": t_new, "positions_s": t_pos}
+    return results
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE benchmarks/bench_leaderboard.py ---
@@ -0,0 +1,122 @@
+# --- START OF FILE benchmarks/bench_roster.py ---
+# Vergleicht die alte Kader-Statistik (get_val pro Spalte, .apply(format_minutes)) mit der
+# vektorisierten Variante aus src/api.py auf einer synthetischen Saison (N Teams x 15 Spieler).
+#
+#   python benchmarks/bench_roster.py [--teams 26] [--players 15] [--repeat 5]
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.api import format_minutes, _resolve_roster_columns, _derive_roster_stats
+
+STAT_FIELDS = ["gamesPlayed", "secondsPlayed", "points", "totalRebounds", "assists", "steals", "turnovers", "blocks",
+               "foulsCommitted", "offensiveRebounds", "defensiveRebounds", "fieldGoalsMade", "fieldGoalsAttempted",
+               "threePointShotsMade", "threePointShotsAttempted", "freeThrowsMade", "freeThrowsAttempted"]
+
+def synth_team(team_id, players, rnd):
+    """player-stats-Antwort wie von der API, inkl. PerGame-/Percent-Feldern und einzelnen Lücken."""
+    out = []
+    for i in range(players):
+        gp = rnd.randint(0, 22)
+        fga = rnd.randint(0, 250); fgm = rnd.randint(0, fga)
+        a3 = rnd.randint(0, fga); m3 = min(fgm, rnd.randint(0, a3))
+        fta = rnd.randint(0, 80); ftm = rnd.randint(0, fta)
+        row = {"seasonPlayer": {"id": team_id * 100 + i, "firstName": f"Vorname{i}", "lastName": f"Nachname{i}", "shirtNumber": i + 4,
+                                "position": "GUARD", "person": {"id": 9000 + i}},
+               "seasonTeamId": team_id, "gamesPlayed": gp, "secondsPlayed": rnd.randint(0, 30000), "points": rnd.randint(0, 400),
+               "totalRebounds": rnd.randint(0, 150), "assists": rnd.randint(0, 80), "steals": rnd.randint(0, 40),
+               "turnovers": rnd.randint(0, 60), "blocks": rnd.randint(0, 20), "foulsCommitted": rnd.randint(0, 60),
+               "offensiveRebounds": rnd.randint(0, 50), "defensiveRebounds": rnd.randint(0, 100),
+               "fieldGoalsMade": fgm, "fieldGoalsAttempted": fga, "threePointShotsMade": m3, "threePointShotsAttempted": a3,
+               "freeThrowsMade": ftm, "freeThrowsAttempted": fta}
+        for f in STAT_FIELDS[2:]:
+            row[f + "PerGame"] = round(row[f] / max(gp, 1), 1)
+        for f in ["fieldGoals", "threePointShots", "freeThrows", "twoPointShots"]:
+            row[f + "Percent"] = rnd.random() * 100
+        if rnd.random() < 0.1: row["blocks"] = None
+        out.append(row)
+    return out
+
+def legacy_roster_stats(df):
+    """Stand vor der Vektorisierung (aus fetch_team_data übernommen)."""
+    df = df.copy()
+    def get_val(key, default=0.0):
+        matches = [c for c in df.columns if key == c or (key in c and 'pergame' not in c and 'percent' not in c)]
+        if matches: return pd.to_numeric(df[sorted(matches, key=len)[0]], errors="coerce").fillna(default)
+        return pd.Series([default]*len(df), index=df.index)
+
+    df["GP"] = get_val("gamesplayed").replace(0, 1)
+    df["TOTAL_MINUTES"] = get_val("secondsplayed") / 60
+    df["TOTAL_PTS"] = get_val("points"); df["TOTAL_REB"] = get_val("totalrebounds")
+    df["TOTAL_AST"] = get_val("assists"); df["TOTAL_STL"] = get_val("steals")
+    df["TOTAL_TO"] = get_val("turnovers"); df["TOTAL_BLK"] = get_val("blocks")
+    df["TOTAL_PF"] = get_val("foulscommitted"); df["TOTAL_OR"] = get_val("offensiverebounds")
+    df["TOTAL_DR"] = get_val("defensiverebounds"); df["TOTAL_FGM"] = get_val("fieldgoalsmade")
+    df["TOTAL_FGA"] = get_val("fieldgoalsattempted"); df["TOTAL_3M"] = get_val("threepointshotsmade")
+    df["TOTAL_3A"] = get_val("threepointshotsattempted"); df["TOTAL_FTM"] = get_val("freethrowsmade")
+    df["TOTAL_FTA"] = get_val("freethrowsattempted"); df["TOTAL_2M"] = df["TOTAL_FGM"] - df["TOTAL_3M"]
+    df["TOTAL_2A"] = df["TOTAL_FGA"] - df["TOTAL_3A"]
+
+    gp_safe = df["GP"].replace(0, 1)
+    df["MIN_DISPLAY"] = (df["TOTAL_MINUTES"] * 60 / gp_safe).apply(format_minutes)
+    df["PPG"] = (df["TOTAL_PTS"] / gp_safe).round(1); df["TOT"] = (df["TOTAL_REB"] / gp_safe).round(1)
+    df["AS"] = (df["TOTAL_AST"] / gp_safe).round(1); df["ST"] = (df["TOTAL_STL"] / gp_safe).round(1)
+    df["TO"] = (df["TOTAL_TO"] / gp_safe).round(1); df["BS"] = (df["TOTAL_BLK"] / gp_safe).round(1)
+    df["PF"] = (df["TOTAL_PF"] / gp_safe).round(1); df["OR"] = (df["TOTAL_OR"] / gp_safe).round(1)
+    df["DR"] = (df["TOTAL_DR"] / gp_safe).round(1); df["2M"] = (df["TOTAL_2M"] / gp_safe).round(1)
+    df["2A"] = (df["TOTAL_2A"] / gp_safe).round(1); df["3M"] = (df["TOTAL_3M"] / gp_safe).round(1)
+    df["3A"] = (df["TOTAL_3A"] / gp_safe).round(1); df["FTM"] = (df["TOTAL_FTM"] / gp_safe).round(1)
+    df["FTA"] = (df["TOTAL_FTA"] / gp_safe).round(1)
+
+    df["FG%"] = (df["TOTAL_FGM"] / df["TOTAL_FGA"] * 100).round(1).fillna(0)
+    df["3PCT"] = (df["TOTAL_3M"] / df["TOTAL_3A"] * 100).round(1).fillna(0)
+    df["FTPCT"] = (df["TOTAL_FTM"] / df["TOTAL_FTA"] * 100).round(1).fillna(0)
+    df["2PCT"] = 0.0; mask2 = df["TOTAL_2A"] > 0
+    df.loc[mask2, "2PCT"] = (df.loc[mask2, "TOTAL_2M"] / df.loc[mask2, "TOTAL_2A"] * 100).round(1)
+    return df
+
+def vectorized_roster_stats(df):
+    return pd.concat([df, _derive_roster_stats(df, _resolve_roster_columns(tuple(df.columns))["stats"])], axis=1)
+
+def normalize(payload):
+    df = pd.json_normalize(payload)
+    df.columns = [str(c).lower() for c in df.columns]
+    return df
+
+def timed(fn, frames, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for df in frames: fn(df)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Kader-Statistik: alt vs. vektorisiert")
+    parser.add_argument("--teams", type=int, default=26)
+    parser.add_argument("--players", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(2025)
+    frames = [normalize(synth_team(100 + t, args.players, rnd)) for t in range(args.teams)]
+
+    for df in frames:
+        pd.testing.assert_frame_equal(legacy_roster_stats(df), vectorized_roster_stats(df))
+    print(f"Ergebnis identisch für {args.teams} Teams x {args.players} Spieler ({frames[0].shape[1]} Rohspalten)")
+
+    t_old = timed(legacy_roster_stats, frames, args.repeat)
+    t_new = timed(vectorized_roster_stats, frames, args.repeat)
+    print(f"  alt (get_val):      {t_old * 1000:8.1f} ms  ({t_old / args.teams * 1000:.2f} ms/Team)")
+    print(f"  neu (vektorisiert): {t_new * 1000:8.1f} ms  ({t_new / args.teams * 1000:.2f} ms/Team)")
+    print(f"  Faktor:             {t_old / t_new:8.1f}x")
+    return {"teams": args.teams, "players": args.players, "legacy_s": t_old, "vectorized_s": t_new}
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE benchmarks/bench_roster.py ---
@@ -0,0 +1,164 @@
+# --- START OF FILE benchmarks/bench_suite.py ---
+# End-to-End-Messung der wichtigsten Seiten-Bausteine gegen die lokale Mock-API (src/mock_api.py):
+# Kader laden (kalt/warm), letzte N Spiele, Scouting-Auswertung, KI-Kontext, Top 3 + kompletter Report,
+# PDF-Rendering, Live-Boxscore, Play-by-Play-Aufbereitung und jedes OBS-Overlay (Laden und Bauen getrennt).
+# Der Mock läuft im selben Prozess, der Cache in einem temporären Ordner. Ergebnis als JSON, damit
+# Versionen verglichen werden können (--compare alte.json zeigt die Abweichung pro Messung).
+#
+#   python benchmarks/bench_suite.py [--repeat 5] [--latency 0] [--out benchmarks/results] [--compare alt.json]
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import argparse
+import platform
+import statistics
+import subprocess
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0)); return s.getsockname()[1]
+
+def _git_rev():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except Exception: return None
+
+def measure(fn, repeat, setup=None):
+    """Laufzeiten in Sekunden; setup() läuft vor jedem Durchlauf und wird nicht mitgemessen."""
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        t = time.perf_counter(); fn(); times.append(time.perf_counter() - t)
+    return {"best_s": min(times), "median_s": statistics.median(times), "mean_s": statistics.fmean(times), "runs": len(times)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-End-Benchmark gegen die Mock-API")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0, help="Antwortzeit des Mocks in ms (0 = nur Rechenzeit messen)")
+    parser.add_argument("--team", type=int, default=112)
+    parser.add_argument("--games", type=int, default=50, help="n für fetch_last_n_games_complete")
+    parser.add_argument("--out", default=os.path.join(ROOT, "benchmarks", "results"))
+    parser.add_argument("--compare", default=None, help="Früheres Ergebnis (JSON) zum Vergleich")
+    args = parser.parse_args(argv)
+
+    # Vor dem ersten Import von src.config: Mock-Adresse und frischer Cache-Ordner
+    port = _free_port()
+    os.environ["SCOUTING_MOCK_API"] = f"http://127.0.0.1:{port}"
+    os.environ["SCOUTING_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench_cache_")
+    os.chdir(ROOT)  # .streamlit/secrets.toml
+
+    from src import mock_api
+    httpd = mock_api.serve(port=port, latency_ms=(args.latency, args.latency), error_rate=0.0, slow_rate=0.0, fixtures="")
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    from src.config import VERSION, SEASON_ID, TEAMS_DB, PDF_OPTIONS
+    from src import api, disk_cache, pdf_service
+    from src.api import fetch_team_data, fetch_last_n_games_complete, fetch_game_boxscore, get_best_team_logo
+    from src.analysis_ui import analyze_scouting_data, prepare_ai_scouting_context, create_live_boxscore_df
+    from src.game_events import GameEventProcessor
+    from src.html_gen import generate_top3_html
+    from src.report import build_report_html
+    from src.overlays import OVERLAYS, scoreboard_state
+    import pandas as pd
+
+    team_id = args.team; team_name = TEAMS_DB.get(team_id, {}).get("name", str(team_id))
+    results = {}; skipped = {}
+
+    def cold():
+        disk_cache.clear()
+        for fn in (fetch_team_data, api.fetch_team_details_raw, api.get_player_metadata_cached, get_best_team_logo): fn.clear()
+
+    def run(name, fn, setup=None, repeat=None):
+        results[name] = measure(fn, repeat or args.repeat, setup)
+        print(f"  {name:<40} {results[name]['median_s'] * 1000:9.2f} ms (min {results[name]['best_s'] * 1000:.2f})")
+
+    print(f"Mock-API auf Port {port}, Latenz {args.latency:g} ms, {args.repeat} Durchläufe")
+    # Namen bleiben zwischen Versionen gleich (für --compare); Mengen stehen unter "settings"
+    run("fetch_team_data (kalt)", lambda: fetch_team_data(team_id, SEASON_ID), setup=cold)
+    run("fetch_team_data (warm)", lambda: fetch_team_data(team_id, SEASON_ID))
+    df, ts = fetch_team_data(team_id, SEASON_ID)
+
+    api.fetch_schedule.clear()
+    run("fetch_last_n_games_complete", lambda: fetch_last_n_games_complete(team_id, SEASON_ID, n=args.games), repeat=1)
+    games = fetch_last_n_games_complete(team_id, SEASON_ID, n=args.games)
+    run("analyze_scouting_data", lambda: analyze_scouting_data(team_id, games))
+    run("prepare_ai_scouting_context", lambda: prepare_ai_scouting_context(team_name, games, team_id))
+
+    run("generate_top3_html", lambda: generate_top3_html(df))
+    meta = {"home_name": team_name, "home_logo": get_best_team_logo(team_id), "guest_name": "Gast", "guest_logo": "",
+            "date": "01.01.2026", "time": "16:00 Uhr / 04 pm", "selected_target": "Heimteam"}
+    items = [{"row": row, "pid": row["PLAYER_ID"], "color": "Grün", "notes": {"l1": "Linkshänderin", "r1": "Zug zum Korb"}} for _, row in df.iterrows()]
+    cmap = {"Grau": "#999999", "Grün": "#5c9c30", "Rot": "#d9534f"}
+    facts = pd.DataFrame([{"Fokus": f"Punkt {i}", "Beschreibung": "Pick & Roll, box out!"} for i in range(8)])
+    report = lambda: build_report_html(meta, df, items, ts, cmap, facts, facts, facts)
+    report_html = report()
+    # Abschnitts-Cache aus src/report.py leeren, damit der Zusammenbau selbst gemessen wird
+    from src import report as report_mod
+    run("build_report_html", report, setup=lambda: report_mod._fragments.clear())
+    try:
+        from src.pdf_worker import render_pdf
+        import pdfkit
+        pdfkit.configuration()  # wirft, wenn wkhtmltopdf fehlt
+        doc = pdf_service.build_document(report_html)
+        run("pdfkit (Report)", lambda: render_pdf(doc, PDF_OPTIONS), repeat=min(args.repeat, 3))
+    except Exception as e:
+        skipped["pdfkit (Report)"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+        print(f"  {'pdfkit (Report)':<40} übersprungen: {skipped['pdfkit (Report)']}")
+
+    box = max(games, key=lambda g: len(g.get("actions", []))) if games else fetch_game_boxscore(next(iter(httpd.league.games)))
+    run("create_live_boxscore_df", lambda: create_live_boxscore_df(box.get("homeTeam", {})))
+    run("Play-by-Play Aufbereitung", lambda: (lambda p: (p.apply(box), p.pbp_frame()))(GameEventProcessor()))
+
+    # OBS-Overlays: Parameter wie in den App-Links
+    lg = httpd.league
+    ended = next(gid for gid, g in sorted(lg.games.items()) if lg.status(g) == "ENDED")
+    live = next((gid for gid, g in sorted(lg.games.items()) if lg.status(g) == "RUNNING"), ended)
+    opp = next(t for t in TEAMS_DB if t != team_id)
+    players = df.head(5)
+    params = {
+        "obs_starting5": {"ids": ",".join(players["PLAYER_ID"]), "name": team_name, "logo_id": str(team_id),
+                          **{f"n_{p}": n for p, n in zip(players["PLAYER_ID"], players["NAME_FULL"])}},
+        "obs_standings": {"region": TEAMS_DB[team_id].get("staffel", "Süd")},
+        "obs_comparison": {"hid": str(team_id), "gid": str(opp), "hname": team_name, "gname": TEAMS_DB[opp]["name"]},
+        "obs_potg": {"game_id": str(ended)},
+        "obs_final_banner": {"game_id": str(ended)},
+        "obs_scoreboard": {"game_id": str(live)},
+    }
+    scoreboard_state(str(live))  # Live-Poller starten, erster Abruf läuft synchron
+    for view, (load, build) in OVERLAYS.items():
+        p = params.get(view)
+        if p is None: skipped[view] = "keine Parameter"; continue
+        data = load(p)
+        run(f"{view} laden (warm)", lambda: load(p))
+        run(f"{view} bauen", lambda: build(p, data))
+
+    out = {"version": VERSION, "git": _git_rev(), "python": platform.python_version(), "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "settings": {"repeat": args.repeat, "latency_ms": args.latency, "team": team_id, "games": len(games),
+                        "report_cards": len(items), "pbp_actions": len(box.get("actions", []))},
+           "results": results, "skipped": skipped, "mock_requests": httpd.stats["requests"]}
+    httpd.shutdown()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f: old = json.load(f)["results"]
+        print(f"\nVergleich mit {args.compare} (Median):")
+        for name, r in results.items():
+            if name not in old: continue
+            ratio = r["median_s"] / old[name]["median_s"] if old[name]["median_s"] else float("inf")
+            flag = "  <-- langsamer" if ratio > 1.2 else ""
+            print(f"  {name:<40} {old[name]['median_s'] * 1000:9.2f} -> {r['median_s'] * 1000:9.2f} ms  ({ratio:5.2f}x){flag}")
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{VERSION}-{out['git'] or 'local'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f: json.dump(out, f, indent=2, ensure_ascii=False)
+    print(f"\nErgebnis: {path}")
+    return out
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE benchmarks/bench_suite.py ---
@@ -0,0 +1,209 @@
+# --- START OF FILE benchmarks/bench_templates.py ---
+# Vergleicht den alten HTML-Aufbau (+= in Schleifen) mit den vorkompilierten Vorlagen aus
+# src/templates.py: 15-Karten-Report (Top 3 + Spielerkarten) und OBS-Tabelle (Standings).
+# Gemessen werden Laufzeit (bestes von --repeat) und Spitzen-Allokation (tracemalloc).
+#
+#   python benchmarks/bench_templates.py [--cards 15] [--teams 12] [--repeat 20]
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.html_gen import generate_top3_html, generate_card_html
+from src.overlays import build_standings_html
+from src.utils import clean_pos
+
+STAT_COLS = ["PPG", "FG%", "DR", "OR", "TOT", "2M", "2A", "2PCT", "3M", "3A", "3PCT", "FTM", "FTA", "FTPCT", "AS", "TO", "ST", "BS", "PF"]
+
+def synth_roster(n, rnd):
+    rows = []
+    for i in range(n):
+        row = {"PLAYER_ID": str(1000 + i), "NR": str(i + 4), "NAME_FULL": f"Vorname{i} Nachname{i}", "MIN_DISPLAY": f"{rnd.randint(5, 35):02d}:{rnd.randint(0, 59):02d}"}
+        row.update({c: round(rnd.random() * 20, 1) for c in STAT_COLS})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def synth_standings(n):
+    return pd.DataFrame({"Platz": list(range(1, n + 1)), "Team": [f"Team {i}" for i in range(n)], "Sp": [18] * n,
+                         "S": [n - i for i in range(n)], "N": list(range(n)), "Diff": [f"+{n - i}" if i < n // 2 else f"-{i}" for i in range(n)]})
+
+# --- ALTER STAND (+= in Schleifen, aus src/html_gen.py / src/stream_ui.py übernommen) ---
+
+def legacy_top3(df):
+    scorers = df.sort_values(by="PPG", ascending=False).head(3)
+    rebounders = df.sort_values(by="TOT", ascending=False).head(3)
+    shooters = df[df["3M"] >= 0.5].sort_values(by="3PCT", ascending=False).head(3)
+    if shooters.empty: shooters = df.sort_values(by="3PCT", ascending=False).head(3)
+    fts = df[df["FTA"] >= 1.0].sort_values(by="FTPCT", ascending=True).head(3)
+    if fts.empty: fts = df.sort_values(by="FTPCT", ascending=True).head(3)
+    
+    assisters = df.sort_values(by="AS", ascending=False).head(3)
+    stealers = df.sort_values(by="ST", ascending=False).head(3)
+    turnovers = df.sort_values(by="TO", ascending=False).head(3)
+    blocks = df.sort_values(by="BS", ascending=False).head(3)
+    fouls = df.sort_values(by="PF", ascending=False).head(3)
+
+    FONT_SIZE = "14px"
+
+    def build_box(d, headers, keys, bolds, color, title):
+        h = f"<div class='stat-box'>"
+        h += f"<div class='stat-title' style='border-top: 4px solid {color}; color: {color}; font-size: 18px; padding: 5px; font-weight:bold;'>{title}</div>"
+        h += f"<table class='top3-table'>"
+        h += "<tr>"
+        for head in headers: 
+            h += f"<th>{head}</th>"
+        h += "</tr>"
+        for _, r in d.iterrows():
+            h += "<tr>"
+            for i, k in enumerate(keys):
+                val = r[k]
+                align = "left" if k == "NAME_FULL" else "center"
+                if k == "NAME_FULL": val = val.split(" ")[-1]
+                elif isinstance(val, float): val = f"{val:.1f}"
+                style = f"text-align:{align}; font-size: {FONT_SIZE};"
+                if i in bolds: style += " font-weight:bold;"
+                h += f"<td style='{style}'>{val}</td>"
+            h += "</tr>"
+        h += "</table></div>"
+        return h
+
+    html = "<div class='top3-container'>"
+    html += build_box(scorers, ["#", "Name", "PPG", "FG%"], ["NR", "NAME_FULL", "PPG", "FG%"], [2], "#e35b00", "Top Scorer")
+    html += build_box(rebounders, ["#", "Name", "D", "O", "TOT"], ["NR", "NAME_FULL", "DR", "OR", "TOT"], [4], "#0055ff", "Rebounds")
+    html += build_box(shooters, ["#", "Name", "M", "A", "%"], ["NR", "NAME_FULL", "3M", "3A", "3PCT"], [4], "#28a745", "3-Points")
+    html += "</div>"
+    html += "<div class='top3-container'>"
+    html += build_box(fts, ["#", "Name", "M", "A", "%"], ["NR", "NAME_FULL", "FTM", "FTA", "FTPCT"], [4], "#dc3545", "Weak FT")
+    html += build_box(assisters, ["#", "Name", "AS"], ["NR", "NAME_FULL", "AS"], [2], "#ffc107", "Assists")
+    html += build_box(turnovers, ["#", "Name", "TO"], ["NR", "NAME_FULL", "TO"], [2], "#fd7e14", "Turnovers")
+    html += "</div>"
+    html += "<div class='top3-container'>"
+    html += build_box(stealers, ["#", "Name", "ST"], ["NR", "NAME_FULL", "ST"], [2], "#6f42c1", "Steals")
+    html += build_box(blocks, ["#", "Name", "BS"], ["NR", "NAME_FULL", "BS"], [2], "#343a40", "Blocks")
+    html += build_box(fouls, ["#", "Name", "PF"], ["NR", "NAME_FULL", "PF"], [2], "#20c997", "Fouls")
+    html += "</div>"
+
+    c_green = "#5c9c30"; c_gray = "#999999"; c_red = "#d9534f"
+    legend_html = f"""
+<div style="display: flex; gap: 30px; margin-top: 5px; margin-bottom: 20px; font-size: 14px; color: #333;">
+<div style="display: flex; align-items: center;"><div style="width: 15px; height: 15px; background-color: {c_green}; margin-right: 8px; border: 1px solid #ccc;"></div><strong>Shooter</strong></div>
+<div style="display: flex; align-items: center;"><div style="width: 15px; height: 15px; background-color: {c_gray}; margin-right: 8px; border: 1px solid #ccc;"></div>Normal</div>
+<div style="display: flex; align-items: center;"><div style="width: 15px; height: 15px; background-color: {c_red}; margin-right: 8px; border: 1px solid #ccc;"></div>Non-Shooter</div>
+</div>"""
+    return html + legend_html
+
+def legacy_card(row, metadata, notes, color_code):
+    img_url = metadata["img"] if metadata["img"] else "https://via.placeholder.com/150?text=No+Img"
+    try:
+        h = float(metadata["height"])
+        if h > 3: h = h / 100
+        height_str = f"{h:.2f}".replace(".", ",")
+    except: height_str = "-"
+    pos_str = clean_pos(metadata["pos"])
+    
+    stats_header = """<tr class="bg-gray"><th rowspan="2">Min</th><th rowspan="2">PPG</th><th colspan="3">2P FG</th><th colspan="3">3P FG</th><th colspan="3">FT</th><th colspan="3">REB</th><th rowspan="2">AS</th><th rowspan="2">TO</th><th rowspan="2">ST</th><th rowspan="2">PF</th></tr><tr class="bg-gray"><th>M</th><th>A</th><th>%</th><th>M</th><th>A</th><th>%</th><th>M</th><th>A</th><th>%</th><th>D</th><th>O</th><th>TOT</th></tr>"""
+    stats_row = f'<tr class="font-bold"><td>{row["MIN_DISPLAY"]}</td><td>{row["PPG"]}</td><td>{row["2M"]}</td><td>{row["2A"]}</td><td>{row["2PCT"]}</td><td>{row["3M"]}</td><td>{row["3A"]}</td><td>{row["3PCT"]}</td><td>{row["FTM"]}</td><td>{row["FTA"]}</td><td>{row["FTPCT"]}</td><td>{row["DR"]}</td><td>{row["OR"]}</td><td>{row["TOT"]}</td><td>{row["AS"]}</td><td>{row["TO"]}</td><td>{row["ST"]}</td><td>{row["PF"]}</td></tr>'
+    
+    note_rows = ""
+    for i in range(1, 5):
+        l_note = notes.get(f'l{i}', '')
+        r_note = notes.get(f'r{i}', '')
+        note_rows += f'<tr class="note-row"><td colspan="6">{l_note}</td><td colspan="12" class="note-right" style="color: #d9534f; font-weight: bold;">{r_note}</td></tr>'
+
+    return f"""
+<div class="player-card">
+<div class="card-header" style="background-color: {color_code};"><span>#{row['NR']} {row['NAME_FULL']}</span><span>{height_str} m | Pos: {pos_str}</span></div>
+<div class="card-body">
+<table class="layout-table"><tr>
+<td class="layout-img-cell"><img src="{img_url}" class="player-img"></td>
+<td class="layout-stats-cell">
+<table class="stats-table">
+{stats_header}
+{stats_row}
+{note_rows}
+</table>
+</td>
+</tr></table>
+</div>
+</div>"""
+
+def legacy_report(df, meta, notes):
+    html = legacy_top3(df)
+    for row in df.to_dict("records"): html += legacy_card(row, meta, notes, "#5c9c30")
+    return html
+
+def legacy_standings(df, region):
+    dbbl_logo = "https://toyota-dbbl.de/app/themes/dbbl/src/assets/toyota-DBBL-logo.svg"
+    title_text = f"2. Damen Basketball Bundesliga {region.capitalize()}"
+
+    html = f"<div style='position:fixed; top:50%; left:50%; transform:translate(-50%, -50%); width:1400px; background:white; border-radius:15px; border:3px solid #00338d; overflow:hidden; box-shadow:0 0 50px rgba(0,0,0,0.8); font-family:sans-serif;'>"
+    html += f"<div style='background:linear-gradient(90deg, #001f5b 0%, #00338d 100%); color:white; padding:10px 40px; display:flex; align-items:center; justify-content:space-between; border-bottom:5px solid #ff6600; height:120px;'>"
+    html += f"<span style='font-size:40px; font-weight:900; text-transform:uppercase; letter-spacing:1px;'>{title_text}</span>"
+    html += f"<img src='{dbbl_logo}' style='height:100px; width:auto; object-fit:contain; filter:drop-shadow(0 0 8px rgba(255,255,255,0.8));'></div>"
+    html += "<table style='width:100%; font-size:26px; border-collapse:collapse; text-align:center;'><thead>"
+    html += "<tr style='background:#eee; color:#001a4d; text-transform:uppercase; font-size:22px; border-bottom:3px solid #001a4d;'><th style='padding:15px; width:60px;'>#</th><th style='text-align:left; padding:15px;'>Team</th><th>Sp</th><th>S</th><th>N</th><th>Diff</th></tr></thead><tbody>"
+
+    for _, row in df.iterrows():
+        platz = row.get('Platz', 0); team = row.get('Team', 'Unknown')
+        try: rank_val = int(platz)
+        except: rank_val = 99
+
+        row_bg = "#e8f5e9" if rank_val <= 4 else ("#f8f9fa" if rank_val <= 8 else "#fce8e6")
+        row_border = "#28a745" if rank_val <= 4 else ("#6c757d" if rank_val <= 8 else "#dc3545")
+        diff_color = "#28a745" if str(row.get('Diff', '0')).startswith("+") else "#dc3545"
+
+        html += f"<tr style='background-color:{row_bg}; border-left:8px solid {row_border}; border-bottom:1px solid #ccc; color:#333; font-weight:bold;'>"
+        html += f"<td style='padding:12px;'>{platz}</td><td style='text-align:left; padding:12px;'>{team}</td><td>{row.get('Sp',0)}</td><td>{row.get('S',0)}</td><td>{row.get('N',0)}</td><td style='color:{diff_color};'>{row.get('Diff','0')}</td></tr>"
+
+    html += "</tbody></table></div>"
+    return html
+
+# --- NEUER STAND ---
+
+def template_report(df, meta, notes):
+    html = generate_top3_html(df)
+    for row in df.to_dict("records"): html += generate_card_html(row, meta, notes, "#5c9c30")
+    return html
+
+def measure(fn, args, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(*args); best = min(best, time.perf_counter() - t)
+    tracemalloc.start(); fn(*args); _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    return best, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HTML-Aufbau: += vs. vorkompilierte Vorlagen")
+    parser.add_argument("--cards", type=int, default=15)
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(2025)
+    df = synth_roster(args.cards, rnd)
+    meta = {"img": "data:image/jpeg;base64," + "A" * 40000, "height": "178", "pos": "GUARD"}
+    notes = {"l1": "Linkshänderin", "r1": "Zug zum Korb", "l2": "Pick & Roll", "r3": "Foul-anfällig"}
+    standings = synth_standings(args.teams)
+
+    cases = [(f"Report ({args.cards} Karten)", legacy_report, template_report, (df, meta, notes)),
+             (f"OBS-Tabelle ({args.teams} Teams)", legacy_standings, build_standings_html, (standings, "Süd"))]
+    assert legacy_report(df, meta, notes) == template_report(df, meta, notes)
+    assert legacy_standings(standings, "Süd") == build_standings_html(standings, "Süd")
+    print("Ergebnis identisch")
+    results = {}
+    print(f"{'':28} {'alt ms':>9} {'neu ms':>9} {'alt KiB':>9} {'neu KiB':>9}")
+    for label, old, new, fn_args in cases:
+        t_old, m_old = measure(old, fn_args, args.repeat)
+        t_new, m_new = measure(new, fn_args, args.repeat)
+        print(f"{label:28} {t_old * 1000:9.2f} {t_new * 1000:9.2f} {m_old / 1024:9.0f} {m_new / 1024:9.0f}")
+        results[label] = {"legacy_s": t_old, "template_s": t_new, "legacy_peak_bytes": m_old, "template_peak_bytes": m_new}
+    return results
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE benchmarks/bench_templates.py ---
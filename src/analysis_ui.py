@@ -3,51 +3,16 @@ import pandas as pd
 import altair as alt
 from datetime import datetime
 import pytz
-from src.api import get_player_metadata_cached, get_best_team_logo, fetch_last_n_games_complete
+from src.api import get_player_metadata_cached, get_best_team_logo, select_last_n_played, iter_game_boxscores
+from src.utils import image_variant_uri
+from src.game_events import translate_text, safe_int, get_team_name, get_player_lookup, events_for, live_score_state
 
 # --- KONSTANTEN & HELPERS ---
-ACTION_TRANSLATION = {
-    "TWO_POINT_SHOT_MADE": "2P Treffer", "TWO_POINT_SHOT_MISSED": "2P Fehl",
-    "THREE_POINT_SHOT_MADE": "3P Treffer", "THREE_POINT_SHOT_MISSED": "3P Fehl",
-    "FREE_THROW_MADE": "FW Treffer", "FREE_THROW_MISSED": "FW Fehl",
-    "REBOUND": "Rebound", "FOUL": "Foul", "TURNOVER": "TO",
-    "ASSIST": "Assist", "STEAL": "Steal", "BLOCK": "Block",
-    "SUBSTITUTION": "Wechsel", "TIMEOUT": "Auszeit",
-    "JUMP_BALL": "Sprungball", "START": "Start", "END": "Ende",
-    "TWO_POINT_THROW": "2P Wurf", "THREE_POINT_THROW": "3P Wurf",
-    "FREE_THROW": "Freiwurf", "layup": "Korbleger", "jump_shot": "Sprung",
-    "dunk": "Dunk", "offensive": "Off", "defensive": "Def",
-    "personal_foul": "Persönlich", "technical_foul": "Technisch",
-    "unsportsmanlike_foul": "Unsportlich"
-}
-
-def translate_text(text):
-    if not text: return ""
-    text_upper = str(text).upper()
-    if text_upper in ACTION_TRANSLATION: return ACTION_TRANSLATION[text_upper]
-    clean_text = text.replace("_", " ").lower()
-    for eng, ger in ACTION_TRANSLATION.items():
-        if eng.lower() in clean_text: clean_text = clean_text.replace(eng.lower(), ger)
-    return clean_text.capitalize()
-
-def safe_int(val):
-    if val is None: return 0
-    try: return int(float(val))
-    except: return 0
-
 def safe_div(numerator, denominator):
     """Sichere Division mit Prozentberechnung"""
     if denominator == 0: return 0.0
     return round((numerator / denominator) * 100, 1)
 
-def get_team_name(team_data, default_name="Team"):
-    if not team_data: return default_name
-    name = team_data.get("gameStat", {}).get("seasonTeam", {}).get("name")
-    if name: return name
-    name = team_data.get("seasonTeam", {}).get("name")
-    if name: return name
-    return team_data.get("name", default_name)
-
 def format_date_time(iso_string):
     if not iso_string: return "-"
     try:
@@ -56,61 +21,6 @@ def format_date_time(iso_string):
         return dt.astimezone(berlin).strftime("%d.%m.%Y | %H:%M Uhr")
     except: return iso_string
 
-def get_player_lookup(box):
-    lookup = {}
-    for team_key in ['homeTeam', 'guestTeam']:
-        for p in box.get(team_key, {}).get('playerStats', []):
-            pid = str(p.get('seasonPlayer', {}).get('id'))
-            name = f"{p.get('seasonPlayer', {}).get('lastName', '')}" 
-            nr = p.get('seasonPlayer', {}).get('shirtNumber', '')
-            lookup[pid] = f"#{nr} {name}"
-    return lookup
-
-def get_player_team_map(box):
-    player_team = {}
-    h_name = get_team_name(box.get("homeTeam", {}), "Heim")
-    g_name = get_team_name(box.get("guestTeam", {}), "Gast")
-    for p in box.get("homeTeam", {}).get('playerStats', []):
-        player_team[str(p.get('seasonPlayer', {}).get('id'))] = h_name
-    for p in box.get("guestTeam", {}).get('playerStats', []):
-        player_team[str(p.get('seasonPlayer', {}).get('id'))] = g_name
-    return player_team
-
-def get_team_ids(team_data):
-    """Extrahiert alle möglichen Team-IDs und gibt eindeutige Liste zurück"""
-    ids = []
-    if team_data:
-        ids.extend([
-            str(team_data.get("seasonTeamId", "")),
-            str(team_data.get("teamId", "")),
-            str(team_data.get("seasonTeam", {}).get("id", ""))
-        ])
-    # Entferne leere Strings und Duplikate
-    return list(set(filter(None, ids)))
-
-def get_time_info(time_str, period):
-    if not time_str: return "10:00", "00:00"
-    p_int = safe_int(period)
-    base_min = 5 if p_int > 4 else 10
-    total_sec = base_min * 60
-    elapsed_sec = 0
-    try:
-        if "PT" in str(time_str):
-            t = str(time_str).replace("PT", "").replace("S", "")
-            if "M" in t:
-                parts = t.split("M")
-                elapsed_sec = int(float(parts[0])) * 60 + int(float(parts[1] or 0))
-            else: elapsed_sec = int(float(t))
-        elif ":" in str(time_str):
-            parts = str(time_str).split(":")
-            if len(parts) == 3: elapsed_sec = int(parts[0])*3600 + int(parts[1])*60 + int(parts[2])
-            elif len(parts) == 2: elapsed_sec = int(parts[0])*60 + int(parts[1])
-        else: elapsed_sec = int(float(time_str))
-        rem_sec = total_sec - elapsed_sec
-        if rem_sec < 0: rem_sec = 0
-        return f"{rem_sec // 60:02d}:{rem_sec % 60:02d}", f"{elapsed_sec // 60:02d}:{elapsed_sec % 60:02d}"
-    except: return "10:00", str(time_str)
-
 # --- VISUELLE KOMPONENTEN ---
 
 def render_live_comparison_bars(box):
@@ -178,20 +88,11 @@ def render_live_comparison_bars(box):
             </div>
         """, unsafe_allow_html=True)
 
-def render_game_flow_chart(actions, h_name, g_name):
+def render_game_flow_chart(actions, h_name, g_name, events=None):
     if not actions: return
-    data = []
-    run_h, run_g = 0, 0
-    sorted_actions = sorted(actions, key=lambda x: x.get('actionNumber', 0))
-    for i, act in enumerate(sorted_actions):
-        h, g = act.get("homeTeamPoints"), act.get("guestTeamPoints")
-        if h is not None and g is not None:
-            run_h, run_g = safe_int(h), safe_int(g)
-            diff = run_h - run_g
-            leader = h_name if diff > 0 else (g_name if diff < 0 else "Tie")
-            data.append({"Index": i, "Diff": diff, "Team": leader, "Score": f"{run_h}:{run_g}"})
-    if not data: return
-    df = pd.DataFrame(data)
+    if events is None: events = events_for({"actions": actions})
+    df = events.flow_frame(h_name, g_name)
+    if df.empty: return
     color_scale = alt.Scale(domain=[h_name, g_name, "Tie"], range=["#e35b00", "#112244", "#cccccc"])
     chart = alt.Chart(df).mark_area(interpolate='step-after', line=True).encode(
         x=alt.X('Index', axis=None, title=""),
@@ -335,30 +236,11 @@ def run_openai_generation(api_key, prompt):
 
 # --- LIVE VIEW & TICKER ---
 
-def render_full_play_by_play(box, height=600):
+def render_full_play_by_play(box, height=600, events=None):
     actions = box.get("actions", [])
     if not actions: st.info("Keine Play-by-Play Daten verfügbar."); return
-    player_map = get_player_lookup(box); team_map = get_player_team_map(box)
-    h_name, g_name = get_team_name(box.get("homeTeam")), get_team_name(box.get("guestTeam"))
-    h_ids = get_team_ids(box.get("homeTeam", {}))
-    g_ids = get_team_ids(box.get("guestTeam", {}))
-    
-    data = []; run_h, run_g = 0, 0
-    actions_sorted = sorted(actions, key=lambda x: x.get('actionNumber', 0))
-    for act in actions_sorted:
-        hr, gr = act.get("homeTeamPoints"), act.get("guestTeamPoints")
-        if hr is not None and gr is not None:
-            nh, ng = safe_int(hr), safe_int(gr)
-            if (nh + ng) >= (run_h + run_g): run_h, run_g = nh, ng
-        p = act.get("period", "")
-        t_rem, t_orig = get_time_info(act.get("gameTime") or act.get("timeInGame"), p)
-        pid = str(act.get("seasonPlayerId"))
-        team = team_map.get(pid) or (h_name if str(act.get("seasonTeamId")) in h_ids else (g_name if str(act.get("seasonTeamId")) in g_ids else "-"))
-        actor = player_map.get(pid, ""); desc = translate_text(act.get("type"))
-        if act.get("points"): desc += f" (+{act.get('points')})"
-        data.append({"Zeit": f"Q{p} | {t_rem} ({t_orig})", "Score": f"{run_h}:{run_g}", "Team": team, "Spieler": actor, "Aktion": desc})
-    df = pd.DataFrame(data)
-    if not df.empty: df = df.iloc[::-1]
+    if events is None: events = events_for(box)
+    df = events.pbp_frame()
     st.dataframe(df, use_container_width=True, hide_index=True, height=height)
 
 def create_live_boxscore_df(team_data):
@@ -437,31 +319,19 @@ def create_live_boxscore_df(team_data):
     df_totals = pd.DataFrame([totals])
     return pd.concat([df, df_totals], ignore_index=True)
 
-def render_live_view(box):
+def render_live_view(box, events=None):
+    """events: EventView des Spiels (Live-Poller); ohne wird er einmalig aus box aufgebaut."""
     if not box: return
     h_data, g_data = box.get("homeTeam", {}), box.get("guestTeam", {})
     h_name, g_name = get_team_name(h_data), get_team_name(g_data)
-    res = box.get("result", {}); sh, sg = safe_int(res.get('homeTeamFinalScore')), safe_int(res.get('guestTeamFinalScore'))
-    period = res.get('period') or box.get('period', 1)
     actions = box.get("actions", [])
-    if sh == 0 and sg == 0 and actions:
-        last = sorted(actions, key=lambda x: x.get('actionNumber', 0))[-1]
-        sh, sg = safe_int(last.get('homeTeamPoints')), safe_int(last.get('guestTeamPoints'))
-        if not period: period = last.get('period')
-    
-    if not period or period == 0:
-        for act in reversed(actions):
-            if act.get('period'): period = act.get('period'); break
-    
-    t_rem, t_orig = get_time_info(box.get('gameTime') or (actions[-1].get('gameTime') if actions else None), period)
-    p_str = (f"OT{safe_int(period)-4}" if safe_int(period) > 4 else f"Q{period}")
+    if events is None: events = events_for(box)
+    state = live_score_state(box, events)
+    sh, sg, t_rem, p_str = state["h_score"], state["g_score"], state["clock"], state["period_label"]
+    h_fouls, g_fouls = state["h_fouls"], state["g_fouls"]
     h_hc = h_data.get("headCoachName") or h_data.get("headCoach",{}).get("lastName","-")
     g_hc = g_data.get("headCoachName") or g_data.get("headCoach",{}).get("lastName","-")
     
-    h_ids = get_team_ids(h_data)
-    g_ids = get_team_ids(g_data)
-    h_fouls, g_fouls = get_live_team_fouls(actions, period, h_ids, g_ids)
-    
     h_logo = get_best_team_logo(str(h_data.get("seasonTeamId")))
     g_logo = get_best_team_logo(str(g_data.get("seasonTeamId")))
     
@@ -523,20 +393,14 @@ def render_live_view(box):
             if not dfg.empty: st.dataframe(dfg.style.apply(style_live, axis=1), hide_index=True, use_container_width=True)
     
     with t2:
-        render_game_flow_chart(actions, h_name, g_name)
+        render_game_flow_chart(actions, h_name, g_name, events)
         render_live_comparison_bars(box)
         
-    with t3: render_full_play_by_play(box)
-
-def get_live_team_fouls(actions, period, h_ids, g_ids):
-    h, g = 0, 0
-    p = safe_int(period)
-    for a in actions:
-        if safe_int(a.get("period")) == p and "FOUL" in str(a.get("type")).upper() and "RECEIVED" not in str(a.get("type")).upper():
-            tid = str(a.get("seasonTeamId"))
-            if tid in h_ids: h += 1
-            elif tid in g_ids: g += 1
-    return min(h, 5), min(g, 5)
+    with t3: render_full_play_by_play(box, events=events)
+
+def get_live_team_fouls(actions, period, h_ids, g_ids, events=None):
+    if events is None: events = events_for({"actions": actions})
+    return events.team_fouls(period, h_ids, g_ids)
 
 # --- PREP & SCOUTING (Team-Analyse) ---
 
@@ -550,7 +414,7 @@ def render_prep_dashboard(team_id, team_name, df_roster, last_games, metadata_ca
             for _, row in top4.iterrows():
                 with st.container(border=True):
                     ci, cs = st.columns([1, 4])
-                    img = metadata_callback(row["PLAYER_ID"]).get("img") if metadata_callback else None
+                    img = image_variant_uri(metadata_callback(row["PLAYER_ID"]).get("img"), "ui", None) if metadata_callback else None
                     if img: ci.image(img, width=80)
                     else: ci.markdown("<div style='font-size:30px;'>👤</div>", unsafe_allow_html=True)
                     cs.markdown(f"**#{row.get('NR','-')} {row.get('NAME_FULL','Unk')}**")
@@ -664,11 +528,28 @@ def render_team_analysis_dashboard(team_id, team_name):
     if logo: c1.image(logo, width=100)
     c2.title(f"Scouting Report: {team_name}")
     
+    selection = select_last_n_played(team_id, "2025", n=50)
+    if not selection:
+        st.warning("Keine Daten.")
+        return
+
+    # Boxscores parallel laden und Fortschritt sofort anzeigen (neueste Spiele zuerst)
+    total = len(selection)
+    progress = st.progress(0.0, text=f"Lade Spiele 0/{total}...")
+    preview = st.empty()
+    loaded = {}
+    for done, (idx, box) in enumerate(iter_game_boxscores(team_id, selection), start=1):
+        if box: loaded[idx] = box
+        progress.progress(done / total, text=f"Lade Spiele {done}/{total}...")
+        lines = [f"✅ {loaded[i].get('meta_date')} vs {loaded[i].get('meta_opponent')} ({loaded[i].get('meta_result')})" for i in sorted(loaded)]
+        preview.markdown("  \n".join(lines))
+    progress.empty(); preview.empty()
+
+    games = [loaded[i] for i in sorted(loaded)]
+    if not games: 
+        st.warning("Keine Daten.")
+        return
     with st.spinner("Analysiere..."):
-        games = fetch_last_n_games_complete(team_id, "2025", n=50)
-        if not games: 
-            st.warning("Keine Daten.")
-            return
         scout = analyze_scouting_data(team_id, games)
     
     k1, k2, k3, k4 = st.columns(4)
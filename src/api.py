@@ -1,22 +1,21 @@
 # --- START OF FILE src/api.py ---
-import streamlit as st
-import requests
 import pandas as pd
-import base64
+import numpy as np
 from datetime import datetime
+from functools import lru_cache
 import pytz
-from src.config import API_HEADERS, SEASON_ID, TEAMS_DB
+from src.config import API_HEADERS, SEASON_ID, TEAMS_DB, METADATA_WORKERS, BOXSCORE_WORKERS, PREFETCH_MAX_AGE_H, STATIC_MAX_AGE_H, HTTP_RETRIES
+from src.http_client import api_get
+from src.routing import routed_get_json, candidate_hosts, team_hint, remember_many, HOST_SOUTH, HOST_NORTH, HOST_FIRST
+from src.parallel import run_parallel, iter_parallel
+from src import disk_cache, image_store
+from src.tracing import cached_fetcher, traced
+from src.swr import swr_fetcher, note_as_of
 
 # --- HILFSFUNKTIONEN ---
 
 def get_base_url(team_id):
-    try:
-        tid = int(team_id)
-        team_info = TEAMS_DB.get(tid)
-        if team_info and team_info.get("staffel") == "Nord":
-            return "https://api-n.dbbl.scb.world"
-    except: pass
-    return "https://api-s.dbbl.scb.world"
+    return team_hint(team_id) or HOST_SOUTH
 
 def format_minutes(seconds):
     if seconds is None: return "00:00"
@@ -49,75 +48,177 @@ def safe_int(val):
     try: return int(float(val))
     except: return 0
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@cached_fetcher(ttl=3600, show_spinner=False)
 def get_best_team_logo(team_id):
     if not team_id: return None
     sid = SEASON_ID if SEASON_ID else "2025"
-    candidates = [
-        f"https://api-s.dbbl.scb.world/images/teams/logo/{sid}/{team_id}",
-        f"https://api-n.dbbl.scb.world/images/teams/logo/{sid}/{team_id}",
-        f"https://api-s.dbbl.scb.world/images/teams/logo/2024/{team_id}",
-        f"https://api-n.dbbl.scb.world/images/teams/logo/2024/{team_id}"
-    ]
+    hosts = candidate_hosts("team", team_id, team_hint(team_id))
+    candidates = [f"{host}/images/teams/logo/{season}/{team_id}" for season in (sid, "2024") for host in hosts]
     headers = { "User-Agent": "Mozilla/5.0", "Accept": "image/*", "Referer": "https://dbbl.de/" }
-    for url in candidates:
-        try:
-            r = requests.get(url, headers=headers, timeout=1.0)
-            if r.status_code == 200 and len(r.content) > 500: 
-                b64 = base64.b64encode(r.content).decode()
-                mime = "image/jpeg" if "jpg" in url or "jpeg" in url else "image/png"
-                return f"data:{mime};base64,{b64}"
-        except: continue
+    # Logos kommen aus dem persistenten Bild-Speicher; fehlende Kandidaten werden dort negativ gemerkt
+    for i, url in enumerate(candidates):
+        logo = image_store.data_uri(url, headers=headers, endpoint="logo", min_bytes=500, retries=HTTP_RETRIES if i == len(candidates) - 1 else 0)
+        if logo: return logo
     return None
 
 # --- CACHED API CALLS ---
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@cached_fetcher(ttl=3600, show_spinner=False)
 def get_player_metadata_cached(player_id):
     clean_id = str(player_id).replace(".0", "")
-    for subdomain in ["api-s", "api-n"]:
-        url = f"https://{subdomain}.dbbl.scb.world/season-players/{clean_id}"
+    stored = disk_cache.get("player_meta", clean_id, max_age=STATIC_MAX_AGE_H * 3600)
+    if stored: return stored
+    data, _ = routed_get_json("player", clean_id, f"/season-players/{clean_id}", endpoint="player_meta", headers=API_HEADERS)
+    if data:
         try:
-            resp = requests.get(url, headers=API_HEADERS, timeout=1.5)
-            if resp.status_code == 200:
-                data = resp.json()
-                person = data.get("person", {})
-                img = data.get("imageUrl", "")
-                bdate = data.get("birthDate") or person.get("birthDate") or person.get("birthdate")
-                age = calculate_age(bdate)
-                nat = extract_nationality(data)
-                if nat == "-": nat = extract_nationality(person)
-                height = data.get("height") or person.get("height", "-")
-                return {"img": img, "height": height, "pos": data.get("position", "-"), "age": age, "nationality": nat}
+            person = data.get("person", {})
+            img = data.get("imageUrl", "")
+            bdate = data.get("birthDate") or person.get("birthDate") or person.get("birthdate")
+            age = calculate_age(bdate)
+            nat = extract_nationality(data)
+            if nat == "-": nat = extract_nationality(person)
+            height = data.get("height") or person.get("height", "-")
+            meta = {"img": img, "height": height, "pos": data.get("position", "-"), "age": age, "nationality": nat}
+            disk_cache.put("player_meta", clean_id, meta)
+            return meta
         except: pass
     return {"img": "", "height": "-", "pos": "-", "age": "-", "nationality": "-"}
 
-@st.cache_data(ttl=600)
-def fetch_team_details_raw(team_id, season_id):
-    urls = [
-        f"https://api-1.dbbl.scb.world/teams/{team_id}/{season_id}",
-        f"{get_base_url(team_id)}/teams/{team_id}/{season_id}",
-        f"https://api-s.dbbl.scb.world/teams/{team_id}/{season_id}",
-        f"https://api-n.dbbl.scb.world/teams/{team_id}/{season_id}"
-    ]
-    for url in urls:
-        try:
-            resp = requests.get(url, headers=API_HEADERS, timeout=2)
-            if resp.status_code == 200: return resp.json()
-        except: pass
-    return None
+def get_player_metadata_batch(player_ids, max_workers=METADATA_WORKERS):
+    """Holt Metadaten für viele Spieler parallel (ein Pool-Durchlauf statt N sequentieller Aufrufe).
+    Gibt eine Lookup-Tabelle {player_id: metadata} zurück."""
+    ids = list(dict.fromkeys(str(pid) for pid in player_ids if pid is not None))
+    return dict(zip(ids, run_parallel(get_player_metadata_cached, ids, max_workers)))
 
+@cached_fetcher(ttl=600)
+def fetch_team_details_raw(team_id, season_id):
+    # Eigene Routing-Art, damit api-1 (nur Kaderdaten) nicht für die Statistik-Endpunkte gelernt wird
+    data, _ = routed_get_json("team_details", team_id, f"/teams/{team_id}/{season_id}", endpoint="team_details",
+                              headers=API_HEADERS, hint=HOST_FIRST, extra_hosts=[get_base_url(team_id)])
+    return data
+
+# --- KADER-STATISTIK (vektorisiert) ---
+# Spaltenzuordnung für die player-stats-Antwort. Hängt nur vom Schema (den Spaltennamen) ab und wird
+# deshalb pro Schema einmal berechnet. Regel wie bisher: exakter Treffer oder Teilstring ohne
+# 'pergame'/'percent', bei mehreren Treffern der kürzeste Spaltenname.
+_STAT_KEYS = {
+    "GP": "gamesplayed", "SECONDS": "secondsplayed", "TOTAL_PTS": "points", "TOTAL_REB": "totalrebounds",
+    "TOTAL_AST": "assists", "TOTAL_STL": "steals", "TOTAL_TO": "turnovers", "TOTAL_BLK": "blocks",
+    "TOTAL_PF": "foulscommitted", "TOTAL_OR": "offensiverebounds", "TOTAL_DR": "defensiverebounds",
+    "TOTAL_FGM": "fieldgoalsmade", "TOTAL_FGA": "fieldgoalsattempted", "TOTAL_3M": "threepointshotsmade",
+    "TOTAL_3A": "threepointshotsattempted", "TOTAL_FTM": "freethrowsmade", "TOTAL_FTA": "freethrowsattempted",
+}
+# Pro-Spiel-Spalte -> Summen-Spalte (Reihenfolge = Spaltenreihenfolge im DataFrame)
+_PER_GAME = {
+    "PPG": "TOTAL_PTS", "TOT": "TOTAL_REB", "AS": "TOTAL_AST", "ST": "TOTAL_STL", "TO": "TOTAL_TO", "BS": "TOTAL_BLK",
+    "PF": "TOTAL_PF", "OR": "TOTAL_OR", "DR": "TOTAL_DR", "2M": "TOTAL_2M", "2A": "TOTAL_2A", "3M": "TOTAL_3M",
+    "3A": "TOTAL_3A", "FTM": "TOTAL_FTM", "FTA": "TOTAL_FTA",
+}
+
+def _match_stat_column(columns, key):
+    matches = [c for c in columns if key == c or (key in c and 'pergame' not in c and 'percent' not in c)]
+    return sorted(matches, key=len)[0] if matches else None
+
+@lru_cache(maxsize=32)
+def _resolve_roster_columns(columns):
+    col_fn = 'seasonplayer.firstname' if 'seasonplayer.firstname' in columns else ('firstname' if 'firstname' in columns else None)
+    col_ln = 'seasonplayer.lastname' if 'seasonplayer.lastname' in columns else ('lastname' if 'lastname' in columns else None)
+    col_id = None
+    for opt in ["seasonplayer.id", "seasonplayerid", "personid", "playerid", "id"]:
+        matches = [c for c in columns if opt in c]
+        if matches: col_id = sorted(matches, key=len)[0]; break
+    col_nr = next((c for c in columns if "shirtnumber" in c or "jerseynumber" in c), None)
+    stats = {name: _match_stat_column(columns, key) for name, key in _STAT_KEYS.items()}
+    return {"firstname": col_fn, "lastname": col_ln, "id": col_id, "nr": col_nr, "stats": stats}
+
+def format_minutes_array(seconds):
+    """Vektorisierte Variante von format_minutes (NaN/inf -> '00:00')."""
+    arr = np.asarray(seconds, dtype=float)
+    ok = np.isfinite(arr)
+    sec = np.trunc(np.where(ok, arr, 0)).astype(np.int64)
+    m = pd.Series(sec // 60).astype(str).str.zfill(2); s = pd.Series(sec % 60).astype(str).str.zfill(2)
+    return np.where(ok, (m + ":" + s).to_numpy(), "00:00")
+
+def _derive_roster_stats(df, stat_cols):
+    """Alle Summen, Pro-Spiel-Werte und Quoten in einem Durchlauf als neuer DataFrame (gleicher Index)."""
+    n = len(df)
+    raw = {}
+    for name, col in stat_cols.items():
+        raw[name] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).to_numpy() if col else np.zeros(n)
+    out = {}
+    gp = np.where(raw["GP"] == 0, 1, raw["GP"])
+    out["GP"] = gp
+    out["TOTAL_MINUTES"] = raw["SECONDS"] / 60
+    for name in list(_STAT_KEYS)[2:]: out[name] = raw[name]
+    out["TOTAL_2M"] = out["TOTAL_FGM"] - out["TOTAL_3M"]
+    out["TOTAL_2A"] = out["TOTAL_FGA"] - out["TOTAL_3A"]
+    out["MIN_DISPLAY"] = format_minutes_array(out["TOTAL_MINUTES"] * 60 / gp)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        totals = np.column_stack([out[c] for c in _PER_GAME.values()]).astype(float)
+        per_game = np.round(totals / gp.reshape(-1, 1), 1)
+        for i, name in enumerate(_PER_GAME): out[name] = per_game[:, i]
+
+        made = np.column_stack([out["TOTAL_FGM"], out["TOTAL_3M"], out["TOTAL_FTM"]]).astype(float)
+        att = np.column_stack([out["TOTAL_FGA"], out["TOTAL_3A"], out["TOTAL_FTA"]]).astype(float)
+        pct = np.round(made / att * 100, 1)
+        pct[np.isnan(pct)] = 0
+        out["FG%"] = pct[:, 0]; out["3PCT"] = pct[:, 1]; out["FTPCT"] = pct[:, 2]
+        a2 = out["TOTAL_2A"]
+        out["2PCT"] = np.where(a2 > 0, np.round(out["TOTAL_2M"] / np.where(a2 > 0, a2, 1) * 100, 1), 0.0)
+    return pd.DataFrame(out, index=df.index)
+
+# Rohdaten-Abrufe einzeln, damit src/api_async.py sie gleichzeitig starten kann
+@traced("api")
+def fetch_team_season_stats_raw(team_id, season_id):
+    data, _ = routed_get_json("team", team_id, f"/teams/{team_id}/{season_id}/statistics/season", endpoint="team_stats", headers=API_HEADERS, hint=team_hint(team_id))
+    return data
+
+@traced("api")
+def fetch_player_stats_raw(team_id, season_id):
+    """Gibt (json, host) zurück - der Host wird für das Spieler-Routing gebraucht."""
+    return routed_get_json("team", team_id, f"/teams/{team_id}/{season_id}/player-stats", endpoint="player_stats", headers=API_HEADERS, hint=team_hint(team_id))
+
+def load_prefetched_team_data(team_id, season_id):
+    """(df, ts) aus dem Vorab-Cache (src/prefetch.py), solange jünger als PREFETCH_MAX_AGE_H - sonst None.
+    Nur Startwert für fetch_team_data: wird einmal ausgeliefert und sofort durch API-Daten ersetzt."""
+    hit = disk_cache.get_frame("team_data", f"{team_id}:{season_id}", max_age=PREFETCH_MAX_AGE_H * 3600)
+    if hit is None: return None
+    note_as_of(disk_cache.created_at("team_data", f"{team_id}:{season_id}"))  # "Daten Stand" = Zeitpunkt des Vorab-Ladens
+    df, ts = hit
+    return df, ts or {}
+
+def store_team_data(team_id, season_id, df, ts):
+    if df is None or df.empty: return
+    disk_cache.put_frame("team_data", f"{team_id}:{season_id}", df, extra=ts)
+
+def _has_roster(result):
+    if result is None: return False  # kein Vorab-Stand (seed)
+    df, _ = result
+    return df is not None and not df.empty
+
+# Stale-while-revalidate (src/swr.py): nach Ablauf kommt sofort der letzte Kader, neu geladen wird im Hintergrund.
+# Vorab geladene Teams starten mit dem Stand von der Platte, aktualisiert wird immer über die API.
+@swr_fetcher(ttl=600, valid=_has_roster, seed=load_prefetched_team_data)
 def fetch_team_data(team_id, season_id):
-    base_url = get_base_url(team_id)
-    api_stats_players = f"{base_url}/teams/{team_id}/{season_id}/player-stats"
-    api_team_direct = f"{base_url}/teams/{team_id}/{season_id}/statistics/season"
+    return fetch_team_data_live(team_id, season_id)
+
+@traced("api")
+def fetch_team_data_live(team_id, season_id):
+    # Die drei Rohabrufe gleichzeitig (src/api_async.py; Import hier, weil api_async dieses Modul importiert)
+    from src.api_async import run_async, gather_team_bundle
+    b = run_async(gather_team_bundle(team_id, season_id), max_workers=3)
+    return build_team_data(team_id, b["team_stats"], b["squad"], b["player_stats"], b["players_host"])
+
+@traced("pandas")
+def build_team_data(team_id, team_raw, details_raw, players_raw, players_host=None):
+    """Baut aus den drei Rohantworten (statistics/season, teams/{id}/{season}, player-stats) Kader-DataFrame und Team-Stats."""
     ts = {}
     df = pd.DataFrame()
 
     try:
-        r_team = requests.get(api_team_direct, headers=API_HEADERS, timeout=3)
-        if r_team.status_code == 200:
-            data = r_team.json()
+        data = team_raw
+        if data is not None:
             td = None
             if isinstance(data, list):
                 search_id = str(team_id)
@@ -150,7 +251,7 @@ def fetch_team_data(team_id, season_id):
 
     try:
         roster_lookup = {}
-        raw_details = fetch_team_details_raw(team_id, season_id)
+        raw_details = details_raw
         if raw_details:
             squad = raw_details.get("squad", []) if isinstance(raw_details, dict) else []
             for entry in squad:
@@ -164,83 +265,47 @@ def fetch_team_data(team_id, season_id):
                     height = p.get("height") or entry.get("height", "-")
                     roster_lookup[pid] = {"birthdate": bdate, "nationality": nat, "height": height}
         
-        r_stats = requests.get(api_stats_players, headers=API_HEADERS, timeout=4)
-        if r_stats.status_code == 200:
-            raw_p = r_stats.json()
+        raw_p = players_raw
+        if raw_p is not None:
             p_list = raw_p if isinstance(raw_p, list) else raw_p.get("data", [])
             
             if p_list:
                 df = pd.json_normalize(p_list)
                 df.columns = [str(c).lower() for c in df.columns]
                 
-                col_fn = None; col_ln = None
-                if 'seasonplayer.firstname' in df.columns: col_fn = 'seasonplayer.firstname'
-                elif 'firstname' in df.columns: col_fn = 'firstname'
-                if 'seasonplayer.lastname' in df.columns: col_ln = 'seasonplayer.lastname'
-                elif 'lastname' in df.columns: col_ln = 'lastname'
+                cols = _resolve_roster_columns(tuple(df.columns))
+                col_fn = cols["firstname"]; col_ln = cols["lastname"]; col_id = cols["id"]; col_nr = cols["nr"]
                 
                 if col_fn and col_ln: df["NAME_FULL"] = (df[col_fn].astype(str) + " " + df[col_ln].astype(str)).str.strip()
                 else: df["NAME_FULL"] = "Unknown"
 
-                col_id_opts = ["seasonplayer.id", "seasonplayerid", "personid", "playerid", "id"]
-                col_id = None
-                for opt in col_id_opts:
-                     matches = [c for c in df.columns if opt in c]
-                     if matches: col_id = sorted(matches, key=len)[0]; break
-                
-                col_nr = next((c for c in df.columns if "shirtnumber" in c or "jerseynumber" in c), None)
                 df["NR"] = df[col_nr].astype(str).str.replace(".0","",regex=False) if col_nr else "-"
                 df["PLAYER_ID"] = df[col_id].astype(str).str.replace(".0","",regex=False) if col_id else "0"
-                
-                def get_val(key, default=0.0):
-                    matches = [c for c in df.columns if key == c or (key in c and 'pergame' not in c and 'percent' not in c)]
-                    if matches: return pd.to_numeric(df[sorted(matches, key=len)[0]], errors="coerce").fillna(default)
-                    return pd.Series([default]*len(df), index=df.index)
+                # Spieler dieses Teams liegen auf demselben Host -> Metadaten-Abrufe gehen direkt dorthin
+                if col_id: remember_many("player", df["PLAYER_ID"].tolist(), players_host)
 
-                def get_meta_field(pid, field_key):
+                def get_roster_field(pid, field_key):
                     val = roster_lookup.get(pid, {}).get(field_key)
-                    if val and val != "-": return val
-                    meta = get_player_metadata_cached(pid)
-                    if field_key == "birthdate": return None 
-                    return meta.get(field_key, "-")
+                    return val if (val and val != "-") else None
 
-                df["AGE"] = df["PLAYER_ID"].apply(lambda pid: calculate_age(roster_lookup.get(pid, {}).get("birthdate")))
-                mask_no_age = df["AGE"] == "-"
-                if mask_no_age.any(): df.loc[mask_no_age, "AGE"] = df.loc[mask_no_age, "PLAYER_ID"].apply(lambda pid: get_player_metadata_cached(pid).get("age", "-"))
+                # Erst alle Lücken sammeln, dann fehlende Metadaten in EINEM parallelen Durchlauf holen
+                pids = df["PLAYER_ID"].tolist()
+                roster_ages = {pid: calculate_age(roster_lookup.get(pid, {}).get("birthdate")) for pid in pids}
+                missing = [pid for pid in pids if roster_ages[pid] == "-" or get_roster_field(pid, "nationality") is None or get_roster_field(pid, "height") is None]
+                meta_lookup = get_player_metadata_batch(missing)
 
-                df["NATIONALITY"] = df["PLAYER_ID"].apply(lambda pid: get_meta_field(pid, "nationality"))
-                df["HEIGHT_ROSTER"] = df["PLAYER_ID"].apply(lambda pid: get_meta_field(pid, "height"))
-                
-                df["GP"] = get_val("gamesplayed").replace(0, 1)
-                df["TOTAL_MINUTES"] = get_val("secondsplayed") / 60
-                df["TOTAL_PTS"] = get_val("points"); df["TOTAL_REB"] = get_val("totalrebounds")
-                df["TOTAL_AST"] = get_val("assists"); df["TOTAL_STL"] = get_val("steals")
-                df["TOTAL_TO"] = get_val("turnovers"); df["TOTAL_BLK"] = get_val("blocks")
-                df["TOTAL_PF"] = get_val("foulscommitted"); df["TOTAL_OR"] = get_val("offensiverebounds")
-                df["TOTAL_DR"] = get_val("defensiverebounds"); df["TOTAL_FGM"] = get_val("fieldgoalsmade")
-                df["TOTAL_FGA"] = get_val("fieldgoalsattempted"); df["TOTAL_3M"] = get_val("threepointshotsmade")
-                df["TOTAL_3A"] = get_val("threepointshotsattempted"); df["TOTAL_FTM"] = get_val("freethrowsmade")
-                df["TOTAL_FTA"] = get_val("freethrowsattempted"); df["TOTAL_2M"] = df["TOTAL_FGM"] - df["TOTAL_3M"]
-                df["TOTAL_2A"] = df["TOTAL_FGA"] - df["TOTAL_3A"]
-                
-                gp_safe = df["GP"].replace(0, 1)
-                df["MIN_DISPLAY"] = (df["TOTAL_MINUTES"] * 60 / gp_safe).apply(format_minutes)
-                df["PPG"] = (df["TOTAL_PTS"] / gp_safe).round(1); df["TOT"] = (df["TOTAL_REB"] / gp_safe).round(1)
-                df["AS"] = (df["TOTAL_AST"] / gp_safe).round(1); df["ST"] = (df["TOTAL_STL"] / gp_safe).round(1)
-                df["TO"] = (df["TOTAL_TO"] / gp_safe).round(1); df["BS"] = (df["TOTAL_BLK"] / gp_safe).round(1)
-                df["PF"] = (df["TOTAL_PF"] / gp_safe).round(1); df["OR"] = (df["TOTAL_OR"] / gp_safe).round(1)
-                df["DR"] = (df["TOTAL_DR"] / gp_safe).round(1); df["2M"] = (df["TOTAL_2M"] / gp_safe).round(1)
-                df["2A"] = (df["TOTAL_2A"] / gp_safe).round(1); df["3M"] = (df["TOTAL_3M"] / gp_safe).round(1)
-                df["3A"] = (df["TOTAL_3A"] / gp_safe).round(1); df["FTM"] = (df["TOTAL_FTM"] / gp_safe).round(1)
-                df["FTA"] = (df["TOTAL_FTA"] / gp_safe).round(1)
-
-                df["FG%"] = (df["TOTAL_FGM"] / df["TOTAL_FGA"] * 100).round(1).fillna(0)
-                df["3PCT"] = (df["TOTAL_3M"] / df["TOTAL_3A"] * 100).round(1).fillna(0)
-                df["FTPCT"] = (df["TOTAL_FTM"] / df["TOTAL_FTA"] * 100).round(1).fillna(0)
-                df["2PCT"] = 0.0; mask2 = df["TOTAL_2A"] > 0
-                df.loc[mask2, "2PCT"] = (df.loc[mask2, "TOTAL_2M"] / df.loc[mask2, "TOTAL_2A"] * 100).round(1)
+                def get_meta_field(pid, field_key):
+                    val = get_roster_field(pid, field_key)
+                    if val is not None: return val
+                    return meta_lookup.get(pid, {}).get(field_key, "-")
+
+                df["AGE"] = [roster_ages[pid] if roster_ages[pid] != "-" else meta_lookup.get(pid, {}).get("age", "-") for pid in pids]
+                df["NATIONALITY"] = [get_meta_field(pid, "nationality") for pid in pids]
+                df["HEIGHT_ROSTER"] = [get_meta_field(pid, "height") for pid in pids]
+
+                df = pd.concat([df, _derive_roster_stats(df, cols["stats"])], axis=1)
                 df["select"] = False
-    except Exception as e: print(f"Error Player Stats ({base_url}): {e}")
+    except Exception as e: print(f"Error Player Stats ({players_host or team_id}): {e}")
 
     if not ts and not df.empty:
         tg = df["GP"].max() if not df.empty else 1
@@ -266,86 +331,106 @@ def fetch_team_data(team_id, season_id):
 
     return df, ts
 
-@st.cache_data(ttl=300)
+@swr_fetcher(ttl=300)
 def fetch_schedule(team_id, season_id):
-    urls = [
-        f"https://api-s.dbbl.scb.world/games?currentPage=1&seasonTeamId={team_id}&pageSize=1000&gameType=all&seasonId={season_id}",
-        f"https://api-n.dbbl.scb.world/games?currentPage=1&seasonTeamId={team_id}&pageSize=1000&gameType=all&seasonId={season_id}"
-    ]
-    for url in urls:
+    path = f"/games?currentPage=1&seasonTeamId={team_id}&pageSize=1000&gameType=all&seasonId={season_id}"
+    data, host = routed_get_json("team", team_id, path, endpoint="schedule", headers=API_HEADERS, hint=team_hint(team_id),
+                                 accept=lambda d: isinstance(d, dict) and bool(d.get("items")))
+    if data:
         try:
-            resp = requests.get(url, headers=API_HEADERS, timeout=3)
-            if resp.status_code == 200:
-                data = resp.json()
-                items = data.get("items", [])
-                if items:
-                    clean = []
-                    for g in items:
-                        res = g.get("result", {}) or {}
-                        h_s = res.get('homeTeamFinalScore'); g_s = res.get('guestTeamFinalScore')
-                        score = f"{h_s} : {g_s}" if (h_s is not None) else "-"
-                        raw_d = g.get("scheduledTime", ""); d_disp = raw_d
-                        if raw_d:
-                            try: d_disp = datetime.fromisoformat(raw_d.replace("Z", "+00:00")).astimezone(pytz.timezone("Europe/Berlin")).strftime("%d.%m.%Y %H:%M")
-                            except: pass
-                        clean.append({
-                            "id": g.get("id"), "date": d_disp, "score": score,
-                            "home": g.get("homeTeam", {}).get("name", "?"), "guest": g.get("guestTeam", {}).get("name", "?"),
-                            "homeTeamId": str(g.get("homeTeam", {}).get("teamId")), 
-                            "guestTeamId": str(g.get("guestTeam", {}).get("teamId")),
-                            "home_score": h_s, "guest_score": g_s,
-                            "has_result": (h_s is not None and g_s is not None)
-                        })
-                    return clean
+            items = data.get("items", [])
+            # Spiele des Teams liegen auf demselben Host -> Boxscores/Details direkt dort abfragen
+            remember_many("game", [g.get("id") for g in items], host)
+            if items:
+                clean = []
+                for g in items:
+                    res = g.get("result", {}) or {}
+                    h_s = res.get('homeTeamFinalScore'); g_s = res.get('guestTeamFinalScore')
+                    score = f"{h_s} : {g_s}" if (h_s is not None) else "-"
+                    raw_d = g.get("scheduledTime", ""); d_disp = raw_d
+                    if raw_d:
+                        try: d_disp = datetime.fromisoformat(raw_d.replace("Z", "+00:00")).astimezone(pytz.timezone("Europe/Berlin")).strftime("%d.%m.%Y %H:%M")
+                        except: pass
+                    clean.append({
+                        "id": g.get("id"), "date": d_disp, "score": score,
+                        "home": g.get("homeTeam", {}).get("name", "?"), "guest": g.get("guestTeam", {}).get("name", "?"),
+                        "homeTeamId": str(g.get("homeTeam", {}).get("teamId")), 
+                        "guestTeamId": str(g.get("guestTeam", {}).get("teamId")),
+                        "home_score": h_s, "guest_score": g_s,
+                        "has_result": (h_s is not None and g_s is not None)
+                    })
+                return clean
         except: pass
     return []
 
-@st.cache_data(ttl=10)
-def fetch_game_boxscore(game_id):
-    for subdomain in ["api-s", "api-n"]:
-        try:
-            r = requests.get(f"https://{subdomain}.dbbl.scb.world/games/{game_id}/stats", headers=API_HEADERS, timeout=2)
-            if r.status_code == 200: return r.json()
-        except: pass
-    return None
-
-@st.cache_data(ttl=10)
+def _load_game_boxscore(game_id):
+    data, _ = routed_get_json("game", game_id, f"/games/{game_id}/stats", endpoint="boxscore", headers=API_HEADERS)
+    return data
+
+@cached_fetcher(ttl=10)
+def fetch_game_boxscore_live(game_id):
+    return _load_game_boxscore(game_id)
+
+@cached_fetcher(ttl=10)
+def fetch_game_details_live(game_id):
+    data, _ = routed_get_json("game", game_id, f"/games/{game_id}", endpoint="game_details", headers=API_HEADERS)
+    return data
+
+# --- PERSISTENTER SPIEL-CACHE ---
+# Beendete Spiele (Status ENDED oder Ergebnis im Spielplan) ändern sich nicht mehr:
+# sie werden einmal geladen und dann dauerhaft aus src/disk_cache.py bedient.
+# Laufende Spiele gehen weiterhin über den 10s-Cache.
+
+def is_game_final(details):
+    if not isinstance(details, dict): return False
+    return str(details.get("status", "")).upper() == "ENDED"
+
+@traced("api")
+def fetch_game_boxscore(game_id, final=False, details=None):
+    """final=True, wenn der Aufrufer schon weiß, dass das Spiel beendet ist (z.B. has_result im Spielplan).
+    details: schon geladene Spieldetails; ohne sie zählen nur die gespeicherten Details eines beendeten Spiels.
+    Gespeichert wird ein nach dem Spielende frisch geladener Boxscore, nie der aus dem 10s-Cache
+    (der kann noch den Stand kurz vor der Schlusssirene enthalten)."""
+    stored = disk_cache.get("game_stats", game_id)
+    if stored is not None: return stored
+    if details is None: details = disk_cache.get("game_details", game_id)
+    if not (final or is_game_final(details)): return fetch_game_boxscore_live(game_id)
+    box = _load_game_boxscore(game_id)
+    if box: disk_cache.put("game_stats", game_id, box)
+    return box
+
+@traced("api")
 def fetch_game_details(game_id):
-    for subdomain in ["api-s", "api-n"]:
-        try:
-            r = requests.get(f"https://{subdomain}.dbbl.scb.world/games/{game_id}", headers=API_HEADERS, timeout=2)
-            if r.status_code == 200: return r.json()
-        except: pass
-    return None
+    stored = disk_cache.get("game_details", game_id)
+    if stored is not None: return stored
+    details = fetch_game_details_live(game_id)
+    if is_game_final(details): disk_cache.put("game_details", game_id, details)
+    return details
 
-@st.cache_data(ttl=3600)
+@cached_fetcher(ttl=3600)
 def fetch_team_info_basic(team_id):
-    base_url = get_base_url(team_id)
+    data, _ = routed_get_json("team", team_id, f"/teams/{team_id}", endpoint="team_info", headers=API_HEADERS, hint=team_hint(team_id))
     try:
-        resp = requests.get(f"{base_url}/teams/{team_id}", headers=API_HEADERS, timeout=3)
-        if resp.status_code == 200:
-            data = resp.json()
+        if data:
             venues = data.get("venues", [])
             main = next((v for v in venues if v.get("isMain")), venues[0] if venues else None)
             if main: return {"id": team_id, "venue": main}
     except: pass
     return {"id": team_id, "venue": None}
 
+@traced("api")
 def fetch_games_from_recent():
-    endpoints = [
-        "https://api-s.dbbl.scb.world/games/recent?slotSize=400",
-        "https://api-n.dbbl.scb.world/games/recent?slotSize=400"
-    ]
     games_map = {} 
-    for url in endpoints:
+    for host in [HOST_SOUTH, HOST_NORTH]:
         try:
-            r = requests.get(url, headers=API_HEADERS, timeout=3)
+            r = api_get(f"{host}/games/recent?slotSize=400", endpoint="recent", headers=API_HEADERS)
             if r.status_code == 200:
                 data = r.json()
                 lists_to_check = []
                 if isinstance(data.get("past"), list): lists_to_check.extend(data["past"])
                 if isinstance(data.get("present"), list): lists_to_check.extend(data["present"])
                 if isinstance(data.get("future"), list): lists_to_check.extend(data["future"])
+                remember_many("game", [g.get("id") for g in lists_to_check if g.get("id") not in games_map], host)
                 for g in lists_to_check:
                     gid = g.get("id")
                     if not gid or gid in games_map: continue 
@@ -374,12 +459,12 @@ def fetch_games_from_recent():
     result_list.sort(key=lambda x: x['datetime'] if x['datetime'] else datetime.min)
     return result_list
 
-@st.cache_data(ttl=600)
+@cached_fetcher(ttl=600)
 def fetch_season_games(season_id):
     return fetch_games_from_recent()
 
 # --- TREND & TABELLE ---
-@st.cache_data(ttl=1800)
+@swr_fetcher(ttl=1800)
 def fetch_league_standings(season_id, league_selection):
     """
     Holt Tabelle mit den gewünschten Spalten:
@@ -393,9 +478,10 @@ def fetch_league_standings(season_id, league_selection):
     else:
         urls.append(f"https://api-s.dbbl.scb.world/standings?seasonId={season_id}")
     
-    for url in urls:
+    for i, url in enumerate(urls):
         try:
-            r = requests.get(url, headers=API_HEADERS, timeout=3)
+            # Wiederholungen nur beim letzten Host, vorher ist der nächste Host die Wiederholung (wie routed_get_json)
+            r = api_get(url, endpoint="standings", headers=API_HEADERS, retries=HTTP_RETRIES if i == len(urls) - 1 else 0)
             if r.status_code == 200:
                 data = r.json()
                 items = data if isinstance(data, list) else data.get("items", [])
@@ -438,7 +524,8 @@ def fetch_league_standings(season_id, league_selection):
         except: continue
     return pd.DataFrame()
 
-def fetch_last_n_games_complete(team_id, season_id, n=3):
+def select_last_n_played(team_id, season_id, n=3):
+    """Die letzten n gespielten Spiele aus dem Spielplan (neueste zuerst)."""
     schedule = fetch_schedule(team_id, season_id)
     if not schedule: return []
     def parse_dt(d):
@@ -446,18 +533,26 @@ def fetch_last_n_games_complete(team_id, season_id, n=3):
         except: return datetime.min
     played = [g for g in schedule if g.get('has_result')]
     played.sort(key=lambda x: parse_dt(x), reverse=True)
-    selection = played[:n]
-    detailed_games = []
-    for game in selection:
-        gid = game['id']
-        cached_box = fetch_game_boxscore(gid)
-        if cached_box:
-            box = cached_box.copy()
-            is_home_game = (str(game.get('homeTeamId')) == str(team_id))
-            box['meta_is_home'] = is_home_game
-            box['meta_opponent'] = game['guest'] if is_home_game else game['home']
-            box['meta_date'] = game['date']
-            box['meta_result'] = game['score']
-            detailed_games.append(box)
-    return detailed_games
+    return played[:n]
+
+def iter_game_boxscores(team_id, games, max_workers=BOXSCORE_WORKERS):
+    """Lädt Boxscores parallel und liefert (index, box) in Fertigstellungs-Reihenfolge.
+    index bezieht sich auf die Position in games; box ist None, wenn der Abruf fehlschlug."""
+    def load(game):
+        cached_box = fetch_game_boxscore(game['id'], final=bool(game.get('has_result')))
+        if not cached_box: return None
+        box = cached_box.copy()
+        is_home_game = (str(game.get('homeTeamId')) == str(team_id))
+        box['meta_is_home'] = is_home_game
+        box['meta_opponent'] = game['guest'] if is_home_game else game['home']
+        box['meta_date'] = game['date']
+        box['meta_result'] = game['score']
+        return box
+    yield from iter_parallel(load, games, max_workers)
+
+@traced("api")
+def fetch_last_n_games_complete(team_id, season_id, n=3, max_workers=BOXSCORE_WORKERS):
+    selection = select_last_n_played(team_id, season_id, n)
+    loaded = dict(iter_game_boxscores(team_id, selection, max_workers))
+    return [loaded[i] for i in range(len(selection)) if loaded.get(i)]
 # --- END OF FILE src/api.py ---
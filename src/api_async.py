@@ -0,0 +1,75 @@
+# --- START OF FILE src/api_async.py ---
+# Asynchrone Variante von src/api.py: gleiche Rückgabeformen, aber mehrere Abrufe laufen gleichzeitig.
+# Die eigentlichen HTTP-Aufrufe bleiben die synchronen Funktionen aus src/api.py (gemeinsamer Pool,
+# Routing, st.cache_data) - sie werden hier nur auf Threads verteilt und per asyncio.gather kombiniert.
+#
+# Aufruf aus einer Streamlit-Seite:
+#   (df, ts), games = run_async(gather(fetch_team_data_async(tid, sid), fetch_schedule_async(tid, sid)))
+import asyncio
+from src import api
+from src.config import ASYNC_WORKERS
+from src.parallel import make_executor
+
+async def _call(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+def run_async(coro, max_workers=ASYNC_WORKERS):
+    """Führt eine Coroutine synchron aus (Streamlit-Skripte sind synchron).
+    Der Thread-Pool bekommt den ScriptRunContext mit, damit st.cache_data in den Workern sauber läuft."""
+    async def _main():
+        asyncio.get_running_loop().set_default_executor(make_executor(max_workers))
+        return await coro
+    return asyncio.run(_main())
+
+async def gather(*coros):
+    return await asyncio.gather(*coros)
+
+# --- EINZELNE ENDPUNKTE ---
+
+async def fetch_team_stats_async(team_id, season_id):
+    return await _call(api.fetch_team_season_stats_raw, team_id, season_id)
+
+async def fetch_player_stats_async(team_id, season_id):
+    """(json, host) wie api.fetch_player_stats_raw."""
+    return await _call(api.fetch_player_stats_raw, team_id, season_id)
+
+async def fetch_squad_async(team_id, season_id):
+    return await _call(api.fetch_team_details_raw, team_id, season_id)
+
+async def fetch_schedule_async(team_id, season_id):
+    return await _call(api.fetch_schedule, team_id, season_id)
+
+async def fetch_team_info_async(team_id):
+    return await _call(api.fetch_team_info_basic, team_id)
+
+async def fetch_game_boxscore_async(game_id, final=False, details=None):
+    return await _call(api.fetch_game_boxscore, game_id, final, details)
+
+async def fetch_game_details_async(game_id):
+    return await _call(api.fetch_game_details, game_id)
+
+async def fetch_team_logo_async(team_id):
+    return await _call(api.get_best_team_logo, team_id)
+
+# --- BÜNDEL ---
+
+async def gather_team_bundle(team_id, season_id):
+    """Holt /statistics/season, /player-stats und /teams/{id}/{season} gleichzeitig (Rohdaten für api.build_team_data)."""
+    team_raw, (players_raw, players_host), squad_raw = await asyncio.gather(
+        fetch_team_stats_async(team_id, season_id),
+        fetch_player_stats_async(team_id, season_id),
+        fetch_squad_async(team_id, season_id),
+    )
+    return {"team_stats": team_raw, "player_stats": players_raw, "players_host": players_host, "squad": squad_raw}
+
+async def fetch_team_data_async(team_id, season_id):
+    """Wie api.fetch_team_data -> (df, ts). Läuft über denselben Stale-while-revalidate-Stand (src/swr.py);
+    ohne Stand lädt api.fetch_team_data_live die drei Rohdaten über gather_team_bundle."""
+    return await _call(api.fetch_team_data, team_id, season_id)
+
+async def fetch_games_async(game_ids, final=False):
+    """Boxscores und Details mehrerer Spiele gleichzeitig -> Liste von (box, details) in Eingabe-Reihenfolge."""
+    async def _one(gid):
+        return await asyncio.gather(fetch_game_boxscore_async(gid, final), fetch_game_details_async(gid))
+    return [tuple(r) for r in await asyncio.gather(*[_one(gid) for gid in game_ids])]
+# --- END OF FILE src/api_async.py ---
@@ -0,0 +1,208 @@
+# --- START OF FILE src/cache_registry.py ---
+# Buchführung für die zwischengespeicherten API-Abrufe (st.cache_data über tracing.cached_fetcher):
+# pro Funktion Treffer/Fehlschüsse, Einträge mit Alter und Größe, abgelaufene und verdrängte Einträge.
+# Dazu gezieltes Invalidieren nach Team, Spiel, Saison oder Spieler (Streamlit-Cache + passende disk_cache-Einträge),
+# damit TTLs nach echten Zahlen eingestellt werden können.
+#
+# Größe = Länge des Pickles - so legt st.cache_data die Werte auch im Speicher ab.
+import time
+import pickle
+import inspect
+import threading
+from datetime import timedelta
+from collections import OrderedDict
+import streamlit as st
+from src.config import SEASON_ID, TEAMS_DB, CACHE_REGISTRY_MAX_KEYS
+from src import disk_cache
+
+AGE_BUCKETS = (10, 60, 300, 600, 1800, 3600)  # Obergrenzen in Sekunden für die Altersverteilung
+AGE_LABELS = [f"<{limit}s" for limit in AGE_BUCKETS] + [f">={AGE_BUCKETS[-1]}s"]
+# Argumentnamen, nach denen invalidiert werden kann
+SCOPES = ("team_id", "game_id", "season_id", "player_id")
+
+_lock = threading.Lock()
+_registry = OrderedDict()  # Funktionsname -> CacheStats
+
+def _ttl_seconds(ttl):
+    if ttl is None: return None
+    if isinstance(ttl, timedelta): return ttl.total_seconds()
+    try: return float(ttl)
+    except (TypeError, ValueError): return None  # z.B. "1h" - Alter wird dann nicht bewertet
+
+def _size(value):
+    try: return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception: return None
+
+def _age_bucket(age):
+    for limit, label in zip(AGE_BUCKETS, AGE_LABELS):
+        if age < limit: return label
+    return AGE_LABELS[-1]
+
+class CacheStats:
+    def __init__(self, fn, cached, ttl, max_entries):
+        self.name = fn.__name__
+        self.cached = cached
+        self.ttl = _ttl_seconds(ttl)
+        self.max_entries = max_entries
+        self.signature = inspect.signature(fn)
+        self.hits = self.misses = self.expired = self.evicted = self.invalidated = self.refreshes = 0
+        self.entries = OrderedDict()  # Schlüssel -> {"call": (args, kwargs), "params", "created", "bytes", "hits", "last_hit"}
+
+    def _params(self, args, kwargs):
+        try:
+            bound = self.signature.bind(*args, **kwargs); bound.apply_defaults()
+            return {k: str(v) for k, v in bound.arguments.items()}
+        except TypeError:
+            return {f"arg{i}": str(a) for i, a in enumerate(args)}
+
+    def record(self, args, kwargs, miss, value=None):
+        key = repr((args, sorted(kwargs.items())))
+        now = time.time()
+        with _lock:
+            entry = self.entries.get(key)
+            if not miss:
+                self.hits += 1
+                if entry: entry["hits"] += 1; entry["last_hit"] = now
+                return
+            self.misses += 1
+            if entry:
+                # Erneut berechnet: wegen TTL abgelaufen oder vorher aus dem Cache gefallen (clear, max_entries)
+                if self.ttl is not None and now - entry["created"] >= self.ttl: self.expired += 1
+                else: self.evicted += 1
+            self.entries[key] = {"call": (args, kwargs), "params": self._params(args, kwargs), "created": now,
+                                 "bytes": _size(value), "hits": 0, "last_hit": None}
+            self.entries.move_to_end(key)
+            while len(self.entries) > CACHE_REGISTRY_MAX_KEYS: self.entries.popitem(last=False)
+
+    def record_refresh(self, args, kwargs, value):
+        """Hintergrund-Aktualisierung (src/swr.py): neuer Stand, aber kein Fehlschuss eines Aufrufers."""
+        key = repr((args, sorted(kwargs.items())))
+        now = time.time()
+        with _lock:
+            self.refreshes += 1
+            entry = self.entries.get(key)
+            if entry: entry["created"] = now; entry["bytes"] = _size(value)
+            else:
+                self.entries[key] = {"call": (args, kwargs), "params": self._params(args, kwargs), "created": now,
+                                     "bytes": _size(value), "hits": 0, "last_hit": None}
+                while len(self.entries) > CACHE_REGISTRY_MAX_KEYS: self.entries.popitem(last=False)
+
+    def _alive(self, now):
+        return [e for e in self.entries.values() if self.ttl is None or now - e["created"] < self.ttl]
+
+    def summary(self):
+        now = time.time()
+        with _lock:
+            alive = self._alive(now)
+            counts = {}
+            for e in alive: b = _age_bucket(now - e["created"]); counts[b] = counts.get(b, 0) + 1
+            ages = {label: counts[label] for label in AGE_LABELS if label in counts}
+            calls = self.hits + self.misses
+            return {"name": self.name, "ttl_s": self.ttl, "max_entries": self.max_entries, "entries": len(alive),
+                    "bytes": sum(e["bytes"] or 0 for e in alive), "hits": self.hits, "misses": self.misses,
+                    "hit_ratio": round(self.hits / calls, 3) if calls else None, "expired": self.expired,
+                    "evicted": self.evicted, "invalidated": self.invalidated, "refreshes": self.refreshes,
+                    "oldest_s": round(max((now - e["created"] for e in alive), default=0), 1), "ages": ages}
+
+    def entry_rows(self):
+        now = time.time()
+        with _lock:
+            return [{"function": self.name, **e["params"], "age_s": round(now - e["created"], 1), "bytes": e["bytes"], "hits": e["hits"]}
+                    for e in self._alive(now)]
+
+    def invalidate(self, match):
+        """Löscht alle Einträge, deren Argumente zu match ({name: wert}) passen. Gibt die Anzahl zurück."""
+        with _lock:
+            keys = [k for k, e in self.entries.items() if all(e["params"].get(n) == str(v) for n, v in match.items())]
+            calls = [self.entries.pop(k)["call"] for k in keys]
+            self.invalidated += len(calls)
+        for args, kwargs in calls:
+            try: self.cached.clear(*args, **kwargs)
+            except TypeError: self.cached.clear()  # ältere Streamlit-Versionen: nur komplett
+        return len(calls)
+
+    def clear(self):
+        self.cached.clear()
+        with _lock: self.invalidated += len(self.entries); self.entries.clear()
+
+def register(fn, cached, cache_kwargs):
+    stats = CacheStats(fn, cached, cache_kwargs.get("ttl"), cache_kwargs.get("max_entries"))
+    with _lock: _registry[stats.name] = stats
+    return stats
+
+def functions():
+    with _lock: return list(_registry.values())
+
+def report():
+    """Eine Zeile pro Funktion (für Admin-Seite und /cache im OBS-Server)."""
+    return [s.summary() for s in functions()]
+
+def entries(name=None):
+    rows = []
+    for s in functions():
+        if name is None or s.name == name: rows += s.entry_rows()
+    return rows
+
+def invalidate(team_id=None, game_id=None, season_id=None, player_id=None):
+    """Gezielt invalidieren. Funktionen ohne das jeweilige Argument bleiben unberührt; mehrere Angaben = UND.
+    Räumt auch die passenden disk_cache-Einträge (beendete Spiele, vorab geladene Teams, Spieler-Metadaten)."""
+    match = {k: v for k, v in zip(SCOPES, (team_id, game_id, season_id, player_id)) if v is not None}
+    if not match: return {}
+    counts = {}
+    for s in functions():
+        if not set(match) <= set(s.signature.parameters): continue
+        n = s.invalidate(match)
+        if n: counts[s.name] = n
+    disk = 0
+    if game_id is not None:
+        disk += disk_cache.delete("game_stats", game_id) + disk_cache.delete("game_details", game_id)
+    if player_id is not None:
+        disk += disk_cache.delete("player_meta", player_id)
+    if game_id is None and player_id is None and (team_id is not None or season_id is not None):
+        teams = [team_id] if team_id is not None else list(TEAMS_DB)
+        disk += sum(disk_cache.delete("team_data", f"{t}:{season_id or SEASON_ID}") for t in teams)
+    if disk: counts["disk_cache"] = disk
+    return counts
+
+def clear_all():
+    for s in functions(): s.clear()
+
+# --- ADMIN-SEITE ---
+
+def render_cache_admin():
+    """Tabellen pro Funktion und Eintrag, gezieltes Invalidieren. Aufruf aus app.py (Seite "Cache")."""
+    import pandas as pd
+    rows = report()
+    if not rows: st.info("Noch keine Cache-Aufrufe in diesem Prozess."); return
+    df = pd.DataFrame(rows)
+    df["KiB"] = (df["bytes"] / 1024).round(1)
+    df["Alter"] = df["ages"].apply(lambda a: " ".join(f"{k}: {v}" for k, v in a.items()))
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Einträge", int(df["entries"].sum())); c2.metric("Speicher", f"{df['KiB'].sum() / 1024:.1f} MiB")
+    calls = df["hits"].sum() + df["misses"].sum()
+    c3.metric("Trefferquote", f"{df['hits'].sum() / calls * 100:.0f} %" if calls else "-")
+    st.dataframe(df[["name", "ttl_s", "entries", "KiB", "hits", "misses", "hit_ratio", "expired", "evicted", "invalidated", "refreshes", "oldest_s", "Alter"]],
+                 hide_index=True, use_container_width=True)
+    st.caption("expired = nach Ablauf der TTL neu geladen, evicted = vorher aus dem Cache gefallen (z.B. geleert), "
+               "refreshes = im Hintergrund aktualisiert (Kader, Spielplan, Tabelle; zählt nicht als Fehlschuss). "
+               "Viele expired bei hoher Trefferquote: TTL verlängern. Veraltete Daten trotz TTL: gezielt invalidieren.")
+
+    st.subheader("Gezielt invalidieren")
+    names = {v["name"]: k for k, v in TEAMS_DB.items()}
+    c1, c2, c3, c4 = st.columns(4)
+    team = c1.selectbox("Team", ["-"] + sorted(names), key="cache_inv_team")
+    game = c2.text_input("Spiel-ID", key="cache_inv_game")
+    season = c3.text_input("Saison", key="cache_inv_season")
+    player = c4.text_input("Spieler-ID", key="cache_inv_player")
+    b1, b2 = st.columns(2)
+    if b1.button("Invalidieren", type="primary", key="cache_inv_go"):
+        counts = invalidate(team_id=names.get(team), game_id=game.strip() or None, season_id=season.strip() or None, player_id=player.strip() or None)
+        if counts: st.success("Gelöscht: " + ", ".join(f"{k} ({v})" for k, v in counts.items()))
+        else: st.info("Keine passenden Einträge.")
+    if b2.button("Alle API-Caches leeren", key="cache_inv_all"):
+        clear_all(); st.success("Alle API-Caches geleert.")
+
+    with st.expander("Einträge"):
+        sel = st.selectbox("Funktion", [r["name"] for r in rows], key="cache_entries_fn")
+        st.dataframe(pd.DataFrame(entries(sel)), hide_index=True, use_container_width=True)
+# --- END OF FILE src/cache_registry.py ---
@@ -1,23 +1,176 @@
-import streamlit as st
+import os
+from collections.abc import Mapping
 
 # Version
 VERSION = "v5.4"
 
 # --- API KONFIGURATION ---
-try:
-    # Wir holen den Key NUR aus den Secrets
-    API_KEY = st.secrets["dbbl_api_key"]
-except Exception:
-    # Wenn der Key fehlt, brechen wir kontrolliert ab
-    st.error("🚨 API-Key fehlt! Bitte in den Streamlit Cloud Settings unter 'Secrets' eintragen.")
-    st.stop()
-
-API_HEADERS = {
-    "accept": "application/json",
-    "X-API-Key": API_KEY,
-}
+# Lokaler Ersatz für die DBBL-API (src/mock_api.py), z.B. "http://127.0.0.1:8600". None = echte API.
+# Alle Abrufe auf api-s / api-n / api-1 gehen dann an diese Adresse; ein API-Key ist nicht nötig.
+MOCK_API_URL = os.environ.get("SCOUTING_MOCK_API") or None
+
+# Den Key holen wir NUR aus den Secrets - erst beim ersten API-Abruf, damit src.config ohne Streamlit
+# importiert werden kann (src/obs_server.py, Benchmarks). Die App prüft ihn beim Start mit require_api_key().
+_api_key = None
+
+def api_key():
+    """dbbl_api_key aus den Streamlit-Secrets, im Mock-Betrieb ersatzweise "mock"; None, wenn er fehlt."""
+    global _api_key
+    if _api_key is None:
+        try:
+            import streamlit as st
+            _api_key = st.secrets["dbbl_api_key"]
+        except Exception:
+            if MOCK_API_URL: _api_key = "mock"
+    return _api_key
+
+def require_api_key():
+    if api_key() is None:
+        import streamlit as st
+        # Wenn der Key fehlt, brechen wir kontrolliert ab
+        st.error("🚨 API-Key fehlt! Bitte in den Streamlit Cloud Settings unter 'Secrets' eintragen.")
+        st.stop()
+
+class _ApiHeaders(Mapping):
+    """Header für alle DBBL-Abrufe; X-API-Key wird erst beim Zugriff aus api_key() gelesen."""
+    def _headers(self):
+        return {"accept": "application/json", "X-API-Key": api_key() or ""}
+    def __getitem__(self, key): return self._headers()[key]
+    def __iter__(self): return iter(self._headers())
+    def __len__(self): return 2
+
+API_HEADERS = _ApiHeaders()
 SEASON_ID = "2025"
 
+# --- HTTP CLIENT (Connection Pools, Retries, Timeouts) ---
+# Ein gemeinsamer Pool pro Host (api-s, api-n, api-1), damit TCP/TLS-Verbindungen wiederverwendet werden.
+HTTP_POOL_CONNECTIONS = 4    # Anzahl Host-Pools, die gleichzeitig offen gehalten werden
+HTTP_POOL_MAXSIZE = 16       # Verbindungen pro Host (wichtig für parallele Abrufe)
+HTTP_RETRIES = 2             # Wiederholungen bei Verbindungsfehlern / 429 / 5xx (mit Ausweich-Host nur beim letzten Host)
+HTTP_BACKOFF = 0.3           # Wartezeit-Faktor zwischen Wiederholungen (0.3s, 0.6s, ...)
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+# Timeouts in Sekunden pro Endpunkt-Typ
+HTTP_TIMEOUTS = {
+    "default": 3,
+    "logo": 1.0,
+    "image": 2,
+    "player_meta": 1.5,
+    "team_details": 2,
+    "team_info": 3,
+    "team_stats": 3,
+    "player_stats": 4,
+    "schedule": 3,
+    "boxscore": 2,
+    "game_details": 2,
+    "recent": 3,
+    "standings": 3,
+}
+# Parallele Abrufe (Threads pro Anfrage-Welle)
+METADATA_WORKERS = 8         # Spieler-Metadaten (/season-players/{id}) beim Laden eines Kaders
+BOXSCORE_WORKERS = 6         # Boxscores (/games/{id}/stats) in der Team-Spielanalyse
+ASYNC_WORKERS = 8            # Gleichzeitige Abrufe in src/api_async.py (Team-Bündel, Vergleich, Vorbereitung)
+WAREHOUSE_WORKERS = 6        # Teams gleichzeitig beim Aufbau des Liga-Datenbestands (src/warehouse.py)
+IMAGE_WORKERS = 8            # Bilder, die für den PDF-Report gleichzeitig geladen und verkleinert werden
+
+# --- PERSISTENTER CACHE (überlebt Neustarts) ---
+# Beendete Spiele ändern sich nicht mehr und landen hier dauerhaft (SQLite, komprimiertes JSON).
+CACHE_DIR = os.environ.get("SCOUTING_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"))
+if MOCK_API_URL: CACHE_DIR = os.path.join(CACHE_DIR, "mock")  # Mock-Daten nie mit echten Daten mischen
+DISK_CACHE_MAX_MB = 256      # Darüber werden die am längsten nicht genutzten Einträge verdrängt
+ROUTES_FLUSH_S = 5           # Gelernte Hosts (src/routing.py) höchstens so oft in routes.json schreiben
+ROUTES_MAX = 20000           # Gemerkte Routen (Teams, Spiele, Spieler); die ältesten fliegen raus
+
+# --- PDF-ERZEUGUNG (src/pdf_service.py) ---
+# wkhtmltopdf-Einstellungen für den PreGame-Report
+PDF_OPTIONS = {
+    "page-size": "A4",
+    "orientation": "Portrait",
+    "margin-top": "5mm",
+    "margin-right": "5mm",
+    "margin-bottom": "5mm",
+    "margin-left": "5mm",
+    "encoding": "UTF-8",
+    "zoom": "0.65",
+    "no-outline": None,
+    "disable-smart-shrinking": None,
+    "quiet": ""
+}
+PDF_WORKERS = 2               # Gleichzeitige wkhtmltopdf-Prozesse
+PDF_MAX_QUEUE = 12            # Mehr offene Aufträge werden abgelehnt
+PDF_CACHE_MAX_FILES = 200     # Fertige PDFs auf der Platte (älteste werden gelöscht)
+# Report abschnittsweise rendern und die Teil-PDFs zusammenfügen (benötigt pypdf). Nach einer Notiz-Änderung
+# wird dann nur das betroffene Segment neu gerendert. Jedes Segment beginnt auf einer neuen Seite.
+PDF_SEGMENTED = False
+PDF_CARDS_PER_SEGMENT = 2     # Spielerkarten pro Segment
+REPORT_FRAGMENT_CACHE_SIZE = 512  # Zwischengespeicherte HTML-Abschnitte (Kopf, Karten, ...) im Speicher
+
+# --- VORAB-LADEN (nächste Gegner) ---
+# Eigenes Team (TEAMS_DB-ID). Ohne ID läuft kein Hintergrund-Prefetch. Auch per Umgebungsvariable setzbar.
+OWN_TEAM_ID = int(os.environ.get("SCOUTING_OWN_TEAM_ID", "0")) or None
+PREFETCH_ENABLED = True
+PREFETCH_OPPONENTS = 3        # Anzahl kommender Gegner
+PREFETCH_LAST_GAMES = 3       # Boxscores der letzten Spiele pro Gegner
+PREFETCH_HOURS = (1, 6)       # Zeitfenster (Stunde von, bis; Europe/Berlin), in dem der Hintergrund-Thread lädt
+PREFETCH_INTERVAL_H = 20      # Mindestabstand zwischen zwei Läufen
+PREFETCH_MAX_AGE_H = 24       # Bis zu diesem Alter dienen vorab geladene Teamdaten als Startwert (danach sofort API)
+STATIC_MAX_AGE_H = 168        # Spieler-Metadaten (ändern sich selten)
+
+# --- BILDER (src/image_store.py) ---
+IMAGE_REVALIDATE_H = 168      # Danach wird ein Bild per ETag/Last-Modified auf Änderungen geprüft
+IMAGE_MISSING_RETRY_H = 24    # Nicht gefundene Bilder/Logos erst nach dieser Zeit erneut anfragen
+IMAGE_CACHE_MAX_MB = 512      # Obergrenze für CACHE_DIR/images; darüber fallen die am längsten nicht genutzten Bilder weg
+
+# --- LIVE-SPIELE (src/live_engine.py) ---
+LIVE_POLL_S = 10              # Abfrageintervall des gemeinsamen Pollers pro Spiel
+LIVE_UI_REFRESH_S = 3         # So oft holt sich die Live-Ansicht den aktuellen Stand (aus dem Speicher)
+LIVE_IDLE_STOP_S = 120        # Poller stoppt, wenn so lange niemand zugesehen hat
+LIVE_FINISHED_MAX = 32        # Beendete Spiele im Speicher (zuletzt geöffnete), ältere kommen wieder aus dem Disk-Cache
+# Query-Parameter für "nur Aktionen ab actionNumber" (z.B. "fromActionNumber"), falls die API das unterstützt.
+# None = immer den vollen Boxscore laden und neue Aktionen per Vergleich ermitteln.
+LIVE_DELTA_PARAM = None
+
+# --- OBS-OVERLAY-SERVER (src/obs_server.py) ---
+# Eigenständiger HTTP-Server für die Browserquellen in OBS (python -m src.obs_server), ohne Streamlit-Lauf.
+OBS_SERVER_HOST = "0.0.0.0"
+OBS_SERVER_PORT = 8502
+# Fertige Overlays werden nur bei geänderten Daten neu gebaut. So viele Sekunden nach der letzten Prüfung
+# werden die Daten (Boxscore, Tabelle, Teamwerte) erneut gelesen und verglichen - gilt auch für ?view=obs_... in der App.
+OBS_RECHECK_S = {
+    "obs_starting5": 300,
+    "obs_standings": 600,
+    "obs_comparison": 600,
+    "obs_potg": 10,
+    "obs_final_banner": 10,
+    "obs_scoreboard": 1,
+}
+OBS_CACHE_MAX = 256           # Gespeicherte Overlays (verschiedene Parametersätze)
+OBS_SSE_KEEPALIVE_S = 15      # Live-Scoreboard: so oft ein Lebenszeichen, wenn sich nichts ändert
+
+# --- LAUFZEITMESSUNG (src/tracing.py) ---
+TRACING_ENABLED = True            # Spans um API-Abrufe, HTTP, HTML-Bausteine, Bilder, pandas und PDF (wenige µs pro Aufruf)
+TRACING_RUN_MAX_SPANS = 2000      # Höchstens so viele Einzelmessungen pro Durchlauf und Sitzung
+CACHE_REGISTRY_MAX_KEYS = 2000    # Gemerkte Cache-Schlüssel pro Funktion (Admin-Seite, gezieltes Invalidieren)
+# Entwickler-Panel in der Sidebar: SCOUTING_DEV_PANEL=1 oder ?dev=1 in der URL
+DEV_PANEL = os.environ.get("SCOUTING_DEV_PANEL") == "1"
+
+# --- STALE-WHILE-REVALIDATE (src/swr.py: Kader, Spielplan, Tabelle) ---
+SWR_RETRY_S = 60              # Nach fehlgeschlagener Aktualisierung erst so spät erneut versuchen (bis dahin alter Stand)
+SWR_WORKERS = 2               # Threads für Hintergrund-Aktualisierungen
+SWR_MAX_KEYS = 256            # Gespeicherte Stände pro Funktion (älteste fliegen raus)
+
+# --- MOCK-API (src/mock_api.py, aktiv über MOCK_API_URL bzw. SCOUTING_MOCK_API) ---
+MOCK_API_PORT = 8600
+MOCK_API_LATENCY_MS = (20, 120)   # Antwortzeit pro Anfrage (gleichverteilt), ungefähr wie die echte API
+MOCK_API_ERROR_RATE = 0.0         # Anteil Antworten mit 503 (Retries / Fallbacks testen)
+MOCK_API_SLOW_RATE = 0.0          # Anteil Antworten mit zusätzlicher Verzögerung (Timeouts testen)
+MOCK_API_SLOW_S = 5
+MOCK_API_LIVE_GAMES = 2           # So viele Spiele laufen ab Serverstart live ...
+MOCK_API_LIVE_MINUTES = 20        # ... und sind nach dieser Zeit beendet
+# Aufgezeichnete Antworten (haben Vorrang vor den erzeugten Daten). Aufzeichnen mit SCOUTING_RECORD_FIXTURES=1
+# bei echtem API-Zugang: jede erfolgreiche JSON-Antwort wird dort abgelegt.
+MOCK_API_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "dbbl")
+MOCK_API_RECORD = os.environ.get("SCOUTING_RECORD_FIXTURES") == "1"
+
 # Teams Datenbank
 TEAMS_DB = {
     # NORD
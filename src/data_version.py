@@ -0,0 +1,72 @@
+# --- START OF FILE src/data_version.py ---
+# Datenstand (Version) für zwischengespeicherte Ausgaben: Die Version ist ein Fingerabdruck der Eingangsdaten
+# (Boxscore, Tabelle, Teamwerte). Eine fertige Ausgabe (z.B. OBS-Overlay) wird nur neu gebaut, wenn sich
+# dieser Fingerabdruck ändert - nicht bei jedem Abruf und nicht nach Ablauf einer festen Zeit.
+# Die Eingangsdaten selbst werden höchstens alle recheck_s Sekunden neu gelesen (aus den API-Caches).
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+def _default(obj):
+    if isinstance(obj, pd.DataFrame):
+        return [list(map(str, obj.columns)), int(pd.util.hash_pandas_object(obj, index=True).sum())]
+    return str(obj)
+
+def fingerprint(*objs):
+    """sha1 über beliebige JSON-artige Daten (DataFrames per Hash ihrer Zeilen)."""
+    return hashlib.sha1(json.dumps(objs, sort_keys=True, default=_default).encode()).hexdigest()
+
+class VersionedMemo:
+    """Ausgabe pro Schlüssel, neu gebaut nur bei neuer Datenversion. Gleichzeitige Anfragen desselben Schlüssels
+    laden und bauen nur einmal (die übrigen warten auf das Ergebnis)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> {"value", "version", "checked_at", "built_at"}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._stats = {"hits": 0, "checks": 0, "builds": 0}
+
+    def _fresh(self, key, recheck_s):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry["checked_at"] < recheck_s:
+                self._entries.move_to_end(key); self._stats["hits"] += 1
+                return entry
+        return None
+
+    def get(self, key, load, build, recheck_s):
+        """load() -> Eingangsdaten, build(daten) -> Ausgabe. Innerhalb von recheck_s Sekunden nach der letzten
+        Prüfung wird nichts geladen; danach wird geladen, aber nur bei geänderter Version neu gebaut."""
+        entry = self._fresh(key, recheck_s)
+        if entry: return entry
+        with self._lock: key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._fresh(key, recheck_s)
+            if entry: return entry
+            data = load()
+            version = fingerprint(data)
+            now = time.time()
+            with self._lock:
+                self._stats["checks"] += 1
+                entry = self._entries.get(key)
+                if entry and entry["version"] == version:
+                    entry["checked_at"] = now
+                    return entry
+            entry = {"value": build(data), "version": version, "checked_at": now, "built_at": now}
+            with self._lock:
+                self._stats["builds"] += 1
+                self._entries[key] = entry; self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    old, _ = self._entries.popitem(last=False); self._key_locks.pop(old, None)
+            return entry
+
+    def clear(self):
+        with self._lock: self._entries.clear(); self._key_locks.clear()
+
+    def stats(self):
+        with self._lock: return {**self._stats, "entries": len(self._entries)}
+# --- END OF FILE src/data_version.py ---
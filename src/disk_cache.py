@@ -0,0 +1,208 @@
+# --- START OF FILE src/disk_cache.py ---
+# Persistenter Key-Value-Cache auf SQLite-Basis (Werte als zlib-komprimiertes JSON).
+# Einträge ohne Ablaufzeit bleiben bis zur Verdrängung erhalten (z.B. beendete Spiele).
+#
+# CLI:
+#   python -m src.disk_cache stats
+#   python -m src.disk_cache list [--ns game_stats] [--limit 50]
+#   python -m src.disk_cache prune [--max-mb 100]
+#   python -m src.disk_cache clear [--ns game_stats]
+import os
+import json
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+import pandas as pd
+from src.config import CACHE_DIR, DISK_CACHE_MAX_MB, IMAGE_CACHE_MAX_MB
+from src.tracing import mark_cache
+
+DB_PATH = os.path.join(CACHE_DIR, "scouting_cache.sqlite3")
+
+_conn = None
+_lock = threading.RLock()
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+            namespace TEXT NOT NULL, key TEXT NOT NULL, payload BLOB NOT NULL, size INTEGER NOT NULL,
+            created_at REAL NOT NULL, last_access REAL NOT NULL, expires_at REAL,
+            PRIMARY KEY (namespace, key))""")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        _conn.commit()
+    return _conn
+
+def get(namespace, key, max_age=None):
+    """Wert aus dem Cache oder None (abgelaufen / nicht vorhanden / älter als max_age Sekunden)."""
+    now = time.time()
+    try:
+        with _lock:
+            conn = _get_conn()
+            row = conn.execute("SELECT payload, created_at, expires_at FROM entries WHERE namespace=? AND key=?", (namespace, str(key))).fetchone()
+            if row is None: mark_cache(False); return None
+            payload, created_at, expires_at = row
+            if expires_at is not None and expires_at < now:
+                conn.execute("DELETE FROM entries WHERE namespace=? AND key=?", (namespace, str(key))); conn.commit()
+                mark_cache(False); return None
+            if max_age is not None and now - created_at > max_age: mark_cache(False); return None
+            conn.execute("UPDATE entries SET last_access=? WHERE namespace=? AND key=?", (now, namespace, str(key))); conn.commit()
+        mark_cache(True)
+        return json.loads(zlib.decompress(payload))
+    except Exception as e:
+        print(f"Disk-Cache Fehler (get {namespace}/{key}): {e}")
+        return None
+
+def created_at(namespace, key):
+    """Zeitpunkt des Speicherns (Unix-Zeit) oder None."""
+    try:
+        with _lock:
+            row = _get_conn().execute("SELECT created_at FROM entries WHERE namespace=? AND key=?", (namespace, str(key))).fetchone()
+        return row[0] if row else None
+    except Exception: return None
+
+def has(namespace, key):
+    try:
+        with _lock:
+            row = _get_conn().execute("SELECT expires_at FROM entries WHERE namespace=? AND key=?", (namespace, str(key))).fetchone()
+        return row is not None and (row[0] is None or row[0] >= time.time())
+    except Exception: return False
+
+def put(namespace, key, value, ttl=None):
+    """Speichert value (JSON-serialisierbar). ttl=None bedeutet: gültig bis zur Verdrängung."""
+    now = time.time()
+    try:
+        payload = zlib.compress(json.dumps(value, separators=(",", ":"), default=str).encode("utf-8"), 6)
+        with _lock:
+            conn = _get_conn()
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (namespace, str(key), payload, len(payload), now, now, (now + ttl) if ttl else None))
+            conn.commit()
+            prune(DISK_CACHE_MAX_MB * 1024 * 1024)
+    except Exception as e: print(f"Disk-Cache Fehler (put {namespace}/{key}): {e}")
+
+def delete(namespace, key=None):
+    with _lock:
+        conn = _get_conn()
+        if key is None: cur = conn.execute("DELETE FROM entries WHERE namespace=?", (namespace,))
+        else: cur = conn.execute("DELETE FROM entries WHERE namespace=? AND key=?", (namespace, str(key)))
+        conn.commit()
+        return cur.rowcount
+
+def clear():
+    with _lock:
+        conn = _get_conn(); cur = conn.execute("DELETE FROM entries"); conn.commit()
+        return cur.rowcount
+
+def prune(max_bytes):
+    """Entfernt abgelaufene Einträge und danach die am längsten nicht genutzten, bis max_bytes eingehalten wird."""
+    removed = 0
+    with _lock:
+        conn = _get_conn()
+        removed += conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > max_bytes:
+            victims = []
+            for ns, key, size in conn.execute("SELECT namespace, key, size FROM entries ORDER BY last_access ASC"):
+                if total <= max_bytes: break
+                victims.append((ns, key)); total -= size
+            conn.executemany("DELETE FROM entries WHERE namespace=? AND key=?", victims)
+            removed += len(victims)
+        conn.commit()
+    return removed
+
+def stats():
+    """Anzahl und Größe pro Namespace."""
+    with _lock:
+        rows = _get_conn().execute("""SELECT namespace, COUNT(*), COALESCE(SUM(size), 0), MIN(created_at), MAX(last_access)
+                                      FROM entries GROUP BY namespace ORDER BY namespace""").fetchall()
+    return [{"namespace": r[0], "entries": r[1], "bytes": r[2], "oldest": r[3], "last_access": r[4]} for r in rows]
+
+def items(namespace):
+    """[(key, wert)] aller gültigen Einträge eines Namespace, am längsten nicht genutzte zuerst (last_access bleibt)."""
+    with _lock:
+        rows = _get_conn().execute("""SELECT key, payload FROM entries WHERE namespace=? AND (expires_at IS NULL OR expires_at >= ?)
+                                      ORDER BY last_access ASC""", (namespace, time.time())).fetchall()
+    out = []
+    for key, payload in rows:
+        try: out.append((key, json.loads(zlib.decompress(payload))))
+        except Exception: pass
+    return out
+
+def list_entries(namespace=None, limit=50):
+    q = "SELECT namespace, key, size, created_at, last_access, expires_at FROM entries"
+    args = ()
+    if namespace: q += " WHERE namespace=?"; args = (namespace,)
+    q += " ORDER BY last_access DESC LIMIT ?"
+    with _lock:
+        rows = _get_conn().execute(q, args + (limit,)).fetchall()
+    return [{"namespace": r[0], "key": r[1], "bytes": r[2], "created_at": r[3], "last_access": r[4], "expires_at": r[5]} for r in rows]
+
+# --- DATAFRAMES ---
+def put_frame(namespace, key, df, extra=None, ttl=None):
+    """DataFrame (plus optionale JSON-Zusatzdaten) speichern; Spaltentypen werden mitgesichert."""
+    payload = {"frame": df.to_dict("split"), "dtypes": {str(c): str(t) for c, t in df.dtypes.items()}, "extra": extra}
+    put(namespace, key, payload, ttl=ttl)
+
+def get_frame(namespace, key, max_age=None):
+    """(DataFrame, extra) oder None."""
+    payload = get(namespace, key, max_age=max_age)
+    if not payload: return None
+    try:
+        f = payload["frame"]
+        df = pd.DataFrame(f["data"], columns=f["columns"], index=f["index"])
+        for c, t in payload.get("dtypes", {}).items():
+            if t != "object" and c in df.columns:
+                try: df[c] = df[c].astype(t)
+                except Exception: pass
+        return df, payload.get("extra")
+    except Exception as e:
+        print(f"Disk-Cache Fehler (frame {namespace}/{key}): {e}")
+        return None
+
+# --- CLI ---
+def _fmt_ts(ts):
+    return time.strftime("%d.%m.%Y %H:%M", time.localtime(ts)) if ts else "-"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.disk_cache", description="Persistenten Daten-Cache ansehen und aufräumen.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Einträge und Größe pro Namespace")
+    p_list = sub.add_parser("list", help="Zuletzt genutzte Einträge")
+    p_list.add_argument("--ns", default=None); p_list.add_argument("--limit", type=int, default=50)
+    p_prune = sub.add_parser("prune", help="Abgelaufene und alte Einträge verdrängen")
+    p_prune.add_argument("--max-mb", type=float, default=DISK_CACHE_MAX_MB)
+    p_clear = sub.add_parser("clear", help="Namespace oder kompletten Cache leeren")
+    p_clear.add_argument("--ns", default=None)
+    p_images = sub.add_parser("images", help="Bild-Speicher aufräumen (src/image_store.py)")
+    p_images.add_argument("--max-mb", type=float, default=IMAGE_CACHE_MAX_MB)
+    args = parser.parse_args(argv)
+    from src import image_store  # erst hier: image_store importiert disk_cache
+
+    if args.cmd == "stats":
+        rows = stats(); total = sum(r["bytes"] for r in rows)
+        print(f"{DB_PATH}")
+        for r in rows: print(f"  {r['namespace']:<20} {r['entries']:>6} Einträge  {r['bytes'] / 1024:>10.1f} KB  zuletzt {_fmt_ts(r['last_access'])}")
+        print(f"  {'GESAMT':<20} {sum(r['entries'] for r in rows):>6} Einträge  {total / 1024:>10.1f} KB (Limit {DISK_CACHE_MAX_MB} MB)")
+    elif args.cmd == "list":
+        for r in list_entries(args.ns, args.limit):
+            exp = _fmt_ts(r["expires_at"]) if r["expires_at"] else "nie"
+            print(f"  {r['namespace']:<20} {r['key']:<24} {r['bytes'] / 1024:>8.1f} KB  erstellt {_fmt_ts(r['created_at'])}  läuft ab {exp}")
+    elif args.cmd == "prune":
+        print(f"{prune(int(args.max_mb * 1024 * 1024))} Einträge entfernt.")
+        print(f"{image_store.prune()} Bilddateien ohne Index-Eintrag oder über dem Limit entfernt.")
+    elif args.cmd == "images":
+        print(f"{image_store.prune(int(args.max_mb * 1024 * 1024))} Bilddateien entfernt.")
+        info = image_store.stats()
+        print(f"  {info['dir']}: {info['files']} Dateien, {info['bytes'] / 1024 / 1024:.1f} MB (Limit {args.max_mb:g} MB)")
+    elif args.cmd == "clear":
+        n = delete(args.ns) if args.ns else clear()
+        print(f"{n} Einträge gelöscht.")
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE src/disk_cache.py ---
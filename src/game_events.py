@@ -0,0 +1,279 @@
+# --- START OF FILE src/game_events.py ---
+# Play-by-Play ohne Neuberechnung: ein GameEventProcessor pro Spiel verarbeitet nur die seit dem letzten
+# Aufruf neu hinzugekommenen Aktionen (actionNumber > zuletzt gesehene) und führt laufenden Spielstand,
+# Teamfouls pro Viertel, Führungswechsel, Verlaufskurve und übersetzte PBP-Zeilen fort.
+# Ein Refresh kostet damit O(neue Aktionen) statt O(Spiellänge) pro Ansicht.
+# Angezeigt wird immer ein EventView: unveränderliche Kopie des Stands einer Version (view()).
+# Dazu die reinen Helfer (Übersetzung, Spielzeit, Team-IDs), die auch src/analysis_ui.py verwendet.
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+# --- KONSTANTEN & HELPERS ---
+ACTION_TRANSLATION = {
+    "TWO_POINT_SHOT_MADE": "2P Treffer", "TWO_POINT_SHOT_MISSED": "2P Fehl",
+    "THREE_POINT_SHOT_MADE": "3P Treffer", "THREE_POINT_SHOT_MISSED": "3P Fehl",
+    "FREE_THROW_MADE": "FW Treffer", "FREE_THROW_MISSED": "FW Fehl",
+    "REBOUND": "Rebound", "FOUL": "Foul", "TURNOVER": "TO",
+    "ASSIST": "Assist", "STEAL": "Steal", "BLOCK": "Block",
+    "SUBSTITUTION": "Wechsel", "TIMEOUT": "Auszeit",
+    "JUMP_BALL": "Sprungball", "START": "Start", "END": "Ende",
+    "TWO_POINT_THROW": "2P Wurf", "THREE_POINT_THROW": "3P Wurf",
+    "FREE_THROW": "Freiwurf", "layup": "Korbleger", "jump_shot": "Sprung",
+    "dunk": "Dunk", "offensive": "Off", "defensive": "Def",
+    "personal_foul": "Persönlich", "technical_foul": "Technisch",
+    "unsportsmanlike_foul": "Unsportlich"
+}
+
+def translate_text(text):
+    if not text: return ""
+    text_upper = str(text).upper()
+    if text_upper in ACTION_TRANSLATION: return ACTION_TRANSLATION[text_upper]
+    clean_text = text.replace("_", " ").lower()
+    for eng, ger in ACTION_TRANSLATION.items():
+        if eng.lower() in clean_text: clean_text = clean_text.replace(eng.lower(), ger)
+    return clean_text.capitalize()
+
+def safe_int(val):
+    if val is None: return 0
+    try: return int(float(val))
+    except: return 0
+
+def get_team_name(team_data, default_name="Team"):
+    if not team_data: return default_name
+    name = team_data.get("gameStat", {}).get("seasonTeam", {}).get("name")
+    if name: return name
+    name = team_data.get("seasonTeam", {}).get("name")
+    if name: return name
+    return team_data.get("name", default_name)
+
+def get_player_lookup(box):
+    lookup = {}
+    for team_key in ['homeTeam', 'guestTeam']:
+        for p in box.get(team_key, {}).get('playerStats', []):
+            pid = str(p.get('seasonPlayer', {}).get('id'))
+            name = f"{p.get('seasonPlayer', {}).get('lastName', '')}" 
+            nr = p.get('seasonPlayer', {}).get('shirtNumber', '')
+            lookup[pid] = f"#{nr} {name}"
+    return lookup
+
+def get_player_team_map(box):
+    player_team = {}
+    h_name = get_team_name(box.get("homeTeam", {}), "Heim")
+    g_name = get_team_name(box.get("guestTeam", {}), "Gast")
+    for p in box.get("homeTeam", {}).get('playerStats', []):
+        player_team[str(p.get('seasonPlayer', {}).get('id'))] = h_name
+    for p in box.get("guestTeam", {}).get('playerStats', []):
+        player_team[str(p.get('seasonPlayer', {}).get('id'))] = g_name
+    return player_team
+
+def get_team_ids(team_data):
+    """Extrahiert alle möglichen Team-IDs und gibt eindeutige Liste zurück"""
+    ids = []
+    if team_data:
+        ids.extend([
+            str(team_data.get("seasonTeamId", "")),
+            str(team_data.get("teamId", "")),
+            str(team_data.get("seasonTeam", {}).get("id", ""))
+        ])
+    # Entferne leere Strings und Duplikate
+    return list(set(filter(None, ids)))
+
+def get_time_info(time_str, period):
+    if not time_str: return "10:00", "00:00"
+    p_int = safe_int(period)
+    base_min = 5 if p_int > 4 else 10
+    total_sec = base_min * 60
+    elapsed_sec = 0
+    try:
+        if "PT" in str(time_str):
+            t = str(time_str).replace("PT", "").replace("S", "")
+            if "M" in t:
+                parts = t.split("M")
+                elapsed_sec = int(float(parts[0])) * 60 + int(float(parts[1] or 0))
+            else: elapsed_sec = int(float(t))
+        elif ":" in str(time_str):
+            parts = str(time_str).split(":")
+            if len(parts) == 3: elapsed_sec = int(parts[0])*3600 + int(parts[1])*60 + int(parts[2])
+            elif len(parts) == 2: elapsed_sec = int(parts[0])*60 + int(parts[1])
+        else: elapsed_sec = int(float(time_str))
+        rem_sec = total_sec - elapsed_sec
+        if rem_sec < 0: rem_sec = 0
+        return f"{rem_sec // 60:02d}:{rem_sec % 60:02d}", f"{elapsed_sec // 60:02d}:{elapsed_sec % 60:02d}"
+    except: return "10:00", str(time_str)
+
+# --- INKREMENTELLER PROZESSOR ---
+
+def _number(a):
+    return safe_int(a.get("actionNumber"))
+
+class GameEventProcessor:
+    """Zustand eines Spiels aus dessen Aktionen. apply(box) verarbeitet nur neue Aktionen; ändert sich
+    die Liste anders als durch Anhängen (Korrekturen, neue Spieler im Boxscore), wird einmal neu aufgebaut."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.count = 0                    # verarbeitete Aktionen
+        self.last_number = -1             # höchste verarbeitete actionNumber
+        self.pbp_h = self.pbp_g = 0       # Spielstand laut PBP (springt nie zurück)
+        self.last = None                  # letzte Aktion (höchste actionNumber)
+        self.last_period = None           # letzte Aktion mit Viertelangabe
+        self.fouls = {}                   # (Viertel, seasonTeamId) -> Teamfouls
+        self.flow = []                    # (Index, Differenz, Führung 1/-1/0, "H:G")
+        self.rows = []                    # übersetzte PBP-Zeilen, chronologisch
+        self.lead_changes = 0; self._leader = 0
+        self.version = 0
+        self._tail = None; self._ctx = None; self._view = None
+
+    def _context(self, box):
+        h_data, g_data = box.get("homeTeam", {}) or {}, box.get("guestTeam", {}) or {}
+        return (get_player_lookup(box), get_player_team_map(box), get_team_name(h_data), get_team_name(g_data),
+                frozenset(get_team_ids(h_data)), frozenset(get_team_ids(g_data)))
+
+    def apply(self, box):
+        """Verarbeitet neue Aktionen aus box. Gibt die Anzahl neu verarbeiteter Aktionen zurück."""
+        actions = box.get("actions") or []
+        n = len(actions)
+        with self._lock:
+            if n == self.count and (n == 0 or _number(actions[-1]) == self._tail) and self._ctx is not None: return 0
+            ctx = self._context(box)
+            tail = None
+            if ctx == self._ctx and n >= self.count and (self.count == 0 or _number(actions[self.count - 1]) == self._tail):
+                tail = actions[self.count:]
+                if any(_number(a) <= self.last_number for a in tail): tail = None
+            if tail is None:
+                self.reset(); tail = actions
+            self._ctx = ctx
+            for a in sorted(tail, key=_number): self._process(a)
+            self._tail = _number(actions[-1]) if actions else None
+            if tail: self.version += 1
+            self._view = None
+            return len(tail)
+
+    def _process(self, a):
+        player_map, team_map, h_name, g_name, h_ids, g_ids = self._ctx
+        i = self.count; self.count += 1
+        self.last_number = max(self.last_number, _number(a)); self.last = a
+        if a.get("period"): self.last_period = a.get("period")
+
+        h, g = a.get("homeTeamPoints"), a.get("guestTeamPoints")
+        if h is not None and g is not None:
+            nh, ng = safe_int(h), safe_int(g)
+            diff = nh - ng; lead = (diff > 0) - (diff < 0)
+            self.flow.append((i, diff, lead, f"{nh}:{ng}"))
+            if lead and lead != self._leader:
+                if self._leader: self.lead_changes += 1
+                self._leader = lead
+            if (nh + ng) >= (self.pbp_h + self.pbp_g): self.pbp_h, self.pbp_g = nh, ng
+
+        a_type = str(a.get("type")).upper()
+        if "FOUL" in a_type and "RECEIVED" not in a_type:
+            key = (safe_int(a.get("period")), str(a.get("seasonTeamId")))
+            self.fouls[key] = self.fouls.get(key, 0) + 1
+
+        p = a.get("period", "")
+        t_rem, t_orig = get_time_info(a.get("gameTime") or a.get("timeInGame"), p)
+        pid = str(a.get("seasonPlayerId")); tid = str(a.get("seasonTeamId"))
+        team = team_map.get(pid) or (h_name if tid in h_ids else (g_name if tid in g_ids else "-"))
+        desc = translate_text(a.get("type"))
+        if a.get("points"): desc += f" (+{a.get('points')})"
+        self.rows.append({"Zeit": f"Q{p} | {t_rem} ({t_orig})", "Score": f"{self.pbp_h}:{self.pbp_g}", "Team": team, "Spieler": player_map.get(pid, ""), "Aktion": desc})
+
+    # --- ABFRAGEN ---
+
+    def view(self):
+        """Unveränderlicher Stand der aktuellen Version (pro Version einmal erzeugt). Für Leser in anderen
+        Threads als dem, der apply() aufruft: Live-Seite und SSE lesen nie den Prozessor selbst."""
+        with self._lock:
+            if self._view is None: self._view = EventView(self)
+            return self._view
+
+    def team_fouls(self, period, h_ids, g_ids):
+        return self.view().team_fouls(period, h_ids, g_ids)
+
+    def pbp_frame(self):
+        return self.view().pbp_frame()
+
+    def flow_frame(self, h_name, g_name):
+        return self.view().flow_frame(h_name, g_name)
+
+class EventView:
+    """Kopie des Prozessor-Stands zu einer Version; ändert sich danach nicht mehr. Tabellen werden beim ersten Abruf gebaut."""
+
+    def __init__(self, ev):
+        self.version = ev.version; self.count = ev.count
+        self.last_number = ev.last_number; self.last = ev.last; self.last_period = ev.last_period
+        self.pbp_h, self.pbp_g = ev.pbp_h, ev.pbp_g
+        self.lead_changes = ev.lead_changes
+        self.fouls = dict(ev.fouls); self.flow = tuple(ev.flow); self.rows = tuple(ev.rows)
+        self._lock = threading.Lock(); self._frames = {}
+
+    def team_fouls(self, period, h_ids, g_ids):
+        """Teamfouls (max. 5) im Viertel period -> (heim, gast)."""
+        p = safe_int(period); h = g = 0
+        for (fp, tid), c in self.fouls.items():
+            if fp != p: continue
+            if tid in h_ids: h += c
+            elif tid in g_ids: g += c
+        return min(h, 5), min(g, 5)
+
+    def pbp_frame(self):
+        """PBP-Tabelle, neueste Aktion oben."""
+        with self._lock:
+            if "pbp" not in self._frames:
+                df = pd.DataFrame(list(self.rows))
+                self._frames["pbp"] = df.iloc[::-1] if not df.empty else df
+            return self._frames["pbp"]
+
+    def flow_frame(self, h_name, g_name):
+        """Punktedifferenz-Verlauf für das Flow-Chart (Spalten Index, Diff, Team, Score)."""
+        key = ("flow", h_name, g_name)
+        with self._lock:
+            if key not in self._frames:
+                names = {1: h_name, -1: g_name, 0: "Tie"}
+                self._frames[key] = pd.DataFrame([{"Index": i, "Diff": d, "Team": names[l], "Score": s} for i, d, l, s in self.flow])
+            return self._frames[key]
+
+# --- ANZEIGESTAND (Live-Ansicht und OBS-Scoreboard) ---
+
+def live_score_state(box, events):
+    """Spielstand, Uhr, Viertel und Teamfouls wie in der Live-Ansicht. Ohne Ergebnis (0:0) gilt der Stand
+    der letzten Aktion; fehlt das Viertel, das der letzten Aktion mit Viertelangabe."""
+    h_data, g_data = box.get("homeTeam", {}) or {}, box.get("guestTeam", {}) or {}
+    res = box.get("result", {}) or {}
+    sh, sg = safe_int(res.get('homeTeamFinalScore')), safe_int(res.get('guestTeamFinalScore'))
+    period = res.get('period') or box.get('period', 1)
+    last = events.last
+    if sh == 0 and sg == 0 and last:
+        sh, sg = safe_int(last.get('homeTeamPoints')), safe_int(last.get('guestTeamPoints'))
+        if not period: period = last.get('period')
+    if not period or period == 0:
+        period = events.last_period or period
+    t_rem, t_orig = get_time_info(box.get('gameTime') or (last.get('gameTime') if last else None), period)
+    h_ids, g_ids = get_team_ids(h_data), get_team_ids(g_data)
+    h_fouls, g_fouls = events.team_fouls(period, h_ids, g_ids)
+    return {"home": get_team_name(h_data), "guest": get_team_name(g_data), "h_score": sh, "g_score": sg,
+            "period": period, "period_label": (f"OT{safe_int(period)-4}" if safe_int(period) > 4 else f"Q{period}"),
+            "clock": t_rem, "elapsed": t_orig, "h_fouls": h_fouls, "g_fouls": g_fouls,
+            "h_team_id": str(h_data.get("seasonTeamId")), "g_team_id": str(g_data.get("seasonTeamId"))}
+
+# Prozessoren je Spiel (für wiederholte Ansichten desselben Spiels), begrenzt auf die zuletzt genutzten
+MAX_GAMES = 64
+_processors = OrderedDict()
+_registry_lock = threading.Lock()
+
+def events_for(box, game_id=None):
+    """Stand (EventView) von box. Mit game_id wird der Prozessor wiederverwendet und nur fortgeschrieben."""
+    if game_id is None:
+        ev = GameEventProcessor(); ev.apply(box); return ev.view()
+    with _registry_lock:
+        ev = _processors.pop(str(game_id), None) or GameEventProcessor()
+        _processors[str(game_id)] = ev
+        while len(_processors) > MAX_GAMES: _processors.popitem(last=False)
+    with ev._lock:
+        ev.apply(box)
+        return ev.view()
+# --- END OF FILE src/game_events.py ---
@@ -3,7 +3,14 @@
 import pandas as pd
 import copy
 from src.utils import clean_pos
+from src.templates import get, render, render_each
+from src.leaderboard import leaders, REPORT_CATEGORIES
+from src.tracing import traced
 
+# Reihenfolge der Werte in der Statistikzeile einer Spielerkarte
+CARD_STAT_KEYS = ["MIN_DISPLAY", "PPG", "2M", "2A", "2PCT", "3M", "3A", "3PCT", "FTM", "FTA", "FTPCT", "DR", "OR", "TOT", "AS", "TO", "ST", "PF"]
+
+@traced("html")
 def generate_header_html(meta):
     return f"""
 <div class="report-header">
@@ -26,59 +33,43 @@ Scouting Report | {meta['date']}<br>
 </div>
 """
 
+@traced("html")
 def generate_top3_html(df: pd.DataFrame) -> str:
-    scorers = df.sort_values(by="PPG", ascending=False).head(3)
-    rebounders = df.sort_values(by="TOT", ascending=False).head(3)
-    shooters = df[df["3M"] >= 0.5].sort_values(by="3PCT", ascending=False).head(3)
-    if shooters.empty: shooters = df.sort_values(by="3PCT", ascending=False).head(3)
-    fts = df[df["FTA"] >= 1.0].sort_values(by="FTPCT", ascending=True).head(3)
-    if fts.empty: fts = df.sort_values(by="FTPCT", ascending=True).head(3)
-    
-    assisters = df.sort_values(by="AS", ascending=False).head(3)
-    stealers = df.sort_values(by="ST", ascending=False).head(3)
-    turnovers = df.sort_values(by="TO", ascending=False).head(3)
-    blocks = df.sort_values(by="BS", ascending=False).head(3)
-    fouls = df.sort_values(by="PF", ascending=False).head(3)
+    # alle neun Kategorien in einem Durchgang (src/leaderboard.py), danach nur noch Listenzugriffe
+    top = leaders(df, REPORT_CATEGORIES, k=3)
+    columns = {}
+    def col(k):
+        if k not in columns: columns[k] = df[k].tolist()
+        return columns[k]
 
     FONT_SIZE = "14px"
 
-    def build_box(d, headers, keys, bolds, color, title):
-        h = f"<div class='stat-box'>"
-        h += f"<div class='stat-title' style='border-top: 4px solid {color}; color: {color}; font-size: 18px; padding: 5px; font-weight:bold;'>{title}</div>"
-        h += f"<table class='top3-table'>"
-        h += "<tr>"
-        for head in headers: 
-            h += f"<th>{head}</th>"
-        h += "</tr>"
-        for _, r in d.iterrows():
-            h += "<tr>"
+    def build_box(category, headers, keys, bolds, color, title):
+        td = get("top3_td").render
+        rows = []
+        for pos in top[category]:
+            cells = []
             for i, k in enumerate(keys):
-                val = r[k]
-                align = "left" if k == "NAME_FULL" else "center"
+                val = col(k)[pos]
                 if k == "NAME_FULL": val = val.split(" ")[-1]
                 elif isinstance(val, float): val = f"{val:.1f}"
-                style = f"text-align:{align}; font-size: {FONT_SIZE};"
-                if i in bolds: style += " font-weight:bold;"
-                h += f"<td style='{style}'>{val}</td>"
-            h += "</tr>"
-        h += "</table></div>"
-        return h
+                cells.append(td(align="left" if k == "NAME_FULL" else "center", size=FONT_SIZE, bold=" font-weight:bold;" if i in bolds else "", val=val))
+            rows.append(render("top3_row", cells="".join(cells)))
+        return render("top3_box", color=color, title=title, head=render_each("top3_th", [{"head": h} for h in headers]), rows="".join(rows))
 
-    html = "<div class='top3-container'>"
-    html += build_box(scorers, ["#", "Name", "PPG", "FG%"], ["NR", "NAME_FULL", "PPG", "FG%"], [2], "#e35b00", "Top Scorer")
-    html += build_box(rebounders, ["#", "Name", "D", "O", "TOT"], ["NR", "NAME_FULL", "DR", "OR", "TOT"], [4], "#0055ff", "Rebounds")
-    html += build_box(shooters, ["#", "Name", "M", "A", "%"], ["NR", "NAME_FULL", "3M", "3A", "3PCT"], [4], "#28a745", "3-Points")
-    html += "</div>"
-    html += "<div class='top3-container'>"
-    html += build_box(fts, ["#", "Name", "M", "A", "%"], ["NR", "NAME_FULL", "FTM", "FTA", "FTPCT"], [4], "#dc3545", "Weak FT")
-    html += build_box(assisters, ["#", "Name", "AS"], ["NR", "NAME_FULL", "AS"], [2], "#ffc107", "Assists")
-    html += build_box(turnovers, ["#", "Name", "TO"], ["NR", "NAME_FULL", "TO"], [2], "#fd7e14", "Turnovers")
-    html += "</div>"
-    html += "<div class='top3-container'>"
-    html += build_box(stealers, ["#", "Name", "ST"], ["NR", "NAME_FULL", "ST"], [2], "#6f42c1", "Steals")
-    html += build_box(blocks, ["#", "Name", "BS"], ["NR", "NAME_FULL", "BS"], [2], "#343a40", "Blocks")
-    html += build_box(fouls, ["#", "Name", "PF"], ["NR", "NAME_FULL", "PF"], [2], "#20c997", "Fouls")
-    html += "</div>"
+    # drei Zeilen mit je drei Boxen
+    layout = [
+        [("scorers", ["#", "Name", "PPG", "FG%"], ["NR", "NAME_FULL", "PPG", "FG%"], [2], "#e35b00", "Top Scorer"),
+         ("rebounders", ["#", "Name", "D", "O", "TOT"], ["NR", "NAME_FULL", "DR", "OR", "TOT"], [4], "#0055ff", "Rebounds"),
+         ("shooters", ["#", "Name", "M", "A", "%"], ["NR", "NAME_FULL", "3M", "3A", "3PCT"], [4], "#28a745", "3-Points")],
+        [("fts", ["#", "Name", "M", "A", "%"], ["NR", "NAME_FULL", "FTM", "FTA", "FTPCT"], [4], "#dc3545", "Weak FT"),
+         ("assisters", ["#", "Name", "AS"], ["NR", "NAME_FULL", "AS"], [2], "#ffc107", "Assists"),
+         ("turnovers", ["#", "Name", "TO"], ["NR", "NAME_FULL", "TO"], [2], "#fd7e14", "Turnovers")],
+        [("stealers", ["#", "Name", "ST"], ["NR", "NAME_FULL", "ST"], [2], "#6f42c1", "Steals"),
+         ("blocks", ["#", "Name", "BS"], ["NR", "NAME_FULL", "BS"], [2], "#343a40", "Blocks"),
+         ("fouls", ["#", "Name", "PF"], ["NR", "NAME_FULL", "PF"], [2], "#20c997", "Fouls")],
+    ]
+    html = "".join(render("top3_container", boxes="".join(build_box(*box) for box in line)) for line in layout)
 
     c_green = "#5c9c30"; c_gray = "#999999"; c_red = "#d9534f"
     legend_html = f"""
@@ -89,6 +80,7 @@ def generate_top3_html(df: pd.DataFrame) -> str:
 </div>"""
     return html + legend_html
 
+@traced("html")
 def generate_card_html(row, metadata, notes, color_code):
     img_url = metadata["img"] if metadata["img"] else "https://via.placeholder.com/150?text=No+Img"
     try:
@@ -98,32 +90,11 @@ def generate_card_html(row, metadata, notes, color_code):
     except: height_str = "-"
     pos_str = clean_pos(metadata["pos"])
     
-    stats_header = """<tr class="bg-gray"><th rowspan="2">Min</th><th rowspan="2">PPG</th><th colspan="3">2P FG</th><th colspan="3">3P FG</th><th colspan="3">FT</th><th colspan="3">REB</th><th rowspan="2">AS</th><th rowspan="2">TO</th><th rowspan="2">ST</th><th rowspan="2">PF</th></tr><tr class="bg-gray"><th>M</th><th>A</th><th>%</th><th>M</th><th>A</th><th>%</th><th>M</th><th>A</th><th>%</th><th>D</th><th>O</th><th>TOT</th></tr>"""
-    stats_row = f'<tr class="font-bold"><td>{row["MIN_DISPLAY"]}</td><td>{row["PPG"]}</td><td>{row["2M"]}</td><td>{row["2A"]}</td><td>{row["2PCT"]}</td><td>{row["3M"]}</td><td>{row["3A"]}</td><td>{row["3PCT"]}</td><td>{row["FTM"]}</td><td>{row["FTA"]}</td><td>{row["FTPCT"]}</td><td>{row["DR"]}</td><td>{row["OR"]}</td><td>{row["TOT"]}</td><td>{row["AS"]}</td><td>{row["TO"]}</td><td>{row["ST"]}</td><td>{row["PF"]}</td></tr>'
-    
-    note_rows = ""
-    for i in range(1, 5):
-        l_note = notes.get(f'l{i}', '')
-        r_note = notes.get(f'r{i}', '')
-        note_rows += f'<tr class="note-row"><td colspan="6">{l_note}</td><td colspan="12" class="note-right" style="color: #d9534f; font-weight: bold;">{r_note}</td></tr>'
-
-    return f"""
-<div class="player-card">
-<div class="card-header" style="background-color: {color_code};"><span>#{row['NR']} {row['NAME_FULL']}</span><span>{height_str} m | Pos: {pos_str}</span></div>
-<div class="card-body">
-<table class="layout-table"><tr>
-<td class="layout-img-cell"><img src="{img_url}" class="player-img"></td>
-<td class="layout-stats-cell">
-<table class="stats-table">
-{stats_header}
-{stats_row}
-{note_rows}
-</table>
-</td>
-</tr></table>
-</div>
-</div>"""
+    stats = render_each("card_cell", [{"v": row[k]} for k in CARD_STAT_KEYS])
+    notes_html = render_each("card_note_row", [{"l": notes.get(f'l{i}', ''), "r": notes.get(f'r{i}', '')} for i in range(1, 5)])
+    return render("card", color=color_code, nr=row['NR'], name=row['NAME_FULL'], height=height_str, pos=pos_str, img=img_url, stats=stats, notes=notes_html)
 
+@traced("html")
 def generate_team_stats_html(ts):
     if not ts: return ""
     def calc_pct(m, a, api): return api if api > 0 else (m/a*100 if a>0 else 0)
@@ -136,21 +107,20 @@ def generate_team_stats_html(ts):
 </table>
 </div>"""
 
+@traced("html")
 def generate_custom_sections_html(offense_df, defense_df, about_df):
     html = "<div style='page-break-before: always;'>"
     def make_section(title, df):
         if df.empty: return ""
-        sh = f"<h3 style='border-bottom: 2px solid #333; margin-bottom:10px; font-size: 20px;'>{title}</h3>"
-        sh += "<table style='width:100%; border-collapse:collapse; margin-bottom:20px;'>"
-        for _, r in df.iterrows():
-            c1 = r.get(df.columns[0], ""); c2 = r.get(df.columns[1], "")
-            sh += f"<tr><td style='width:25%; border:1px solid #ccc; padding:6px; font-weight:bold; vertical-align:top; font-size:14px; background:#f9f9f9;'>{c1}</td><td style='border:1px solid #ccc; padding:6px; vertical-align:top; font-size:14px;'>{c2}</td></tr>"
-        return sh + "</table>"
+        c1, c2 = df.columns[0], df.columns[1]
+        rows = [{"c1": r.get(c1, ""), "c2": r.get(c2, "")} for _, r in df.iterrows()]
+        return render("custom_section", title=title, rows=render_each("custom_row", rows))
     html += make_section("Key Facts Offense", offense_df)
     html += make_section("Key Facts Defense", defense_df)
     html += make_section("ALL ABOUT US", about_df)
     return html + "</div>"
 
+@traced("html")
 def generate_comparison_html(h_stats_in, g_stats_in, h_name, g_name):
     if not h_stats_in or not g_stats_in: return "Keine Daten für Vergleich verfügbar."
     import copy
@@ -166,8 +136,7 @@ def generate_comparison_html(h_stats_in, g_stats_in, h_name, g_name):
         stats['3pct'] = get_pct(stats, '3'); stats['ftpct'] = get_pct(stats, 'ft')
         if 'bs' not in stats: stats['bs'] = 0.0
     
-    html = f"""<div style="margin: 20px 0; font-family: sans-serif;"><h3 style="text-align: center; border-bottom: 2px solid #333; padding-bottom: 10px; margin-bottom: 0;">Head-to-Head (Saison-Schnitt)</h3><table style="width: 100%; border-collapse: collapse; font-size: 16px;"><tr style="background-color: #333; color: white;"><th style="padding: 12px; text-align: right; width: 35%;">{h_name}</th><th style="padding: 12px; text-align: center; width: 30%; background-color: #555;">Statistik</th><th style="padding: 12px; text-align: left; width: 35%;">{g_name}</th></tr>"""
-    
+    rows = []
     for label, key, is_pct, lower_better in metrics:
         val_h = h_stats.get(key, 0.0); val_g = g_stats.get(key, 0.0)
         fmt_h = f"{val_h:.1f}" + ("%" if is_pct else ""); fmt_g = f"{val_g:.1f}" + ("%" if is_pct else "")
@@ -182,5 +151,5 @@ def generate_comparison_html(h_stats_in, g_stats_in, h_name, g_name):
             if is_h_better: style_h += " font-weight: bold; color: #2e7d32;"
             else: style_g += " font-weight: bold; color: #2e7d32;"
             
-        html += f"""<tr><td style="{style_h}">{fmt_h}</td><td style="{style_label}">{label}</td><td style="{style_g}">{fmt_g}</td></tr>"""
-    return html + "</table></div>"
+        rows.append({"style_h": style_h, "fmt_h": fmt_h, "style_label": style_label, "label": label, "style_g": style_g, "fmt_g": fmt_g})
+    return render("comparison", h_name=h_name, g_name=g_name, rows=render_each("comparison_row", rows))
@@ -0,0 +1,60 @@
+# --- START OF FILE src/http_client.py ---
+import re
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src import tracing
+from src.config import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_RETRIES, HTTP_BACKOFF,
+    HTTP_RETRY_STATUS, HTTP_TIMEOUTS, MOCK_API_URL, MOCK_API_RECORD, MOCK_API_FIXTURES
+)
+
+_DBBL_HOST = re.compile(r"^https://api-[a-z0-9]+\.dbbl\.scb\.world")
+
+# Eine Session pro Wiederholungs-Einstellung für den ganzen Prozess: requests hält darin pro Host einen
+# Keep-Alive-Pool, so dass nur der erste Aufruf den TCP/TLS-Handshake bezahlt.
+# Abrufe mit Ausweich-Host (api-s -> api-n, siehe src/routing.py) nutzen retries=0: Bei 5xx oder Verbindungsfehler
+# ist der andere Host schneller gefragt, als Wiederholungen samt Backoff auf dem ersten dauern.
+_sessions = {}
+_session_lock = threading.Lock()
+
+def _build_session(retries):
+    retry = Retry(
+        total=retries, connect=retries, read=min(retries, 1),
+        backoff_factor=HTTP_BACKOFF, status_forcelist=HTTP_RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]), raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+def get_session(retries=HTTP_RETRIES):
+    s = _sessions.get(retries)
+    if s is None:
+        with _session_lock:
+            s = _sessions.get(retries)
+            if s is None: s = _sessions[retries] = _build_session(retries)
+    return s
+
+def get_timeout(endpoint):
+    return HTTP_TIMEOUTS.get(endpoint, HTTP_TIMEOUTS["default"])
+
+def api_get(url, endpoint="default", headers=None, timeout=None, retries=HTTP_RETRIES, **kwargs):
+    """GET über den gemeinsamen Pool. Timeout kommt aus HTTP_TIMEOUTS, falls nicht explizit gesetzt.
+    retries=0, wenn der Aufrufer noch einen anderen Host probieren kann.
+    Mit MOCK_API_URL gehen DBBL-Abrufe an den lokalen Mock (src/mock_api.py)."""
+    if MOCK_API_URL: url = _DBBL_HOST.sub(MOCK_API_URL.rstrip("/"), url)
+    with tracing.span(endpoint, "http"):
+        r = get_session(retries).get(url, headers=headers, timeout=timeout if timeout is not None else get_timeout(endpoint), **kwargs)
+        history = getattr(getattr(r.raw, "retries", None), "history", None) or ()
+        tracing.add_http(len(r.content), len(history))
+    if MOCK_API_RECORD and not MOCK_API_URL and r.status_code == 200 and "json" in r.headers.get("Content-Type", ""):
+        try:
+            from src.mock_api import record
+            record(MOCK_API_FIXTURES, url, r.json())
+        except Exception: pass
+    return r
+# --- END OF FILE src/http_client.py ---
@@ -0,0 +1,211 @@
+# --- START OF FILE src/image_store.py ---
+# Persistenter Bild-Speicher für Spielerfotos und Teamlogos.
+# Originale liegen inhaltsadressiert (sha256) unter CACHE_DIR/images, abgeleitete Größen daneben.
+# Pro URL merkt sich der Index (disk_cache, Namespace "image_index") Hash, ETag und Last-Modified;
+# nach IMAGE_REVALIDATE_H wird nur per bedingtem Request (304) nachgefragt statt neu geladen.
+# prune() hält den Ordner unter IMAGE_CACHE_MAX_MB (nach neuen Bildern automatisch, sonst python -m src.disk_cache images).
+import os
+import time
+import base64
+import hashlib
+import threading
+from io import BytesIO
+from PIL import Image
+from src.config import CACHE_DIR, IMAGE_REVALIDATE_H, IMAGE_MISSING_RETRY_H, IMAGE_CACHE_MAX_MB, HTTP_RETRIES
+from src.http_client import api_get
+from src import disk_cache
+from src.tracing import traced
+
+IMAGE_DIR = os.path.join(CACHE_DIR, "images")
+
+# Abgeleitete Größen: Zielhöhe in Pixeln (Bilder werden nur verkleinert, nie vergrößert)
+VARIANTS = {
+    "pdf": 300,    # Spielerkarte im PDF-Report
+    "potg": 220,   # OBS Player of the Game
+    "obs": 150,    # OBS Starting Five
+    "ui": 80,      # Vorschaubilder in der App
+}
+
+# Feste Anzahl Locks statt einem pro URL: dieselbe URL landet immer beim selben Lock
+_locks = [threading.Lock() for _ in range(64)]
+_PRUNE_EVERY_S = 600   # Aufräumen nach neuen Bildern höchstens so oft
+_PRUNE_GRACE_S = 60    # gerade geschriebene Dateien haben evtl. noch keinen Index-Eintrag
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def _url_lock(url):
+    return _locks[hash(url) % len(_locks)]
+
+def _path(sha, variant=None):
+    name = sha if variant is None else f"{sha}.{variant}.jpg"
+    return os.path.join(IMAGE_DIR, sha[:2], name)
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f: f.write(data)
+    os.replace(tmp, path)
+
+def _read(path):
+    try:
+        with open(path, "rb") as f: return f.read()
+    except OSError: return None
+
+def _guess_mime(url, data):
+    if data[:3] == b"\xff\xd8\xff": return "image/jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n": return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP": return "image/webp"
+    if data[:3] == b"GIF": return "image/gif"
+    low = url.lower()
+    return "image/jpeg" if ("jpg" in low or "jpeg" in low) else "image/png"
+
+def _store(url, data, resp_headers):
+    sha = hashlib.sha256(data).hexdigest()
+    path = _path(sha)
+    if not os.path.exists(path): _write(path, data)
+    entry = {"sha": sha, "mime": _guess_mime(url, data), "size": len(data), "checked_at": time.time(),
+             "etag": resp_headers.get("ETag"), "last_modified": resp_headers.get("Last-Modified")}
+    disk_cache.put("image_index", url, entry)
+    _maybe_prune()
+    return entry
+
+@traced("image", "image_fetch")
+def fetch(url, headers=None, endpoint="image", min_bytes=0, retries=HTTP_RETRIES):
+    """Index-Eintrag {"sha", "mime", ...} für url oder None. Lädt nur, wenn nötig (neu, abgelaufen, geändert).
+    retries=0, wenn der Aufrufer weitere Kandidaten hat (z.B. Logo auf dem anderen Host)."""
+    if not url: return None
+    with _url_lock(url):
+        entry = disk_cache.get("image_index", url)
+        now = time.time()
+        if entry:
+            if entry.get("missing"):
+                if now - entry["checked_at"] < IMAGE_MISSING_RETRY_H * 3600: return None
+            elif now - entry["checked_at"] < IMAGE_REVALIDATE_H * 3600 and os.path.exists(_path(entry["sha"])):
+                return entry
+
+        req_headers = dict(headers or {})
+        if entry and not entry.get("missing") and os.path.exists(_path(entry["sha"])):
+            if entry.get("etag"): req_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"): req_headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            r = api_get(url, endpoint=endpoint, headers=req_headers, retries=retries)
+        except Exception:
+            # Netzwerkfehler: vorhandene (ggf. veraltete) Kopie weiter nutzen
+            return entry if entry and not entry.get("missing") else None
+
+        if r.status_code == 304 and entry and not entry.get("missing"):
+            entry["checked_at"] = now
+            disk_cache.put("image_index", url, entry)
+            return entry
+        if r.status_code == 200 and len(r.content) > min_bytes:
+            return _store(url, r.content, r.headers)
+        if r.status_code in (200, 404, 410):
+            # nicht vorhanden oder zu klein (z.B. Platzhalter-Logo) -> eine Weile nicht erneut fragen
+            disk_cache.put("image_index", url, {"missing": True, "checked_at": now})
+            return None
+        return entry if entry and not entry.get("missing") else None
+
+def original_bytes(url, headers=None, endpoint="image", min_bytes=0, retries=HTTP_RETRIES):
+    entry = fetch(url, headers, endpoint, min_bytes, retries)
+    if not entry: return None, None
+    data = _read(_path(entry["sha"]))
+    return (data, entry["mime"]) if data else (None, None)
+
+@traced("image")
+def transcode(data, height):
+    """Verkleinern (LANCZOS), Transparenz auf Weiß, JPEG q90 - wie bisher in optimize_image_base64."""
+    img = Image.open(BytesIO(data))
+    if img.size[1] > height:
+        w_percent = height / float(img.size[1])
+        w_size = int(float(img.size[0]) * float(w_percent))
+        img = img.resize((w_size, height), Image.Resampling.LANCZOS)
+    new_img = Image.new("RGB", img.size, (255, 255, 255))
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        if img.mode != 'RGBA': img = img.convert('RGBA')
+        new_img.paste(img, mask=img.split()[3])
+    else:
+        new_img.paste(img)
+    buffer = BytesIO()
+    new_img.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+def variant_bytes(url, variant, headers=None, endpoint="image"):
+    """JPEG-Bytes der gewünschten Größe (einmal berechnet, danach von der Platte)."""
+    entry = fetch(url, headers, endpoint)
+    if not entry: return None
+    path = _path(entry["sha"], variant)
+    data = _read(path)
+    if data is not None: return data
+    original = _read(_path(entry["sha"]))
+    if original is None: return None
+    try: data = transcode(original, VARIANTS[variant])
+    except Exception: return None
+    _write(path, data)
+    return data
+
+def data_uri(url, variant=None, headers=None, endpoint="image", min_bytes=0, retries=HTTP_RETRIES):
+    """Base64-Data-URI (Original oder Variante) oder None."""
+    if variant is None:
+        data, mime = original_bytes(url, headers, endpoint, min_bytes, retries)
+    else:
+        data, mime = variant_bytes(url, variant, headers, endpoint), "image/jpeg"
+    if not data: return None
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+# --- AUFRÄUMEN ---
+
+def _files():
+    """{sha: [(pfad, bytes, mtime)]} aller Dateien unter IMAGE_DIR (Original und Varianten)."""
+    out = {}
+    for root, _, names in os.walk(IMAGE_DIR):
+        for n in names:
+            if n.endswith(".tmp"): continue
+            path = os.path.join(root, n)
+            try: info = os.stat(path)
+            except OSError: continue
+            out.setdefault(n.split(".")[0], []).append((path, info.st_size, info.st_mtime))
+    return out
+
+def prune(max_bytes=IMAGE_CACHE_MAX_MB * 1024 * 1024):
+    """Löscht Dateien ohne Index-Eintrag (z.B. nach disk_cache.prune) und danach die Bilder der am längsten
+    nicht genutzten URLs, bis max_bytes eingehalten wird. Gibt die Anzahl gelöschter Dateien zurück."""
+    with _prune_lock:
+        files = _files()
+        index = disk_cache.items("image_index")
+        users = {}
+        for url, e in index:
+            if e.get("sha"): users.setdefault(e["sha"], set()).add(url)
+        total = sum(size for group in files.values() for _, size, _ in group)
+        removed = 0; now = time.time()
+
+        def drop(sha):
+            nonlocal total, removed
+            for path, size, _ in files.pop(sha, ()):
+                try: os.remove(path); total -= size; removed += 1
+                except OSError: pass
+
+        for sha in [sha for sha, group in files.items() if sha not in users and all(now - m > _PRUNE_GRACE_S for _, _, m in group)]:
+            drop(sha)
+        for url, e in index:
+            if total <= max_bytes: break
+            sha = e.get("sha")
+            if not sha: continue
+            disk_cache.delete("image_index", url)
+            users[sha].discard(url)
+            if not users[sha]: drop(sha)
+        return removed
+
+def _maybe_prune():
+    global _last_prune
+    now = time.time()
+    if now - _last_prune < _PRUNE_EVERY_S: return
+    _last_prune = now
+    try: prune()
+    except Exception as e: print(f"Bild-Speicher: Aufräumen fehlgeschlagen ({e})")
+
+def stats():
+    files = 0; size = 0
+    for root, _, names in os.walk(IMAGE_DIR):
+        for n in names: files += 1; size += os.path.getsize(os.path.join(root, n))
+    return {"files": files, "bytes": size, "dir": IMAGE_DIR}
+# --- END OF FILE src/image_store.py ---
@@ -0,0 +1,89 @@
+# --- START OF FILE src/leaderboard.py ---
+# Ranglisten-Engine: alle Kategorien (Top-k bzw. Bottom-k) in einem Durchgang über eine NumPy-Matrix.
+# Statt pro Kategorie den ganzen DataFrame zu sortieren, wird die Matrix einmal per np.partition
+# geteilt; sortiert werden danach nur noch die wenigen Kandidaten je Kategorie.
+# Bedient den Top-3-Block im Report (src/html_gen.py) und die Liga-Ranglisten (src/warehouse.py).
+#
+# Reihenfolge wie DataFrame.sort_values: fehlende Werte (NaN) zuletzt, bei Gleichstand die Kader-Reihenfolge.
+import numpy as np
+import pandas as pd
+
+# Kategorie: name -> (Statistik, aufsteigend, Filter (Spalte, Mindestwert) oder None)
+REPORT_CATEGORIES = {
+    "scorers": ("PPG", False, None),
+    "rebounders": ("TOT", False, None),
+    "shooters": ("3PCT", False, ("3M", 0.5)),
+    "fts": ("FTPCT", True, ("FTA", 1.0)),     # schwächste Freiwerferinnen
+    "assisters": ("AS", False, None),
+    "stealers": ("ST", False, None),
+    "turnovers": ("TO", False, None),
+    "blocks": ("BS", False, None),
+    "fouls": ("PF", False, None),
+}
+
+LEAGUE_CATEGORIES = {
+    "PPG": ("PPG", False, None),
+    "TOT": ("TOT", False, None),
+    "AS": ("AS", False, None),
+    "ST": ("ST", False, None),
+    "BS": ("BS", False, None),
+    "FG%": ("FG%", False, ("TOTAL_FGA", 20)),
+    "3PCT": ("3PCT", False, ("TOTAL_3A", 10)),
+    "FTPCT": ("FTPCT", False, ("TOTAL_FTA", 10)),
+}
+
+_HIDDEN = np.inf                     # nicht zugelassen (Filter) -> fällt raus
+_MISSING = np.finfo(float).max       # NaN -> hinter alle echten Werte
+
+def _numeric(df, col):
+    if col not in df.columns: return np.full(len(df), np.nan)
+    s = df[col]
+    if not pd.api.types.is_numeric_dtype(s): s = pd.to_numeric(s, errors="coerce")
+    return s.to_numpy(dtype=float, na_value=np.nan)
+
+def leaders(df, categories=REPORT_CATEGORIES, k=3, row_mask=None, fallback=True):
+    """{name: Zeilenpositionen (np.array)} der besten k je Kategorie.
+    row_mask schränkt alle Kategorien ein (z.B. Mindestspiele). Lässt ein Kategorie-Filter niemanden übrig,
+    wird mit fallback=True ohne diesen Filter gewertet (wie bisher im Report)."""
+    names = list(categories)
+    n = len(df)
+    if n == 0 or not names or k <= 0: return {name: np.array([], dtype=int) for name in names}
+    cols = list(dict.fromkeys([c[0] for c in categories.values()] + [c[2][0] for c in categories.values() if c[2]]))
+    matrix = np.column_stack([_numeric(df, c) for c in cols])
+    col_idx = {c: i for i, c in enumerate(cols)}
+    base = np.ones(n, dtype=bool) if row_mask is None else np.asarray(row_mask, dtype=bool)
+
+    keys = np.empty((n, len(names)))
+    for j, name in enumerate(names):
+        stat, ascending, flt = categories[name]
+        values = matrix[:, col_idx[stat]]
+        key = values if ascending else -values
+        key = np.where(np.isnan(values), _MISSING, key)
+        mask = base
+        if flt:
+            mask = base & (matrix[:, col_idx[flt[0]]] >= flt[1])
+            if fallback and not mask.any(): mask = base
+        keys[:, j] = np.where(mask, key, _HIDDEN)
+
+    kk = min(k, n)
+    thresholds = np.partition(keys, kk - 1, axis=0)[kk - 1]
+    out = {}
+    for j, name in enumerate(names):
+        col = keys[:, j]
+        cand = np.flatnonzero(col <= thresholds[j])          # in Kader-Reihenfolge
+        cand = cand[np.argsort(col[cand], kind="stable")][:kk]
+        out[name] = cand[col[cand] != _HIDDEN]
+    return out
+
+def top_k(df, stat, k=10, ascending=False, row_mask=None):
+    """Zeilenpositionen der besten k für eine einzelne Statistik."""
+    return leaders(df, {stat: (stat, ascending, None)}, k, row_mask)[stat]
+
+def league_leaders(wh, categories=LEAGUE_CATEGORIES, k=10, staffel=None, min_games=1):
+    """Ligaweite Ranglisten aus dem Datenbestand (src/warehouse.py) -> {name: DataFrame}."""
+    df = wh["players"]
+    if df.empty: return {name: df.head(0) for name in categories}
+    mask = _numeric(df, "GP") >= min_games
+    if staffel: mask &= (df["STAFFEL"] == staffel).to_numpy()
+    return {name: df.iloc[pos].reset_index(drop=True) for name, pos in leaders(df, categories, k, mask, fallback=False).items()}
+# --- END OF FILE src/leaderboard.py ---
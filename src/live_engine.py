@@ -0,0 +1,181 @@
+# --- START OF FILE src/live_engine.py ---
+# Live-Spiele: ein gemeinsamer Poller pro Spiel-ID statt sleep+rerun pro Zuschauer.
+# Der Poller (Hintergrund-Thread) lädt alle LIVE_POLL_S Sekunden Boxscore und Spieldetails, ermittelt
+# die neuen Aktionen seit der letzten actionNumber und legt einen Schnappschuss mit Versionsnummer ab.
+# Die Live-Seite liest nur diesen Schnappschuss (st.fragment mit run_every) - kein Blockieren, kein
+# doppelter Abruf, egal wie viele Sitzungen zusehen. Ohne Zuschauer stoppt der Poller nach LIVE_IDLE_STOP_S.
+# Spielstand, Teamfouls, Flow und PBP-Tabelle schreibt ein GameEventProcessor (src/game_events.py) pro Poll
+# nur um die neuen Aktionen fort; snapshot() gibt dessen unveränderlichen Stand (EventView) zur selben Version wie box.
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from src.config import API_HEADERS, LIVE_POLL_S, LIVE_IDLE_STOP_S, LIVE_DELTA_PARAM, LIVE_FINISHED_MAX
+from src.routing import routed_get_json
+from src.api import is_game_final
+from src.game_events import GameEventProcessor
+from src import disk_cache
+
+_pollers = {}               # laufende Spiele (mit Thread)
+_finished = OrderedDict()   # beendete Spiele, LRU mit LIVE_FINISHED_MAX Einträgen
+_lock = threading.Lock()
+
+def _action_no(a):
+    try: return int(a.get("actionNumber") or 0)
+    except (TypeError, ValueError): return 0
+
+class GamePoller:
+    def __init__(self, game_id):
+        self.game_id = str(game_id)
+        self.box = None; self.details = None
+        self.version = 0; self.signature = None
+        self.last_action = 0; self.new_actions = []
+        self.updated_at = None; self.error = None
+        self.final = False
+        self.events = GameEventProcessor()
+        self.view = self.events.view()  # Stand zu self.version, nur unter _cond ersetzt
+        self.last_seen = time.time()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._first = threading.Lock()
+        self._attempted = False  # erster Ladeversuch (Disk-Cache + Poll) nur einmal, danach übernimmt der Thread
+        self._stopping = False
+        self._thread = None
+        self._delta_ok = bool(LIVE_DELTA_PARAM)
+
+    # --- Abruf ---
+    def _fetch_box(self, full=False):
+        path = f"/games/{self.game_id}/stats"
+        if self._delta_ok and self.box is not None and not full:
+            delta, _ = routed_get_json("game", self.game_id, f"{path}?{LIVE_DELTA_PARAM}={self.last_action + 1}", endpoint="boxscore", headers=API_HEADERS)
+            if isinstance(delta, dict) and isinstance(delta.get("actions"), list): return delta, True
+            self._delta_ok = False  # Parameter wird nicht unterstützt -> ab jetzt voller Abruf
+        data, _ = routed_get_json("game", self.game_id, path, endpoint="boxscore", headers=API_HEADERS)
+        return data, False
+
+    def _merge(self, data, is_delta):
+        actions = data.get("actions") or []
+        if is_delta:
+            known = {_action_no(a) for a in self.box.get("actions", [])}
+            new = sorted((a for a in actions if _action_no(a) not in known), key=_action_no)
+            return {**data, "actions": self.box.get("actions", []) + new}, new
+        new = sorted((a for a in actions if _action_no(a) > self.last_action), key=_action_no) if self.box is not None else []
+        return data, new
+
+    def poll(self):
+        """Ein Abruf. Gibt True zurück, wenn sich der Stand geändert hat."""
+        try:
+            data, is_delta = self._fetch_box()
+            details, _ = routed_get_json("game", self.game_id, f"/games/{self.game_id}", endpoint="game_details", headers=API_HEADERS)
+        except Exception as e:
+            self.error = str(e); return False
+        if not data or not details:
+            self.error = "Keine Daten"; return False
+        if is_game_final(details):
+            # Der Boxscore kam vor den Details: nach dem Spielende einmal voll nachladen,
+            # sonst würde der Stand kurz vor der Schlusssirene als Endstand gespeichert
+            try: data, is_delta = self._fetch_box(full=True)
+            except Exception as e: self.error = str(e); return False
+            if not data: self.error = "Keine Daten"; return False
+        box, new = self._merge(data, is_delta)
+        actions = box.get("actions") or []
+        last = max((_action_no(a) for a in actions), default=0)
+        sig_src = {k: v for k, v in box.items() if k != "actions"}
+        sig = hashlib.sha1(json.dumps([sig_src, details, len(actions), last], sort_keys=True, default=str).encode()).hexdigest()
+        with self._cond:
+            self.error = None; self.updated_at = time.time()
+            if sig == self.signature: return False
+            self.box, self.details, self.signature = box, details, sig
+            self.new_actions = new; self.last_action = last; self.version += 1
+            self.events.apply(box); self.view = self.events.view()
+            if is_game_final(details):
+                self.final = True
+                disk_cache.put("game_stats", self.game_id, box); disk_cache.put("game_details", self.game_id, details)
+            self._cond.notify_all()
+        return True
+
+    # --- Thread ---
+    def _run(self):
+        # der erste Stand kommt aus subscribe(), daher erst warten
+        while not self._stop.wait(LIVE_POLL_S):
+            # Leerlauf-Prüfung und Abmelden gemeinsam unter _lock, damit kein subscribe() dazwischenrutscht
+            with _lock:
+                if time.time() - self.last_seen > LIVE_IDLE_STOP_S: _retire(self); return
+            self.poll()
+            if self.final: break
+        with _lock: _retire(self)
+
+    def start(self):
+        # Ein Thread, der sich gerade beendet, zählt als gestoppt
+        if self._thread is None or not self._thread.is_alive() or self._stopping:
+            self._stopping = False; self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"live-{self.game_id}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def wait_for_update(self, version, timeout):
+        """Blockiert höchstens timeout Sekunden, bis eine neuere Version als version vorliegt (für Streams/SSE)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > version or self.final, timeout)
+            return self.version
+
+    def snapshot(self):
+        """Boxscore im Format der Live-Ansicht (gameTime/period/result aus den Spieldetails) plus Metadaten."""
+        with self._cond:
+            box = None
+            if self.box and self.details:
+                box = {**self.box, "gameTime": self.details.get("gameTime"), "period": self.details.get("period"), "result": self.details.get("result")}
+            return {"box": box, "version": self.version, "new_actions": list(self.new_actions), "updated_at": self.updated_at,
+                    "final": self.final, "error": self.error, "events": self.view}
+
+def _retire(poller):
+    """Meldet den Poller ab (nur unter _lock). Beendete Spiele wandern in den LRU-Speicher _finished."""
+    poller._stopping = True
+    if _pollers.get(poller.game_id) is poller: del _pollers[poller.game_id]
+    if poller.final and poller.version:
+        _finished[poller.game_id] = poller; _finished.move_to_end(poller.game_id)
+        while len(_finished) > LIVE_FINISHED_MAX: _finished.popitem(last=False)
+
+def subscribe(game_id):
+    """Poller für game_id (wird bei Bedarf gestartet). Jeder Aufruf zählt als 'Zuschauer anwesend'."""
+    gid = str(game_id)
+    with _lock:
+        done = _finished.get(gid)
+        if done is not None:
+            _finished.move_to_end(gid); return done
+        poller = _pollers.get(gid)
+        if poller is None:
+            poller = _pollers[gid] = GamePoller(gid)
+        poller.last_seen = time.time()
+    # Nur der erste Aufrufer lädt (einmal); alle anderen bekommen sofort den aktuellen, ggf. leeren Stand
+    if not poller._attempted and poller._first.acquire(blocking=False):
+        try:
+            if not poller._attempted: _initial_load(poller)
+        finally:
+            poller._attempted = True; poller._first.release()
+    with _lock:
+        if poller.final: _retire(poller)
+        elif _pollers.get(gid) is poller: poller.start()  # abgemeldete Poller nicht wiederbeleben
+    return poller
+
+def _initial_load(poller):
+    stored_box = disk_cache.get("game_stats", poller.game_id); stored_det = disk_cache.get("game_details", poller.game_id)
+    if stored_box is not None and stored_det is not None:
+        # beendetes Spiel aus dem persistenten Cache - kein Poller nötig
+        with poller._cond:
+            poller.box, poller.details, poller.final, poller.version = stored_box, stored_det, True, 1
+            poller.events.apply(stored_box); poller.view = poller.events.view()
+        return
+    poller.poll()  # erster Stand sofort; schlägt er fehl, versucht es der Thread nach LIVE_POLL_S erneut
+
+def get_live_box(game_id):
+    return subscribe(game_id).snapshot()
+
+def active_pollers():
+    with _lock:
+        return {gid: {"version": p.version, "last_action": p.last_action, "updated_at": p.updated_at, "final": p.final}
+                for gid, p in list(_pollers.items()) + list(_finished.items())}
+# --- END OF FILE src/live_engine.py ---
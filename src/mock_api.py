@@ -0,0 +1,442 @@
+# --- START OF FILE src/mock_api.py ---
+# Lokaler Ersatz für die DBBL-API: Lasttests, Benchmarks und Entwicklung ohne Netz und ohne API-Key.
+# Beantwortet dieselben Pfade wie api-s / api-n / api-1 (Teams, Kader, Statistiken, Spielplan, Boxscores,
+# Tabelle, /games/recent, Spieler, Logos, Spielerfotos). Daten kommen aus aufgezeichneten Fixtures
+# (MOCK_API_FIXTURES, siehe MOCK_API_RECORD) oder werden aus TEAMS_DB deterministisch erzeugt: ein
+# Spielplan um das heutige Datum (vergangene, laufende und kommende Spiele) mit simulierten Play-by-Play-Daten.
+# Laufende Spiele schreiten in Echtzeit voran (MOCK_API_LIVE_MINUTES für ein ganzes Spiel).
+#
+# Start:   python -m src.mock_api [--port 8600] [--latency 20-120] [--errors 0.05] [--slow 0.01]
+# App:     SCOUTING_MOCK_API=http://127.0.0.1:8600 streamlit run app.py   (oder MOCK_API_URL in src/config.py)
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from io import BytesIO
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+MOCK_HOST = "https://api-s.dbbl.scb.world"  # Bild-URLs in den Antworten; api_get leitet sie auf den Mock um
+
+FIRST_NAMES = ["Anna", "Lea", "Mia", "Lena", "Sophie", "Marie", "Emma", "Laura", "Julia", "Sarah", "Lisa", "Hannah", "Nele", "Jana", "Clara", "Paula"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Neumann", "Braun", "Krüger"]
+NATIONS = ["Deutschland", "Deutschland", "Deutschland", "USA", "Niederlande", "Österreich", "Litauen", "Kanada"]
+POSITIONS = ["GUARD", "GUARD", "FORWARD", "FORWARD", "CENTER"]
+SQUAD_SIZE = 12
+ACTIONS_PER_PERIOD = 70
+
+# Aktionstyp -> (Gewicht, Punkte, Statistik-Zähler des Spielers)
+EVENTS = {
+    "TWO_POINT_SHOT_MADE": (17, 2, ("twoPointShotsMade", "twoPointShotsAttempted", "fieldGoalsMade", "fieldGoalsAttempted")),
+    "TWO_POINT_SHOT_MISSED": (19, 0, ("twoPointShotsAttempted", "fieldGoalsAttempted")),
+    "THREE_POINT_SHOT_MADE": (6, 3, ("threePointShotsMade", "threePointShotsAttempted", "fieldGoalsMade", "fieldGoalsAttempted")),
+    "THREE_POINT_SHOT_MISSED": (12, 0, ("threePointShotsAttempted", "fieldGoalsAttempted")),
+    "FREE_THROW_MADE": (8, 1, ("freeThrowsMade", "freeThrowsAttempted")),
+    "FREE_THROW_MISSED": (4, 0, ("freeThrowsAttempted",)),
+    "REBOUND_DEFENSIVE": (14, 0, ("defensiveRebounds", "totalRebounds")),
+    "REBOUND_OFFENSIVE": (5, 0, ("offensiveRebounds", "totalRebounds")),
+    "ASSIST": (8, 0, ("assists",)),
+    "TURNOVER": (7, 0, ("turnovers",)),
+    "STEAL": (4, 0, ("steals",)),
+    "BLOCK": (2, 0, ("blocks",)),
+    "FOUL_PERSONAL": (7, 0, ("foulsCommitted",)),
+    "TIMEOUT": (1, 0, ()),
+}
+_EVENT_TYPES = list(EVENTS); _EVENT_WEIGHTS = [EVENTS[t][0] for t in _EVENT_TYPES]
+STAT_FIELDS = ["points", "twoPointShotsMade", "twoPointShotsAttempted", "threePointShotsMade", "threePointShotsAttempted",
+               "fieldGoalsMade", "fieldGoalsAttempted", "freeThrowsMade", "freeThrowsAttempted", "offensiveRebounds",
+               "defensiveRebounds", "totalRebounds", "assists", "turnovers", "steals", "blocks", "foulsCommitted"]
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _game_clock(seconds):
+    return f"PT{seconds // 60}M{seconds % 60}S"
+
+def _elapsed(actions):
+    """Gespielte Sekunden bis zur letzten Aktion (Viertel 10 Min., Verlängerung 5 Min.)."""
+    if not actions: return 0
+    last = actions[-1]; m, _, sec = last["gameTime"][2:-1].partition("M")
+    return sum(600 if p <= 4 else 300 for p in range(1, last["period"])) + int(m) * 60 + int(sec)
+
+def _efficiency(s):
+    return (s["points"] + s["totalRebounds"] + s["assists"] + s["steals"] + s["blocks"] - s["turnovers"]
+            - (s["fieldGoalsAttempted"] - s["fieldGoalsMade"]) - (s["freeThrowsAttempted"] - s["freeThrowsMade"]))
+
+# --- FIXTURES ---
+
+def fixture_name(path_qs):
+    """Dateiname einer Antwort: Pfad mit _ statt /, Query sortiert angehängt (z.B. games_123_stats.json)."""
+    parts = urlsplit(path_qs)
+    name = parts.path.strip("/").replace("/", "_") or "index"
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    if query: name += "__" + urlencode(query)
+    return re.sub(r"[^A-Za-z0-9_.=&%-]", "_", name) + ".json"
+
+def record(directory, url, data):
+    """Speichert eine echte API-Antwort als Fixture (aufgerufen von src/http_client.py bei MOCK_API_RECORD)."""
+    parts = urlsplit(url)
+    path = os.path.join(directory, fixture_name(parts.path + ("?" + parts.query if parts.query else "")))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+# --- SYNTHETISCHE LIGA ---
+
+class League:
+    def __init__(self, teams, season_id, seed=1, live_games=2, live_minutes=20):
+        self.teams = {int(tid): info for tid, info in teams.items()}
+        self.season_id = str(season_id)
+        self.seed = seed
+        self.started = time.time()
+        self.live_s = max(60, live_minutes * 60)
+        self.games = {}
+        self._build_schedule(live_games)
+
+    # Kader
+    def squad(self, team_id):
+        rng = random.Random(f"{self.seed}:squad:{team_id}")
+        out = []
+        for i in range(SQUAD_SIZE):
+            out.append({"id": team_id * 100 + i, "firstName": rng.choice(FIRST_NAMES), "lastName": rng.choice(LAST_NAMES),
+                        "shirtNumber": 4 + i, "position": rng.choice(POSITIONS), "nation": rng.choice(NATIONS),
+                        "birthDate": f"{rng.randint(1990, 2007)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                        "height": round(rng.uniform(1.62, 1.95), 2), "weight": rng.uniform(0.5, 1.5)})
+        return out
+
+    def player(self, player_id):
+        team_id, idx = divmod(int(player_id), 100)
+        if team_id not in self.teams or idx >= SQUAD_SIZE: return None
+        return team_id, self.squad(team_id)[idx]
+
+    # Spielplan: doppelte Runde pro Staffel, wöchentlich, heute liegt in der Saisonmitte
+    def _build_schedule(self, live_games):
+        today = datetime.now(timezone.utc).replace(hour=17, minute=0, second=0, microsecond=0)
+        gid = 10000
+        for staffel in sorted({info.get("staffel", "-") for info in self.teams.values()}):
+            ids = sorted(t for t, info in self.teams.items() if info.get("staffel", "-") == staffel)
+            if len(ids) % 2: ids.append(None)
+            n = len(ids); rounds = []
+            for r in range(n - 1):
+                pairs = [(ids[i], ids[n - 1 - i]) for i in range(n // 2)]
+                rounds.append([(a, b) if r % 2 else (b, a) for a, b in pairs])
+                ids = [ids[0], ids[-1]] + ids[1:-1]
+            rounds += [[(b, a) for a, b in rnd] for rnd in rounds]
+            start = today - timedelta(days=7 * (len(rounds) // 2))
+            for r, rnd in enumerate(rounds):
+                for home, guest in rnd:
+                    if home is None or guest is None: continue
+                    gid += 1
+                    self.games[gid] = {"id": gid, "home": home, "guest": guest, "time": start + timedelta(days=7 * r), "staffel": staffel}
+        now = datetime.now(timezone.utc)
+        upcoming = sorted((g for g in self.games.values() if g["time"] > now), key=lambda g: (g["time"], g["id"]))
+        for g in upcoming[:live_games]:
+            g["time"] = now - timedelta(minutes=5); g["live"] = True
+
+    def status(self, game):
+        if game.get("live"):
+            return "ENDED" if time.time() - self.started >= self.live_s else "RUNNING"
+        return "ENDED" if game["time"] + timedelta(hours=2) < datetime.now(timezone.utc) else "SCHEDULED"
+
+    @lru_cache(maxsize=1024)
+    def _simulate(self, game_id):
+        """Alle Aktionen eines Spiels (4 Viertel, bei Gleichstand Verlängerung)."""
+        g = self.games[game_id]
+        rng = random.Random(f"{self.seed}:game:{game_id}")
+        rosters = {side: self.squad(g[side])[:10] for side in ("home", "guest")}
+        actions = []; score = {"home": 0, "guest": 0}; period = 0
+        while period < 4 or score["home"] == score["guest"]:
+            period += 1
+            length = 600 if period <= 4 else 300
+            t = 0
+            for _ in range(ACTIONS_PER_PERIOD if period <= 4 else ACTIONS_PER_PERIOD // 2):
+                t = min(length, t + rng.randint(2, 16))
+                side = rng.choice(("home", "guest"))
+                a_type = rng.choices(_EVENT_TYPES, _EVENT_WEIGHTS)[0]
+                pts = EVENTS[a_type][1]
+                score[side] += pts
+                p = rng.choice(rosters[side][:5] if rng.random() < 0.7 else rosters[side])
+                a = {"actionNumber": len(actions) + 1, "type": a_type, "period": period, "gameTime": _game_clock(t),
+                     "seasonTeamId": g[side], "seasonPlayerId": p["id"], "homeTeamPoints": score["home"], "guestTeamPoints": score["guest"]}
+                if a_type == "TIMEOUT": a.pop("seasonPlayerId")
+                if pts: a["points"] = pts
+                actions.append(a)
+        return actions
+
+    def actions(self, game_id):
+        """Bisher gespielte Aktionen (laufende Spiele anteilig nach Echtzeit, geplante keine)."""
+        g = self.games[game_id]
+        status = self.status(g)
+        if status == "SCHEDULED": return []
+        actions = self._simulate(game_id)
+        if status == "RUNNING":
+            frac = (time.time() - self.started) / self.live_s
+            actions = actions[:max(1, int(len(actions) * frac))]
+        return actions
+
+    def score(self, game_id):
+        acts = self.actions(game_id)
+        if not acts: return None, None, 0
+        return acts[-1]["homeTeamPoints"], acts[-1]["guestTeamPoints"], acts[-1]["period"]
+
+    def _team_ref(self, team_id):
+        name = self.teams[team_id].get("name", str(team_id))
+        return {"teamId": team_id, "seasonTeamId": team_id, "id": team_id, "name": name, "nameFull": name,
+                "logoUrl": f"{MOCK_HOST}/images/teams/logo/{self.season_id}/{team_id}"}
+
+    def _result(self, game_id):
+        h, g, period = self.score(game_id)
+        if h is None: return None
+        rng = random.Random(f"{self.seed}:spectators:{game_id}")
+        return {"homeTeamFinalScore": h, "guestTeamFinalScore": g, "period": period, "spectators": rng.randint(80, 900)}
+
+    def game_item(self, game_id):
+        """Spielplan-Eintrag; ein Ergebnis gibt es erst nach Spielende (sonst würde es als fertig gecacht)."""
+        g = self.games[game_id]
+        status = self.status(g)
+        return {"id": game_id, "scheduledTime": _iso(g["time"]), "status": status, "seasonId": self.season_id,
+                "homeTeam": self._team_ref(g["home"]), "guestTeam": self._team_ref(g["guest"]),
+                "result": self._result(game_id) if status == "ENDED" else None}
+
+    def game_details(self, game_id):
+        item = self.game_item(game_id)
+        item["result"] = self._result(game_id)  # laufende Spiele: aktueller Stand
+        acts = self.actions(game_id)
+        home = self.teams[self.games[game_id]["home"]].get("name", "")
+        item.update(venue={"name": f"Sporthalle {home}", "address": f"Hallenweg 1, {home.split(' ')[-1]}"},
+                    period=acts[-1]["period"] if acts else None, gameTime=acts[-1]["gameTime"] if acts else None,
+                    referee1={"lastName": "Schulz"}, referee2={"lastName": "Lange"}, referee3=None)
+        if item["result"] is None: item["result"] = {}
+        return item
+
+    def _team_box(self, team_id, actions):
+        rng = random.Random(f"{self.seed}:box:{team_id}:{len(actions)}")
+        squad = self.squad(team_id)
+        stats = {p["id"]: dict.fromkeys(STAT_FIELDS, 0) for p in squad}
+        for a in actions:
+            if a.get("seasonTeamId") != team_id or "seasonPlayerId" not in a: continue
+            s = stats[a["seasonPlayerId"]]
+            s["points"] += a.get("points", 0)
+            for key in EVENTS[a["type"]][2]: s[key] += 1
+        players = []; total = dict.fromkeys(STAT_FIELDS, 0)
+        for i, p in enumerate(squad[:10]):
+            s = stats[p["id"]]
+            for k in STAT_FIELDS: total[k] += s[k]
+            sec = int(_elapsed(actions) * (0.75 if i < 5 else 0.25) * rng.uniform(0.85, 1.15))
+            players.append({"seasonPlayer": {"id": p["id"], "firstName": p["firstName"], "lastName": p["lastName"], "shirtNumber": p["shirtNumber"], "position": p["position"]},
+                            "seasonPlayerId": p["id"], **s, "secondsPlayed": sec, "efficiency": _efficiency(s), "plusMinus": rng.randint(-12, 12),
+                            "isStartingFive": i < 5, "onCourt": i < 5})
+        name = self.teams[team_id].get("name", str(team_id))
+        total["efficiency"] = _efficiency(total)
+        return {"seasonTeamId": team_id, "teamId": team_id, "name": name, "seasonTeam": {"id": team_id, "name": name},
+                "headCoachName": f"Coach {LAST_NAMES[team_id % len(LAST_NAMES)]}", "gameStat": {**total, "seasonTeam": {"name": name}},
+                "playerStats": players}
+
+    def boxscore(self, game_id, from_action=None):
+        g = self.games[game_id]
+        acts = self.actions(game_id)
+        box = {"id": game_id, "homeTeam": self._team_box(g["home"], acts), "guestTeam": self._team_box(g["guest"], acts), "actions": acts}
+        if from_action is not None: box["actions"] = [a for a in acts if a["actionNumber"] >= from_action]
+        return box
+
+    def team_games(self, team_id):
+        return [self.game_item(gid) for gid, g in sorted(self.games.items()) if team_id in (g["home"], g["guest"])]
+
+    @lru_cache(maxsize=256)
+    def _season_totals(self, team_id, ended_key):
+        per_player = {}; team = dict.fromkeys(STAT_FIELDS, 0); games = 0
+        for gid in ended_key:
+            box = self.boxscore(gid)
+            side = "homeTeam" if self.games[gid]["home"] == team_id else "guestTeam"
+            games += 1
+            for k in STAT_FIELDS: team[k] += box[side]["gameStat"][k]
+            for p in box[side]["playerStats"]:
+                acc = per_player.setdefault(p["seasonPlayer"]["id"], {**dict.fromkeys(STAT_FIELDS, 0), "gamesPlayed": 0, "secondsPlayed": 0})
+                acc["gamesPlayed"] += 1; acc["secondsPlayed"] += p["secondsPlayed"]
+                for k in STAT_FIELDS: acc[k] += p[k]
+        return games, team, per_player
+
+    def season_totals(self, team_id):
+        ended = tuple(gid for gid, g in sorted(self.games.items()) if team_id in (g["home"], g["guest"]) and self.status(g) == "ENDED")
+        return self._season_totals(team_id, ended)
+
+    def team_season_stats(self, team_id):
+        games, team, _ = self.season_totals(team_id)
+        return [{"teamId": team_id, "seasonTeamId": team_id, "seasonTeam": {"id": team_id, "name": self.teams[team_id].get("name")}, "gamesPlayed": games, **team}]
+
+    def player_stats(self, team_id):
+        _, _, per_player = self.season_totals(team_id)
+        rows = []
+        for p in self.squad(team_id):
+            s = per_player.get(p["id"], {**dict.fromkeys(STAT_FIELDS, 0), "gamesPlayed": 0, "secondsPlayed": 0})
+            gp = max(s["gamesPlayed"], 1)
+            row = {"seasonPlayer": {"id": p["id"], "firstName": p["firstName"], "lastName": p["lastName"], "shirtNumber": p["shirtNumber"], "position": p["position"]},
+                   "seasonTeamId": team_id, **s}
+            for k in STAT_FIELDS: row[k + "PerGame"] = round(s[k] / gp, 1)
+            rows.append(row)
+        return rows
+
+    def team_details(self, team_id):
+        return {"id": team_id, "name": self.teams[team_id].get("name"),
+                "squad": [{"id": p["id"], "person": {"id": p["id"], "firstName": p["firstName"], "lastName": p["lastName"], "birthDate": p["birthDate"],
+                                                     "height": p["height"], "nationalities": [{"name": p["nation"]}]}} for p in self.squad(team_id)]}
+
+    def season_player(self, player_id):
+        found = self.player(player_id)
+        if not found: return None
+        _, p = found
+        return {"id": p["id"], "imageUrl": f"{MOCK_HOST}/images/players/{p['id']}.jpg", "position": p["position"], "height": p["height"],
+                "birthDate": p["birthDate"], "person": {"id": p["id"], "firstName": p["firstName"], "lastName": p["lastName"], "nationalities": [{"name": p["nation"]}]}}
+
+    def standings(self, group=None):
+        staffel = {"SOUTH": "Süd", "NORTH": "Nord"}.get(group)
+        table = {}
+        for gid, g in self.games.items():
+            if staffel and g["staffel"] != staffel: continue
+            for tid in (g["home"], g["guest"]): table.setdefault(tid, {"totalGames": 0, "totalVictories": 0, "totalLosses": 0, "pointsDifference": 0})
+            if self.status(g) != "ENDED": continue
+            h, s, _ = self.score(gid)
+            for tid, own, opp in ((g["home"], h, s), (g["guest"], s, h)):
+                row = table[tid]; row["totalGames"] += 1; row["pointsDifference"] += own - opp
+                row["totalVictories" if own > opp else "totalLosses"] += 1
+        ranked = sorted(table.items(), key=lambda kv: (-kv[1]["totalVictories"], -kv[1]["pointsDifference"], kv[0]))
+        return [{"rank": i + 1, "seasonTeam": {"id": tid, "teamId": tid, "name": self.teams[tid].get("name")}, **row} for i, (tid, row) in enumerate(ranked)]
+
+    def recent(self):
+        out = {"past": [], "present": [], "future": []}
+        for gid in sorted(self.games):
+            status = self.status(self.games[gid])
+            out["past" if status == "ENDED" else ("present" if status == "RUNNING" else "future")].append(self.game_item(gid))
+        return out
+
+# --- BILDER ---
+
+@lru_cache(maxsize=512)
+def _image(kind, key, seed):
+    """Logo (PNG) bzw. Spielerfoto (JPEG): Farbverlauf mit Kreis, pro Team/Spieler eigene Farben."""
+    from PIL import Image, ImageDraw
+    rng = random.Random(f"{seed}:{kind}:{key}")
+    w, h = (200, 200) if kind == "logo" else (150, 200)
+    color = (rng.randint(0, 200), rng.randint(0, 200), rng.randint(0, 200))
+    img = Image.merge("RGB", [Image.linear_gradient("L").resize((w, h)).point(lambda v, c=c: c + v * (255 - c) // 255) for c in color])
+    ImageDraw.Draw(img).ellipse((w // 4, h // 4, 3 * w // 4, 3 * h // 4), fill=tuple(255 - c for c in color), outline=(255, 255, 255), width=4)
+    buf = BytesIO()
+    if kind == "logo": img.save(buf, format="PNG"); return buf.getvalue(), "image/png"
+    img.save(buf, format="JPEG", quality=85); return buf.getvalue(), "image/jpeg"
+
+# --- SERVER ---
+
+_ROUTES = [
+    (re.compile(r"^/teams/(\d+)/(\w+)/statistics/season$"), lambda L, m, q: L.team_season_stats(int(m[1]))),
+    (re.compile(r"^/teams/(\d+)/(\w+)/player-stats$"), lambda L, m, q: L.player_stats(int(m[1]))),
+    (re.compile(r"^/teams/(\d+)/(\w+)$"), lambda L, m, q: L.team_details(int(m[1]))),
+    (re.compile(r"^/teams/(\d+)$"), lambda L, m, q: {"id": int(m[1]), "venues": [{"isMain": True, "name": f"Sporthalle {L.teams[int(m[1])].get('name')}", "address": "Hallenweg 1"}]}),
+    (re.compile(r"^/games/recent$"), lambda L, m, q: L.recent()),
+    (re.compile(r"^/games/(\d+)/stats$"), lambda L, m, q: L.boxscore(int(m[1]), next((int(v) for k, v in q.items() if k.lower().startswith("from")), None))),
+    (re.compile(r"^/games/(\d+)$"), lambda L, m, q: L.game_details(int(m[1]))),
+    (re.compile(r"^/games$"), lambda L, m, q: {"items": L.team_games(int(q.get("seasonTeamId", 0)))}),
+    (re.compile(r"^/standings$"), lambda L, m, q: L.standings(q.get("group"))),
+    (re.compile(r"^/season-players/(\d+)$"), lambda L, m, q: L.season_player(int(m[1]))),
+]
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "DBBLMock/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-Alive wie bei der echten API
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv = self.server
+        with srv.stats_lock: srv.stats["requests"] += 1
+        lo, hi = srv.latency_ms
+        time.sleep(random.uniform(lo, hi) / 1000)
+        if random.random() < srv.slow_rate:
+            with srv.stats_lock: srv.stats["slow"] += 1
+            time.sleep(srv.slow_s)
+        if random.random() < srv.error_rate:
+            with srv.stats_lock: srv.stats["errors"] += 1
+            return self._send(503, b"injected error", "text/plain")
+
+        parts = urlsplit(self.path)
+        if parts.path == "/_mock/stats":
+            return self._send(200, json.dumps(srv.stats).encode(), "application/json")
+        m = re.match(r"^/images/teams/logo/\w+/(\d+)$", parts.path) or re.match(r"^/teams/(\d+)/\w+/logo$", parts.path)
+        if m and int(m[1]) in srv.league.teams: return self._send(200, *_image("logo", int(m[1]), srv.league.seed))
+        m = re.match(r"^/images/players/(\d+)\.jpg$", parts.path)
+        if m and srv.league.player(m[1]): return self._send(200, *_image("player", int(m[1]), srv.league.seed))
+
+        if srv.fixtures:
+            path = os.path.join(srv.fixtures, fixture_name(self.path))
+            if os.path.exists(path):
+                with srv.stats_lock: srv.stats["fixtures"] += 1
+                with open(path, "rb") as f: return self._send(200, f.read(), "application/json")
+
+        query = dict(parse_qsl(parts.query))
+        for pattern, handler in _ROUTES:
+            m = pattern.match(parts.path)
+            if not m: continue
+            try: data = handler(srv.league, m, query)
+            except (KeyError, ValueError): data = None
+            if data is None: break
+            return self._send(200, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json")
+        self._send(404, b'{"message": "Not Found"}', "application/json")
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose: super().log_message(fmt, *args)
+
+def serve(host="127.0.0.1", port=None, latency_ms=None, error_rate=None, slow_rate=None, slow_s=None,
+          fixtures=None, seed=1, live_games=None, live_minutes=None, verbose=False):
+    """Startet nicht, sondern gibt den Server zurück (serve_forever() selbst aufrufen, z.B. in einem Thread)."""
+    from src.config import (TEAMS_DB, SEASON_ID, MOCK_API_PORT, MOCK_API_LATENCY_MS, MOCK_API_ERROR_RATE, MOCK_API_SLOW_RATE,
+                            MOCK_API_SLOW_S, MOCK_API_FIXTURES, MOCK_API_LIVE_GAMES, MOCK_API_LIVE_MINUTES)
+    httpd = ThreadingHTTPServer((host, MOCK_API_PORT if port is None else port), MockHandler)
+    httpd.daemon_threads = True
+    httpd.league = League(TEAMS_DB, SEASON_ID, seed, MOCK_API_LIVE_GAMES if live_games is None else live_games,
+                          MOCK_API_LIVE_MINUTES if live_minutes is None else live_minutes)
+    httpd.latency_ms = MOCK_API_LATENCY_MS if latency_ms is None else latency_ms
+    httpd.error_rate = MOCK_API_ERROR_RATE if error_rate is None else error_rate
+    httpd.slow_rate = MOCK_API_SLOW_RATE if slow_rate is None else slow_rate
+    httpd.slow_s = MOCK_API_SLOW_S if slow_s is None else slow_s
+    httpd.fixtures = MOCK_API_FIXTURES if fixtures is None else fixtures
+    httpd.verbose = verbose
+    httpd.stats = {"requests": 0, "errors": 0, "slow": 0, "fixtures": 0}; httpd.stats_lock = threading.Lock()
+    return httpd
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.mock_api", description="Lokaler Ersatz für die DBBL-API.")
+    parser.add_argument("--host", default="127.0.0.1"); parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--latency", default=None, help="Antwortzeit in ms, z.B. 20-120 oder 0")
+    parser.add_argument("--errors", type=float, default=None, help="Anteil Antworten mit 503 (0..1)")
+    parser.add_argument("--slow", type=float, default=None, help="Anteil Antworten mit zusätzlicher Verzögerung (MOCK_API_SLOW_S)")
+    parser.add_argument("--fixtures", default=None, help="Ordner mit aufgezeichneten Antworten (Vorrang vor den erzeugten Daten)")
+    parser.add_argument("--seed", type=int, default=1); parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    latency = None
+    if args.latency is not None:
+        lo, _, hi = args.latency.partition("-"); latency = (float(lo), float(hi or lo))
+    # Der Mock braucht keinen API-Key: src/config.py akzeptiert dann einen fehlenden Schlüssel
+    os.environ.setdefault("SCOUTING_MOCK_API", f"http://{args.host}:{args.port or 8600}")
+    httpd = serve(args.host, args.port, latency, args.errors, args.slow, fixtures=args.fixtures, seed=args.seed, verbose=args.verbose)
+    lg = httpd.league
+    running = sum(1 for g in lg.games.values() if lg.status(g) == "RUNNING")
+    print(f"DBBL-Mock auf http://{args.host}:{httpd.server_address[1]}  ({len(lg.teams)} Teams, {len(lg.games)} Spiele, {running} live)")
+    print(f"App starten mit: SCOUTING_MOCK_API=http://{args.host}:{httpd.server_address[1]} streamlit run app.py")
+    try: httpd.serve_forever()
+    except KeyboardInterrupt: pass
+    finally: httpd.server_close()
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE src/mock_api.py ---
@@ -0,0 +1,136 @@
+# --- START OF FILE src/obs_server.py ---
+# Schlanker HTTP-Server für die OBS-Browserquellen. Liefert dieselben Overlays wie app.py (?view=obs_...),
+# aber als fertige HTML-Seite ohne Streamlit-Lauf: kein Websocket, kein Skriptdurchlauf, kein altair/pdfkit
+# und kein CSS zum Verstecken der Streamlit-Oberfläche. Das HTML kommt aus overlays.overlay(): pro URL gespeichert
+# und nur bei geänderten Daten neu gebaut. Die ETag ist die Datenversion, unveränderte Overlays kosten ein 304.
+#
+# Start (im Projektordner, damit .streamlit/secrets.toml gefunden wird):
+#   python -m src.obs_server [--host 0.0.0.0] [--port 8502]
+# URLs (Parameter wie in der App):
+#   /obs/starting5?ids=..&name=..   /obs/standings?region=Süd   /obs/comparison?hid=..&gid=..
+#   /obs/potg?game_id=..            /obs/final_banner?game_id=..   /obs/scoreboard?game_id=..
+#   /?view=obs_standings&region=Süd (bisherige App-Links, nur Host/Port ändern)
+#   /obs/<name>.json -> {"view", "html", "version", "generated_at"};  &refresh=30 -> Seite lädt sich alle 30s neu
+#   /obs/scoreboard/events?game_id=.. -> Server-Sent Events mit Spielstand, Uhr und Teamfouls (nutzt die Seite selbst)
+#   /healthz -> Cache-Statistik;  /metrics -> Laufzeitmessung im Prometheus-Format (src/tracing.py)
+#   /cache -> API-Caches dieses Prozesses als JSON (src/cache_registry.py)
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, quote
+from src.config import OBS_SERVER_HOST, OBS_SERVER_PORT, OBS_SSE_KEEPALIVE_S
+from src.overlays import OVERLAYS, overlay, overlay_stats, scoreboard_state
+from src.templates import render
+from src.tracing import metrics_text
+from src.cache_registry import report as cache_report
+
+_errors = {"count": 0}
+
+def _parse(path):
+    """URL -> (view, params, as_json) oder (None, ...) für unbekannte Pfade."""
+    parts = urlsplit(path)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    route = parts.path.rstrip("/")
+    as_json = route.endswith(".json")
+    if as_json: route = route[:-5]
+    if route in ("", "/index.html"): view = params.pop("view", None)
+    elif route.startswith("/obs/"): view = "obs_" + route[5:]
+    else: view = None
+    return (view if view in OVERLAYS else None), params, as_json
+
+class OverlayHandler(BaseHTTPRequestHandler):
+    server_version = "ScoutingOBS/1.0"
+
+    def _send(self, status, body, content_type, extra=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (extra or {}).items(): self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD": self.wfile.write(data)
+
+    def _stream_scoreboard(self, game_id):
+        """Schickt den Anzeigestand bei jeder neuen Version des Live-Pollers, bis das Spiel beendet ist
+        oder OBS die Verbindung schließt. Solange die Quelle offen ist, läuft der Poller weiter."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        version = None
+        try:
+            self.wfile.write(b"retry: 3000\n\n"); self.wfile.flush()
+            while True:
+                poller, state = scoreboard_state(game_id)
+                if state and state["version"] != version:
+                    version = state["version"]
+                    self.wfile.write(f"data: {json.dumps(state)}\n\n".encode("utf-8"))
+                    if state["final"]: break
+                elif state is None and poller.final: break
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+                poller.wait_for_update(poller.version if version is None else version, OBS_SSE_KEEPALIVE_S)
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError): pass
+
+    def do_GET(self):
+        route = urlsplit(self.path).path
+        if route == "/healthz":
+            return self._send(200, json.dumps({"ok": True, "errors": _errors["count"], **overlay_stats()}), "application/json")
+        if route == "/cache":
+            return self._send(200, json.dumps(cache_report()), "application/json")
+        if route == "/metrics":
+            return self._send(200, metrics_text(), "text/plain; version=0.0.4")
+        if route.rstrip("/") == "/obs/scoreboard/events":
+            game_id = dict(parse_qsl(urlsplit(self.path).query)).get("game_id")
+            if not game_id: return self._send(400, "game_id fehlt", "text/plain")
+            return self._stream_scoreboard(game_id)
+        view, params, as_json = _parse(self.path)
+        if view is None: return self._send(404, "Unbekanntes Overlay", "text/plain")
+        refresh = params.pop("refresh", None)
+        try: entry = overlay(view, params)
+        except Exception as e:
+            _errors["count"] += 1
+            return self._send(502, f"Fehler: {e}", "text/plain")
+
+        html = entry["value"] or ""
+        etag = f'"{entry["version"][:16]}.{int(entry["built_at"])}{".j" if as_json else ""}{"." + refresh if refresh else ""}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Access-Control-Allow-Origin": "*"}
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            for k, v in headers.items(): self.send_header(k, v)
+            return self.end_headers()
+        if as_json:
+            return self._send(200, json.dumps({"view": view, "html": html, "version": entry["version"], "generated_at": entry["built_at"]}), "application/json", headers)
+        meta = render("obs_refresh", seconds=int(refresh)) if refresh and refresh.isdigit() else ""
+        if view == "obs_scoreboard" and params.get("game_id"):
+            html += render("obs_scoreboard_script", events_url=f"/obs/scoreboard/events?game_id={quote(params['game_id'])}")
+        self._send(200, render("obs_page", refresh=meta, title=view, body=html), "text/html", headers)
+
+    do_HEAD = do_GET
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose: super().log_message(fmt, *args)
+
+def serve(host=OBS_SERVER_HOST, port=OBS_SERVER_PORT, verbose=False):
+    httpd = ThreadingHTTPServer((host, port), OverlayHandler)
+    httpd.daemon_threads = True; httpd.verbose = verbose
+    return httpd
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.obs_server", description="OBS-Overlays ohne Streamlit ausliefern.")
+    parser.add_argument("--host", default=OBS_SERVER_HOST); parser.add_argument("--port", type=int, default=OBS_SERVER_PORT)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Jede Anfrage protokollieren")
+    args = parser.parse_args(argv)
+    httpd = serve(args.host, args.port, args.verbose)
+    print(f"OBS-Overlays unter http://{args.host}:{args.port}/obs/<starting5|standings|comparison|potg|final_banner>")
+    try: httpd.serve_forever()
+    except KeyboardInterrupt: pass
+    finally: httpd.server_close()
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE src/obs_server.py ---
@@ -0,0 +1,229 @@
+# --- START OF FILE src/overlays.py ---
+# OBS-Overlays ohne Streamlit-Oberfläche: HTML-Bausteine, load/build pro Overlay und der Speicher mit dem fertigen HTML.
+# Genutzt von src/stream_ui.py (App, ?view=obs_...) und src/obs_server.py; dieses Modul importiert kein streamlit.
+from src.api import (
+    get_player_metadata_cached, 
+    fetch_game_boxscore, 
+    fetch_game_details,
+    get_best_team_logo, 
+    fetch_league_standings, 
+    fetch_team_data
+)
+from src.config import SEASON_ID, OBS_RECHECK_S, OBS_CACHE_MAX
+from src.utils import image_variant_uri
+from src.data_version import VersionedMemo
+from src.game_events import live_score_state
+from src import live_engine
+from src.templates import render, render_each
+
+# --- HTML-BAUSTEINE (reine Funktionen, Vorlagen in src/templates.py) ---
+DBBL_LOGO = "https://toyota-dbbl.de/app/themes/dbbl/src/assets/toyota-DBBL-logo.svg"
+
+COMPARISON_METRICS = [
+    ("Points Per Game", "ppg"), ("Field Goal %", "fgpct"), ("3-Point %", "3pct"),
+    ("Free Throw %", "ftpct"), ("Rebounds (Total)", "tot"), ("Defensive Rebs", "dr"),
+    ("Offensive Rebs", "or"), ("Assists", "as"), ("Turnovers", "to"),
+    ("Steals", "st"), ("Blocks", "bs"), ("Fouls", "pf")
+]
+
+def build_starting5_html(team_name, coach_name, logo_url, players):
+    """players: [{"img", "name", "nr"}] in Aufstellungsreihenfolge."""
+    tiles = []
+    for p in players:
+        parts = p["name"].split(" ")
+        tiles.append({"img": p["img"], "nr": p["nr"], "name": f"{parts[0][0]}. {parts[-1]}" if len(parts) > 1 else p["name"]})
+    logo = render("obs_starting5_logo", url=logo_url) if logo_url else ""
+    return render("obs_starting5", logo=logo, team_name=team_name, coach_name=coach_name, players=render_each("obs_starting5_player", tiles))
+
+def build_standings_html(df, region):
+    rows = []
+    for row in df.to_dict("records"):
+        platz = row.get('Platz', 0)
+        try: rank_val = int(platz)
+        except: rank_val = 99
+        rows.append({"platz": platz, "team": row.get('Team', 'Unknown'), "sp": row.get('Sp', 0), "s": row.get('S', 0), "n": row.get('N', 0), "diff": row.get('Diff', '0'),
+                     "bg": "#e8f5e9" if rank_val <= 4 else ("#f8f9fa" if rank_val <= 8 else "#fce8e6"),
+                     "border": "#28a745" if rank_val <= 4 else ("#6c757d" if rank_val <= 8 else "#dc3545"),
+                     "diff_color": "#28a745" if str(row.get('Diff', '0')).startswith("+") else "#dc3545"})
+    return render("obs_standings", title=f"2. Damen Basketball Bundesliga {region.capitalize()}", logo=DBBL_LOGO, rows=render_each("obs_standings_row", rows))
+
+def build_comparison_html(hname, gname, ts_h, ts_g):
+    rows = []
+    for label, key in COMPARISON_METRICS:
+        try:
+            v_h = float(ts_h.get(key, 0))
+            v_g = float(ts_g.get(key, 0))
+        except:
+            v_h = 0.0; v_g = 0.0
+
+        is_negative_stat = key in ["to", "pf"]
+        h_win = (v_h < v_g) if is_negative_stat else (v_h > v_g)
+        g_win = (v_g < v_h) if is_negative_stat else (v_g > v_h)
+        
+        # Style Definitionen
+        # 1. Einheitliche Schriftgröße (28px) damit nichts springt
+        # 2. background:#ffffff für weiße Balken
+        # 3. Farbe: Helles Grün (#28a745) statt Dunkelgrün
+        base_style = "font-size:28px; padding:10px; background:#ffffff;"
+        
+        # Wenn Gewinner: Helles Grün (#28a745) + Extra Fett (900)
+        # Wenn Verlierer: Schwarz (#000) + Fett (800)
+        s_h = f"{base_style} color:#28a745; font-weight:900;" if h_win else f"{base_style} color:#000; font-weight:800;"
+        s_g = f"{base_style} color:#28a745; font-weight:900;" if g_win else f"{base_style} color:#000; font-weight:800;"
+        
+        if "pct" in key:
+            f_h = f"{v_h:.1f}%"; f_g = f"{v_g:.1f}%"
+        else:
+            f_h = f"{v_h:.1f}"; f_g = f"{v_g:.1f}"
+        rows.append({"s_h": s_h, "f_h": f_h, "label": label, "s_g": s_g, "f_g": f_g})
+    return render("obs_comparison", hname=hname, gname=gname, rows=render_each("obs_comparison_row", rows))
+
+def build_potg_html(mvp, img):
+    # DESIGN UPDATE: Goldener Hintergrund, Schwarzer Rand, Schwarze Schrift; Stats-Box weiß für Kontrast
+    return render("obs_potg", img=img, name=mvp['name'], nr=mvp['nr'], min=mvp['min'], pts=mvp['pts'], reb=mvp['reb'], eff=f"{mvp['eff']:.0f}")
+
+def build_final_banner_html(h_name, g_name, h_logo, g_logo, sh, sg):
+    def get_fs(name):
+        l = len(str(name))
+        return "22px" if l > 28 else ("28px" if l > 20 else "38px")
+    def logo(url): return render("obs_final_logo", url=url) if url else "<div></div>"
+    return render("obs_final_banner", h_fs=get_fs(h_name), h_name=h_name, g_fs=get_fs(g_name), g_name=g_name,
+                  h_logo=logo(h_logo), g_logo=logo(g_logo), sh=sh, sg=sg)
+
+def foul_dots_html(count):
+    return render_each("obs_scoreboard_dot", [{"cls": "on" if i < count else ""} for i in range(5)])
+
+def build_scoreboard_html(state, h_logo, g_logo):
+    def logo(url): return render("obs_scoreboard_logo", url=url) if url else ""
+    return render("obs_scoreboard", state, h_logo=logo(h_logo), g_logo=logo(g_logo),
+                  h_dots=foul_dots_html(state["h_fouls"]), g_dots=foul_dots_html(state["g_fouls"]))
+
+def scoreboard_state(game_id):
+    """(poller, stand) aus dem gemeinsamen Live-Poller (src/live_engine.py); stand ist None, solange keine Daten da sind."""
+    poller = live_engine.subscribe(game_id)
+    snap = poller.snapshot()
+    if not snap["box"]: return poller, None
+    state = live_score_state(snap["box"], snap["events"])
+    state.update(final=snap["final"], version=snap["version"])
+    return poller, state
+
+# --- OVERLAYS AUS URL-PARAMETERN ---
+# Jedes Overlay besteht aus load(params) -> Eingangsdaten (aus den API-Caches) und build(params, daten) -> HTML
+# oder None, wenn nichts anzuzeigen ist. overlay() hält das fertige HTML pro Parametersatz und baut es nur neu,
+# wenn sich die Daten geändert haben (src/data_version.py); geprüft wird höchstens alle OBS_RECHECK_S Sekunden.
+# params: st.query_params oder ein dict (src/obs_server.py).
+
+def _load_starting5(params):
+    logo_id = params.get("logo_id", "")
+    ids = [x for x in params.get("ids", "").split(",") if x]
+    return {"logo_url": get_best_team_logo(logo_id) if logo_id else "",
+            "imgs": [[pid, get_player_metadata_cached(pid).get("img")] for pid in ids]}
+
+def _build_starting5(params, data):
+    if not data["imgs"]: return None
+    players = []
+    for pid, url in data["imgs"]:
+        img = image_variant_uri(url, "obs", "https://via.placeholder.com/150")
+        players.append({"img": img, "name": params.get(f"n_{pid}", "Player"), "nr": params.get(f"nr_{pid}", "#")})
+    return build_starting5_html(params.get("name", "TEAM"), params.get("coach", ""), data["logo_url"], players)
+
+def _load_standings(params):
+    return fetch_league_standings(params.get("season", SEASON_ID), params.get("region", "Süd"))
+
+def _build_standings(params, df):
+    return build_standings_html(df, params.get("region", "Süd")) if not df.empty else None
+
+def _load_comparison(params):
+    hid = params.get("hid"); gid = params.get("gid")
+    if not hid or not gid: return None
+    season = params.get("season", SEASON_ID)
+    return {"h": fetch_team_data(hid, season)[1], "g": fetch_team_data(gid, season)[1]}
+
+def _build_comparison(params, data):
+    if data is None: return None
+    return build_comparison_html(params.get("hname", "Team A"), params.get("gname", "Team B"), data["h"], data["g"])
+
+def _load_potg(params):
+    gid = params.get("game_id")
+    return fetch_game_boxscore(gid) if gid else None
+
+def _build_potg(params, box):
+    if not box: return None
+    players = []
+    for team_key in ["homeTeam", "guestTeam"]:
+        for p in box.get(team_key, {}).get("playerStats", []):
+            try:
+                eff = float(p.get("efficiency", 0))
+                players.append({
+                    "id": str(p.get("seasonPlayer", {}).get("id")),
+                    "name": f"{p.get('seasonPlayer', {}).get('firstName','')} {p.get('seasonPlayer', {}).get('lastName','')}",
+                    "nr": p.get('seasonPlayer', {}).get('shirtNumber', ''),
+                    "eff": eff, "pts": int(p.get("points", 0)), "reb": int(p.get("totalRebounds", 0)),
+                    "min": f"{int(p.get('secondsPlayed', 0))//60:02d}:00"
+                })
+            except: pass
+            
+    if not players: return None
+    mvp = max(players, key=lambda x: x["eff"])
+    meta = get_player_metadata_cached(mvp["id"])
+    img = image_variant_uri(meta.get("img"), "potg", "https://via.placeholder.com/300")
+    return build_potg_html(mvp, img)
+
+def _load_final_banner(params):
+    gid = params.get("game_id")
+    if not gid: return None
+    details = fetch_game_details(gid)
+    return {"details": details, "box": fetch_game_boxscore(gid, details=details)}
+
+def _build_final_banner(params, data):
+    if not data or not data["details"]: return None
+    details, box = data["details"], data["box"]
+
+    h_data = details.get("homeTeam", {}); g_data = details.get("guestTeam", {})
+    h_name = h_data.get("nameFull") or h_data.get("name") or "Heim"
+    g_name = g_data.get("nameFull") or g_data.get("name") or "Gast"
+    h_logo = h_data.get("logoUrl") or ""; g_logo = g_data.get("logoUrl") or ""
+    sh = details.get("result", {}).get("homeTeamFinalScore", 0)
+    sg = details.get("result", {}).get("guestTeamFinalScore", 0)
+    
+    if (sh == 0 and sg == 0) and box:
+        sh = sum([int(p.get("points",0)) for p in box.get("homeTeam", {}).get("playerStats",[])])
+        sg = sum([int(p.get("points",0)) for p in box.get("guestTeam", {}).get("playerStats",[])])
+
+    return build_final_banner_html(h_name, g_name, h_logo, g_logo, sh, sg)
+
+def _load_scoreboard(params):
+    gid = params.get("game_id")
+    if not gid: return None
+    state = scoreboard_state(gid)[1]
+    if state: state = {k: v for k, v in state.items() if k != "version"}
+    return state
+
+def _build_scoreboard(params, state):
+    if not state: return None
+    return build_scoreboard_html(state, get_best_team_logo(state["h_team_id"]), get_best_team_logo(state["g_team_id"]))
+
+# view-Parameter -> (load, build), wie in app.py und src/obs_server.py
+OVERLAYS = {
+    "obs_starting5": (_load_starting5, _build_starting5),
+    "obs_standings": (_load_standings, _build_standings),
+    "obs_comparison": (_load_comparison, _build_comparison),
+    "obs_potg": (_load_potg, _build_potg),
+    "obs_final_banner": (_load_final_banner, _build_final_banner),
+    "obs_scoreboard": (_load_scoreboard, _build_scoreboard),
+}
+
+_memo = VersionedMemo(OBS_CACHE_MAX)
+
+def overlay(view, params):
+    """{"value": HTML oder None, "version", "checked_at", "built_at"} für view mit diesen Parametern."""
+    p = {k: params.get(k) for k in params.keys()}
+    load, build = OVERLAYS[view]
+    return _memo.get((view, tuple(sorted(p.items()))), lambda: load(p), lambda data: build(p, data), OBS_RECHECK_S.get(view, 60))
+
+def overlay_html(view, params):
+    return overlay(view, params)["value"]
+
+def overlay_stats():
+    return _memo.stats()
+# --- END OF FILE src/overlays.py ---
@@ -0,0 +1,36 @@
+# --- START OF FILE src/parallel.py ---
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = None; get_script_run_ctx = None
+
+def _thread_initializer():
+    """Gibt den Worker-Threads den ScriptRunContext der aufrufenden Session mit (sonst warnt Streamlit)."""
+    if get_script_run_ctx is None: return None
+    ctx = get_script_run_ctx()
+    if ctx is None: return None
+    return lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+def make_executor(max_workers):
+    return ThreadPoolExecutor(max_workers=max(1, max_workers), initializer=_thread_initializer())
+
+def run_parallel(fn, items, max_workers=8):
+    """Wie map(fn, items), aber mit begrenztem Thread-Pool. Reihenfolge bleibt erhalten."""
+    items = list(items)
+    if not items: return []
+    if len(items) == 1: return [fn(items[0])]
+    with make_executor(min(max_workers, len(items))) as ex:
+        return list(ex.map(fn, items))
+
+def iter_parallel(fn, items, max_workers=8):
+    """Generator: liefert (index, ergebnis), sobald ein Aufruf fertig ist (Reihenfolge = Fertigstellung)."""
+    items = list(items)
+    if not items: return
+    with make_executor(min(max_workers, len(items))) as ex:
+        futures = {ex.submit(fn, item): idx for idx, item in enumerate(items)}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+# --- END OF FILE src/parallel.py ---
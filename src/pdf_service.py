@@ -0,0 +1,210 @@
+# --- START OF FILE src/pdf_service.py ---
+# PDF-Erzeugung außerhalb des Streamlit-Skripts: Aufträge landen in einem begrenzten Prozess-Pool
+# (PDF_WORKERS wkhtmltopdf-Renderer), die Seite fragt per Job-ID nach dem Stand.
+# Ergebnisse liegen unter CACHE_DIR/pdf/<sha256>.pdf - identisches HTML+CSS+Optionen kommt sofort zurück.
+import os
+import json
+import time
+import hashlib
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from src.config import CACHE_DIR, CSS_STYLES, PDF_OPTIONS, PDF_WORKERS, PDF_MAX_QUEUE, PDF_CACHE_MAX_FILES
+from src import tracing
+
+try:
+    from pypdf import PdfWriter  # nur für submit_segmented
+    HAS_PYPDF = True
+except ImportError:
+    HAS_PYPDF = False
+
+PDF_DIR = os.path.join(CACHE_DIR, "pdf")
+
+_pool = None
+_jobs = {}     # job_id -> {"future", "submitted", "finished", "error"}
+JOB_KEEP_S = 600  # fehlgeschlagene Aufträge so lange für status() aufheben
+_lock = threading.Lock()
+
+class QueueFullError(RuntimeError):
+    pass
+
+def build_document(body_html, css=CSS_STYLES):
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'>{css}</head><body>{body_html}</body></html>"
+
+def job_key(document, options):
+    h = hashlib.sha256(document.encode("utf-8"))
+    h.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+def _path(job_id):
+    return os.path.join(PDF_DIR, f"{job_id}.pdf")
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # "spawn": der Worker erbt keinen Streamlit-Zustand und keine offenen Sockets/Threads
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def _reset_pool():
+    global _pool
+    if _pool is not None:
+        try: _pool.shutdown(wait=False, cancel_futures=True)
+        except Exception: pass
+    _pool = None
+
+def _prune():
+    try:
+        files = sorted((os.path.join(PDF_DIR, f) for f in os.listdir(PDF_DIR) if f.endswith(".pdf")), key=os.path.getmtime)
+        for f in files[:max(0, len(files) - PDF_CACHE_MAX_FILES)]: os.remove(f)
+    except OSError: pass
+
+def _on_done(job_id, fut, submitted=None, name="pdfkit"):
+    if submitted is not None:
+        # Zeit ab Auftrag (inkl. Warteschlange), der Worker-Prozess selbst misst nicht.
+        # Abgebrochene Futures (_reset_pool) werfen bei exception() CancelledError
+        tracing.record(name, "pdf", time.time() - submitted, error=fut.cancelled() or fut.exception() is not None)
+    error = None
+    try:
+        if fut.cancelled(): error = "PDF-Auftrag abgebrochen."
+        elif fut.exception() is None:  # Fehler des Renderers meldet status() direkt über das Future
+            data = fut.result()
+            if not data: error = "wkhtmltopdf hat kein PDF geliefert."
+            else:
+                os.makedirs(PDF_DIR, exist_ok=True)
+                tmp = _path(job_id) + ".tmp"
+                with open(tmp, "wb") as f: f.write(data)
+                os.replace(tmp, _path(job_id))
+                _prune()
+    except Exception as e: error = f"PDF konnte nicht gespeichert werden: {e}"
+    # Ohne _lock: der Callback kann in submit() unter _lock sofort laufen
+    job = _jobs.get(job_id)
+    if job is not None and job["future"] is fut: job["error"] = error; job["finished"] = True
+
+def _prune_jobs():
+    """Erledigte Aufträge vergessen (nur unter _lock): mit Datei sofort, fehlgeschlagene nach JOB_KEEP_S."""
+    now = time.time()
+    for job_id in [jid for jid, j in _jobs.items() if j.get("finished") and (os.path.exists(_path(jid)) or now - j["submitted"] > JOB_KEEP_S)]:
+        del _jobs[job_id]
+
+def submit(body_html, options=None, css=CSS_STYLES):
+    """Stellt einen Report in die Warteschlange und gibt die Job-ID zurück (Hash über HTML, CSS und Optionen)."""
+    options = PDF_OPTIONS if options is None else options
+    document = build_document(body_html, css)
+    job_id = job_key(document, options)
+    if os.path.exists(_path(job_id)): return job_id
+    with _lock:
+        _prune_jobs()
+        if not _needs_render(job_id): return job_id
+        _check_capacity(1)
+        _start(job_id, document, options)
+    return job_id
+
+def _needs_render(job_id):
+    """Weder als Datei vorhanden noch als laufender/erfolgreicher Auftrag bekannt (nur unter _lock)."""
+    if os.path.exists(_path(job_id)): return False
+    job = _jobs.get(job_id)
+    return not job or _failed(job)
+
+def _check_capacity(count):
+    pending = sum(1 for j in _jobs.values() if not j["future"].done())
+    if pending + count > PDF_MAX_QUEUE:
+        raise QueueFullError(f"PDF-Warteschlange voll ({pending} Aufträge, {count} neue).")
+
+def _start(job_id, document, options):
+    """Auftrag an den Pool geben (nur unter _lock)."""
+    from src.pdf_worker import render_pdf
+    try: fut = _get_pool().submit(render_pdf, document, options)
+    except BrokenProcessPool:
+        # Ein Worker ist abgestürzt -> Pool neu aufbauen
+        _reset_pool(); fut = _get_pool().submit(render_pdf, document, options)
+    t0 = time.time()
+    _jobs[job_id] = {"future": fut, "submitted": t0, "finished": False, "error": None}
+    fut.add_done_callback(lambda f, jid=job_id: _on_done(jid, f, t0))
+
+def _failed(job):
+    fut = job["future"]
+    return fut.done() and (fut.cancelled() or fut.exception() is not None or (job.get("finished") and job.get("error")))
+
+def _segment_bytes(seg_id, timeout=600):
+    with _lock: job = _jobs.get(seg_id)
+    if job: job["future"].result(timeout=timeout)  # wirft den Fehler des Segments weiter
+    # Die Datei schreibt _on_done erst nach Abschluss des Futures
+    end = time.time() + 10
+    while time.time() < end:
+        data = result(seg_id)
+        if data: return data
+        time.sleep(0.05)
+    raise RuntimeError(f"PDF-Segment {seg_id[:8]} fehlt.")
+
+def _merge(seg_ids):
+    writer = PdfWriter()
+    for seg_id in seg_ids: writer.append(BytesIO(_segment_bytes(seg_id)))
+    buffer = BytesIO(); writer.write(buffer)
+    return buffer.getvalue()
+
+def submit_segmented(segments, options=None, css=CSS_STYLES):
+    """Rendert jeden Abschnitt als eigenes PDF (einzeln gecacht) und fügt sie zusammen.
+    Nach einer kleinen Änderung wird nur das betroffene Segment neu gerendert. Job-ID wie bei submit()."""
+    if not HAS_PYPDF: raise RuntimeError("pypdf ist nicht installiert (pip install pypdf).")
+    options = PDF_OPTIONS if options is None else options
+    documents = [build_document(body, css) for body in segments]
+    seg_ids = [job_key(doc, options) for doc in documents]
+    with _lock:
+        _prune_jobs()
+        todo = {sid: doc for sid, doc in zip(seg_ids, documents) if _needs_render(sid)}
+        # Alle oder keins: erst Platz für sämtliche Segmente prüfen, bei Fehlern bereits gestartete wieder abbrechen
+        _check_capacity(len(todo))
+        started = []
+        try:
+            for sid, doc in todo.items(): _start(sid, doc, options); started.append(sid)
+        except Exception:
+            for sid in started:
+                job = _jobs.pop(sid, None)
+                if job: job["future"].cancel()
+            raise
+    job_id = hashlib.sha256("|".join(seg_ids).encode("utf-8")).hexdigest()
+    if os.path.exists(_path(job_id)): return job_id
+    with _lock:
+        job = _jobs.get(job_id)
+        if job and not _failed(job): return job_id
+        fut = Future(); fut.set_running_or_notify_cancel()
+        t0 = time.time()
+        _jobs[job_id] = {"future": fut, "submitted": t0, "finished": False, "error": None}
+        fut.add_done_callback(lambda f, jid=job_id: _on_done(jid, f, t0, "pdf_merge"))
+
+    def _run():
+        try: fut.set_result(_merge(seg_ids))
+        except Exception as e: fut.set_exception(e)
+    threading.Thread(target=_run, name="pdf-merge", daemon=True).start()
+    return job_id
+
+def status(job_id):
+    """{"state": "done" | "running" | "queued" | "error" | "unknown", "error": str, "waiting": Sekunden, "ahead": Aufträge davor}"""
+    if job_id and os.path.exists(_path(job_id)): return {"state": "done"}
+    with _lock:
+        job = _jobs.get(job_id)
+        if not job: return {"state": "unknown"}
+        fut = job["future"]
+        waiting = round(time.time() - job["submitted"], 1)
+        if fut.done():
+            if fut.cancelled(): return {"state": "error", "error": "PDF-Auftrag abgebrochen.", "waiting": waiting}
+            err = fut.exception()
+            if err: return {"state": "error", "error": str(err), "waiting": waiting}
+            # Callback schreibt die Datei gerade noch
+            if not job.get("finished"): return {"state": "running", "waiting": waiting}
+            # fertig, aber keine Datei (leeres PDF, Schreibfehler oder inzwischen verdrängt)
+            return {"state": "error", "error": job.get("error") or "PDF-Datei fehlt.", "waiting": waiting}
+        ahead = sum(1 for j in _jobs.values() if j["submitted"] < job["submitted"] and not j["future"].done())
+        return {"state": "running" if fut.running() else "queued", "waiting": waiting, "ahead": ahead}
+
+def result(job_id):
+    try:
+        with open(_path(job_id), "rb") as f: return f.read()
+    except (OSError, TypeError): return None
+
+def forget(job_id):
+    with _lock: _jobs.pop(job_id, None)
+# --- END OF FILE src/pdf_service.py ---
@@ -0,0 +1,8 @@
+# --- START OF FILE src/pdf_worker.py ---
+# Läuft im PDF-Worker-Prozess (src/pdf_service.py). Bewusst ohne Import von src.config/streamlit,
+# damit ein frisch gestarteter Prozess keine Secrets lesen oder Streamlit initialisieren muss.
+import pdfkit
+
+def render_pdf(document, options):
+    return pdfkit.from_string(document, False, options=options)
+# --- END OF FILE src/pdf_worker.py ---
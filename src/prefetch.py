@@ -0,0 +1,122 @@
+# --- START OF FILE src/prefetch.py ---
+# Vorab-Laden der nächsten Gegner: liest den Spielplan des eigenen Teams (OWN_TEAM_ID), bestimmt die
+# nächsten PREFETCH_OPPONENTS Gegner und lädt deren Kader/Teamwerte, Spieler-Metadaten, Logos und
+# die letzten Boxscores in den persistenten Cache (src/disk_cache.py). Der erste Klick in der Halle
+# kommt dann ohne API-Aufrufe aus.
+#
+# Läuft entweder als Hintergrund-Thread der App (nur im Zeitfenster PREFETCH_HOURS) oder per Cron:
+#   python -m src.prefetch run [--team 125] [--n 3]
+#   python -m src.prefetch next [--team 125]
+import time
+import argparse
+import threading
+from datetime import datetime
+import pytz
+from src.config import (
+    SEASON_ID, TEAMS_DB, OWN_TEAM_ID, PREFETCH_ENABLED, PREFETCH_OPPONENTS, PREFETCH_LAST_GAMES,
+    PREFETCH_HOURS, PREFETCH_INTERVAL_H
+)
+from src.api import (
+    fetch_schedule, fetch_team_data_live, store_team_data, get_player_metadata_batch,
+    get_best_team_logo, fetch_last_n_games_complete
+)
+from src import disk_cache
+
+TZ = pytz.timezone("Europe/Berlin")
+CHECK_EVERY_S = 300
+
+_thread = None
+_lock = threading.Lock()
+
+def _parse_date(d):
+    for fmt in ("%d.%m.%Y %H:%M", "%Y-%m-%dT%H:%M:%SZ"):
+        try: return datetime.strptime(d, fmt)
+        except (TypeError, ValueError): pass
+    return datetime.max
+
+def next_opponents(team_id, season_id=SEASON_ID, n=PREFETCH_OPPONENTS):
+    """Die nächsten n Gegner als Liste von {"team_id", "name", "date", "game_id"} (früheste zuerst)."""
+    upcoming = [g for g in fetch_schedule(team_id, season_id) if not g.get("has_result")]
+    upcoming.sort(key=lambda g: _parse_date(g.get("date")))
+    out = []; seen = set()
+    for g in upcoming:
+        is_home = str(g.get("homeTeamId")) == str(team_id)
+        opp_id = g.get("guestTeamId") if is_home else g.get("homeTeamId")
+        try: opp_id = int(opp_id)
+        except (TypeError, ValueError): continue
+        if opp_id in seen: continue
+        seen.add(opp_id)
+        out.append({"team_id": opp_id, "name": g.get("guest") if is_home else g.get("home"), "date": g.get("date"), "game_id": g.get("id")})
+        if len(out) >= n: break
+    return out
+
+def prefetch_team(team_id, season_id=SEASON_ID, last_games=PREFETCH_LAST_GAMES):
+    """Lädt alles, was Scouting- und Vorbereitungsseite für ein Team brauchen, und legt es auf die Platte."""
+    t = time.time()
+    df, ts = fetch_team_data_live(team_id, season_id)
+    store_team_data(team_id, season_id, df, ts)
+    players = df["PLAYER_ID"].tolist() if df is not None and not df.empty else []
+    get_player_metadata_batch(players)
+    get_best_team_logo(team_id)
+    games = fetch_last_n_games_complete(team_id, season_id, n=last_games) if last_games else []
+    return {"team_id": team_id, "players": len(players), "games": len(games), "seconds": round(time.time() - t, 1)}
+
+def run_once(team_id=OWN_TEAM_ID, season_id=SEASON_ID, n=PREFETCH_OPPONENTS):
+    if not team_id: return []
+    results = []
+    for opp in next_opponents(team_id, season_id, n):
+        try: results.append({**opp, **prefetch_team(opp["team_id"], season_id)})
+        except Exception as e: print(f"Prefetch Fehler Team {opp['team_id']}: {e}")
+    disk_cache.put("prefetch", "last_run", {"at": time.time(), "team_id": team_id, "results": results})
+    return results
+
+def last_run():
+    return disk_cache.get("prefetch", "last_run")
+
+def in_window(now=None):
+    h = (now or datetime.now(TZ)).hour
+    start, end = PREFETCH_HOURS
+    return start <= h < end if start <= end else (h >= start or h < end)
+
+def _due():
+    lr = last_run()
+    return not lr or time.time() - lr.get("at", 0) > PREFETCH_INTERVAL_H * 3600
+
+def _loop(team_id, season_id):
+    while True:
+        try:
+            if in_window() and _due(): run_once(team_id, season_id)
+        except Exception as e: print(f"Prefetch Fehler: {e}")
+        time.sleep(CHECK_EVERY_S)
+
+def start_background_prefetcher(team_id=OWN_TEAM_ID, season_id=SEASON_ID):
+    """Startet den Hintergrund-Thread einmal pro Prozess (weitere Aufrufe sind wirkungslos)."""
+    global _thread
+    if not (PREFETCH_ENABLED and team_id): return None
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_loop, args=(team_id, season_id), name="scouting-prefetch", daemon=True)
+            _thread.start()
+    return _thread
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.prefetch", description="Nächste Gegner vorab in den Cache laden.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name, hlp in [("run", "Jetzt laden"), ("next", "Nächste Gegner anzeigen")]:
+        p = sub.add_parser(name, help=hlp)
+        p.add_argument("--team", type=int, default=OWN_TEAM_ID); p.add_argument("--season", default=SEASON_ID)
+        p.add_argument("--n", type=int, default=PREFETCH_OPPONENTS)
+    args = parser.parse_args(argv)
+    if not args.team: parser.error("Kein Team: --team angeben oder SCOUTING_OWN_TEAM_ID setzen.")
+
+    print(f"Eigenes Team: {TEAMS_DB.get(args.team, {}).get('name', args.team)}")
+    if args.cmd == "next":
+        for o in next_opponents(args.team, args.season, args.n): print(f"  {o['date']}  {o['name']} ({o['team_id']})")
+    elif args.cmd == "run":
+        for r in run_once(args.team, args.season, args.n):
+            print(f"  {r['name']:<35} {r['players']:>3} Spieler  {r['games']} Spiele  {r['seconds']}s")
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE src/prefetch.py ---
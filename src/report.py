@@ -0,0 +1,136 @@
+# --- START OF FILE src/report.py ---
+# Zusammenbau des PreGame-Reports. Alle Bilder (Spielerfotos, beide Logos) werden vorab parallel
+# geladen, auf Kartengröße verkleinert und als Data-URI eingebettet - wkhtmltopdf muss beim
+# Rendern nichts mehr aus dem Netz holen.
+#
+# Jeder Abschnitt (Kopf, Top 3, jede Spielerkarte, Team-Stats, Plays, Key Facts) wird nach seinen
+# Eingaben gehasht und zwischengespeichert. Ändert sich eine Notiz, wird nur diese Karte neu gebaut.
+# Karten werden nach Bild-URL (nicht nach dem eingebetteten Bild) geschlüsselt; Bilder werden nur für
+# Abschnitte geladen und eingebettet, die tatsächlich neu gebaut werden.
+# Mit PDF_SEGMENTED werden auch die PDF-Seiten abschnittsweise gerendert und wiederverwendet.
+import json
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from src.config import IMAGE_WORKERS, REPORT_FRAGMENT_CACHE_SIZE, PDF_SEGMENTED, PDF_CARDS_PER_SEGMENT
+from src.api import get_player_metadata_batch
+from src.utils import optimize_image_base64, GRAY_BOX_B64
+from src.parallel import run_parallel
+from src.leaderboard import REPORT_CATEGORIES
+from src import pdf_service
+from src.html_gen import (
+    generate_header_html, generate_top3_html, generate_card_html,
+    generate_team_stats_html, generate_custom_sections_html
+)
+
+_fragments = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+# Spalten, die generate_top3_html liest (Anzeige + Ranglisten aus src/leaderboard.py) - nur sie gehen in den Schlüssel
+TOP3_COLUMNS = sorted({"NR", "NAME_FULL", "PPG", "FG%", "DR", "OR", "TOT", "3M", "3A", "3PCT", "FTM", "FTA", "FTPCT", "AS", "TO"}
+                      | {col for col, _, _ in REPORT_CATEGORIES.values()}
+                      | {flt[0] for _, _, flt in REPORT_CATEGORIES.values() if flt})
+
+def _key(kind, parts):
+    return kind + ":" + hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _frame_key(kind, df, columns=None):
+    """Schlüssel über die Werte der genannten Spalten (ohne Index und ohne den Rest des Kaders)."""
+    if df is None: return _key(kind, None)
+    cols = [c for c in (columns or df.columns) if c in df.columns]
+    return _key(kind, [cols, df[cols].to_numpy().tolist()])
+
+def _cached(key):
+    with _lock:
+        html = _fragments.get(key)
+        if html is not None: _fragments.move_to_end(key); _stats["hits"] += 1
+        return html
+
+def _build(key, builder, *args):
+    html = builder(*args)
+    with _lock:
+        _fragments[key] = html; _stats["misses"] += 1
+        while len(_fragments) > REPORT_FRAGMENT_CACHE_SIZE: _fragments.popitem(last=False)
+    return html
+
+def _fragment(kind, parts, builder, *args, key=None):
+    """HTML eines Abschnitts aus dem Cache oder neu gebaut (LRU, REPORT_FRAGMENT_CACHE_SIZE Einträge)."""
+    key = key or _key(kind, parts)
+    html = _cached(key)
+    return html if html is not None else _build(key, builder, *args)
+
+def fragment_stats():
+    with _lock: return {**_stats, "entries": len(_fragments)}
+
+def _inline(src):
+    if not src: return GRAY_BOX_B64
+    if str(src).startswith("data:"): return src
+    return optimize_image_base64(src)
+
+def _inline_all(sources, max_workers=IMAGE_WORKERS):
+    """{quelle: data-URI} für alle Quellen, parallel geladen."""
+    unique = list(dict.fromkeys(s or "" for s in sources))
+    return dict(zip(unique, run_parallel(_inline, unique, max_workers)))
+
+def _inline_meta(game_meta, inlined):
+    return {**game_meta, "home_logo": inlined[game_meta.get("home_logo") or ""], "guest_logo": inlined[game_meta.get("guest_logo") or ""]}
+
+def _plays_html(plays):
+    html = "<div style='page-break-before:always'><h2>Plays</h2>"
+    for data in plays: b64 = base64.b64encode(data).decode(); html += f"<div style='margin-bottom:20px'><img src='data:image/png;base64,{b64}' style='max-width:100%;max-height:900px;border:1px solid #ccc'></div>"
+    return html
+
+def build_report_sections(game_meta, roster_df, items, team_stats, color_map, offense, defense, about, plays=None):
+    """Liste von (art, html) in Report-Reihenfolge. items: [{"row", "pid", "color", "notes"}]; plays: hochgeladene Dateien."""
+    meta_lookup = get_player_metadata_batch([item["pid"] for item in items])
+    # Schlüssel aus den Rohdaten (Bild-URLs), erst danach nur für fehlende Abschnitte Bilder einbetten
+    header_key = _key("header", game_meta)
+    cards = []
+    for item in items:
+        row = item["row"].to_dict(); m = meta_lookup.get(str(item["pid"]), {}); color = color_map[item["color"]]
+        cards.append((_key("card", [str(item["pid"]), m.get("img"), m, row, item["notes"], color]), row, m, item["notes"], color))
+    header = _cached(header_key)
+    card_html = [_cached(card[0]) for card in cards]
+    sources = [] if header is not None else [game_meta.get("home_logo"), game_meta.get("guest_logo")]
+    sources += [card[2].get("img") for card, html in zip(cards, card_html) if html is None]
+    inlined = _inline_all(sources) if sources else {}
+    if header is None:
+        meta = _inline_meta(game_meta, inlined); header = _build(header_key, generate_header_html, meta)
+    sections = [("header", header),
+                ("top3", _fragment("top3", None, generate_top3_html, roster_df, key=_frame_key("top3", roster_df, TOP3_COLUMNS)))]
+    for (key, row, m, notes, color), html in zip(cards, card_html):
+        if html is None: html = _build(key, generate_card_html, row, {**m, "img": inlined[m.get("img") or ""]}, notes, color)
+        sections.append(("card", html))
+    sections.append(("team_stats", _fragment("team_stats", team_stats, generate_team_stats_html, team_stats)))
+    if plays:
+        data = [f.getvalue() for f in plays]
+        sections.append(("plays", _fragment("plays", [hashlib.sha256(d).hexdigest() for d in data], _plays_html, data)))
+    custom_key = _key("custom", [_frame_key("f", offense), _frame_key("f", defense), _frame_key("f", about)])
+    sections.append(("custom", _fragment("custom", None, generate_custom_sections_html, offense, defense, about, key=custom_key)))
+    return sections
+
+def build_report_html(game_meta, roster_df, items, team_stats, color_map, offense, defense, about, plays=None):
+    return "".join(html for _, html in build_report_sections(game_meta, roster_df, items, team_stats, color_map, offense, defense, about, plays))
+
+def group_pdf_segments(sections, cards_per_segment=PDF_CARDS_PER_SEGMENT):
+    """Teilt den Report in eigenständig renderbare Stücke: Kopf+Top 3, je cards_per_segment Karten, Team-Stats, Plays, Key Facts."""
+    segments = []; cards = []
+    for kind, html in sections:
+        if kind == "card":
+            cards.append(html)
+            if len(cards) == cards_per_segment: segments.append("".join(cards)); cards = []
+            continue
+        if cards: segments.append("".join(cards)); cards = []
+        if kind == "top3" and segments: segments[-1] += html
+        else: segments.append(html)
+    if cards: segments.append("".join(cards))
+    return [s for s in segments if s]
+
+def submit_report_pdf(sections):
+    """PDF-Auftrag für den Report. Segmentiert (Seiten-Cache) nur, wenn aktiviert und pypdf vorhanden ist."""
+    if PDF_SEGMENTED and pdf_service.HAS_PYPDF:
+        return pdf_service.submit_segmented(group_pdf_segments(sections))
+    return pdf_service.submit("".join(html for _, html in sections))
+# --- END OF FILE src/report.py ---
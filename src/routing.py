@@ -0,0 +1,122 @@
+# --- START OF FILE src/routing.py ---
+# Merkt sich, welcher DBBL-Host (api-s / api-n / api-1) ein Team, Spiel oder Spieler ausgeliefert hat.
+# Spätere Aufrufe gehen direkt an diesen Host; die anderen werden nur noch bei einem Fehler probiert.
+# Startwert für Teams ist die Staffel aus TEAMS_DB. Die gelernten Routen liegen in CACHE_DIR/routes.json
+# (gesammelt höchstens alle ROUTES_FLUSH_S Sekunden geschrieben, begrenzt auf ROUTES_MAX Einträge).
+import os
+import json
+import time
+import atexit
+import threading
+from src.config import TEAMS_DB, CACHE_DIR, ROUTES_FLUSH_S, ROUTES_MAX, HTTP_RETRIES
+from src.http_client import api_get
+
+HOST_SOUTH = "https://api-s.dbbl.scb.world"
+HOST_NORTH = "https://api-n.dbbl.scb.world"
+HOST_FIRST = "https://api-1.dbbl.scb.world"
+DEFAULT_HOSTS = [HOST_SOUTH, HOST_NORTH]
+KNOWN_HOSTS = {HOST_SOUTH, HOST_NORTH, HOST_FIRST}
+
+ROUTES_PATH = os.path.join(CACHE_DIR, "routes.json")
+
+_routes = None
+_lock = threading.Lock()
+_save_lock = threading.Lock()   # serialisiert das Schreiben der Datei (außerhalb von _lock)
+_dirty = False
+_last_save = 0.0
+_timer = None
+
+def _load():
+    global _routes
+    if _routes is None:
+        try:
+            with open(ROUTES_PATH, "r", encoding="utf-8") as f: data = json.load(f)
+            _routes = {k: v for k, v in data.items() if v in KNOWN_HOSTS}
+        except Exception: _routes = {}
+    return _routes
+
+def _write(snapshot):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = ROUTES_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(snapshot, f)
+        os.replace(tmp, ROUTES_PATH)
+    except Exception as e: print(f"Routing speichern fehlgeschlagen: {e}")
+
+def flush():
+    """Geänderte Routen jetzt schreiben (auch beim Beenden des Prozesses)."""
+    global _dirty, _last_save, _timer
+    with _save_lock:
+        with _lock:
+            if not _dirty: return
+            snapshot = dict(_routes); _dirty = False; _last_save = time.time(); _timer = None
+        _write(snapshot)
+
+def _mark_dirty():
+    """Nur unter _lock: Datei wird gesammelt geschrieben, höchstens alle ROUTES_FLUSH_S Sekunden."""
+    global _dirty, _timer
+    _dirty = True
+    if _timer is None:
+        _timer = threading.Timer(max(0.0, _last_save + ROUTES_FLUSH_S - time.time()), flush)
+        _timer.daemon = True; _timer.start()
+
+atexit.register(flush)
+
+def _key(kind, entity_id):
+    return f"{kind}:{str(entity_id).replace('.0', '')}"
+
+def team_hint(team_id):
+    """Host laut Staffel in TEAMS_DB (None für unbekannte Teams)."""
+    try: info = TEAMS_DB.get(int(team_id))
+    except (TypeError, ValueError): return None
+    if not info: return None
+    return HOST_NORTH if info.get("staffel") == "Nord" else HOST_SOUTH
+
+def learned_host(kind, entity_id):
+    with _lock: return _load().get(_key(kind, entity_id))
+
+def candidate_hosts(kind, entity_id, hint=None, extra_hosts=()):
+    """Reihenfolge: gelernter Host, Hinweis, zusätzliche Hosts, danach api-s / api-n."""
+    order = [learned_host(kind, entity_id), hint, *extra_hosts, *DEFAULT_HOSTS]
+    return list(dict.fromkeys(h for h in order if h))
+
+def remember(kind, entity_id, host):
+    remember_many(kind, [entity_id], host)
+
+def remember_many(kind, entity_ids, host):
+    if host not in KNOWN_HOSTS: return
+    with _lock:
+        routes = _load(); changed = False
+        for eid in entity_ids:
+            if eid is None or eid == "": continue
+            k = _key(kind, eid)
+            if routes.get(k) != host:
+                routes.pop(k, None); routes[k] = host; changed = True  # neu einsortieren = zuletzt gelernt
+        if changed:
+            for k in list(routes)[:max(0, len(routes) - ROUTES_MAX)]: del routes[k]
+            _mark_dirty()
+
+def forget(kind=None):
+    """Gelernte Routen verwerfen (alle oder nur eine Art, z.B. 'game')."""
+    with _lock:
+        routes = _load()
+        for k in [k for k in routes if kind is None or k.startswith(f"{kind}:")]: del routes[k]
+        _mark_dirty()
+    flush()
+
+def routed_get_json(kind, entity_id, path, endpoint="default", headers=None, hint=None, extra_hosts=(), accept=None):
+    """Probiert die Hosts in gelernter Reihenfolge. Gibt (json, host) des ersten Treffers zurück, sonst (None, None).
+    accept(data) kann eine 200-Antwort zusätzlich ablehnen (z.B. leere Liste), dann wird der nächste Host gefragt."""
+    hosts = candidate_hosts(kind, entity_id, hint, extra_hosts)
+    for i, host in enumerate(hosts):
+        try:
+            # Wiederholungen nur beim letzten Host, vorher ist der nächste Host die Wiederholung
+            r = api_get(f"{host}{path}", endpoint=endpoint, headers=headers, retries=HTTP_RETRIES if i == len(hosts) - 1 else 0)
+            if r.status_code != 200: continue
+            data = r.json()
+            if accept is not None and not accept(data): continue
+            remember(kind, entity_id, host)
+            return data, host
+        except Exception: continue
+    return None, None
+# --- END OF FILE src/routing.py ---
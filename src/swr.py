@@ -0,0 +1,188 @@
+# --- START OF FILE src/swr.py ---
+# Stale-while-revalidate für die Saisondaten (Kader, Spielplan, Tabelle):
+#   - Stand jünger als ttl -> sofort zurück
+#   - Stand abgelaufen -> trotzdem sofort zurück, die Aktualisierung läuft im Hintergrund (ein Auftrag pro Schlüssel)
+#   - Aktualisierung fehlgeschlagen (Ausnahme oder leere Antwort) -> alter Stand bleibt, neuer Versuch nach SWR_RETRY_S
+#   - noch kein Stand -> blockierend laden; gleichzeitige Aufrufer warten auf denselben Abruf.
+#     Mit seed=... (z.B. Vorab-Cache auf der Platte) wird dessen Wert einmal ausgeliefert und sofort im Hintergrund ersetzt
+# Jeder Stand hat einen Zeitstempel, die App zeigt ihn als "Daten Stand" an (render_as_of).
+# Buchführung und gezieltes Invalidieren wie bei tracing.cached_fetcher über src/cache_registry.py.
+#
+#   @swr_fetcher(ttl=300)
+#   def fetch_schedule(team_id, season_id): ...
+#   @swr_fetcher(ttl=600, seed=load_prefetched_team_data)
+#   def fetch_team_data(team_id, season_id): ...
+import copy
+import time
+import inspect
+import functools
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pytz
+import streamlit as st
+from src.config import SWR_RETRY_S, SWR_WORKERS, SWR_MAX_KEYS
+from src import tracing, cache_registry
+
+_pool = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None: _pool = ThreadPoolExecutor(max_workers=SWR_WORKERS, thread_name_prefix="swr")
+        return _pool
+
+def has_data(value):
+    """Standard-Prüfung: None und leere Listen/Dicts/DataFrames gelten als fehlgeschlagener Abruf."""
+    if value is None: return False
+    if hasattr(value, "empty"): return not value.empty
+    try: return len(value) > 0
+    except TypeError: return True
+
+def note_as_of(ts):
+    """Aus dem Funktionsrumpf: die gelieferten Daten sind älter als der Abruf (z.B. aus dem Vorab-Cache)."""
+    _local.as_of = ts
+
+class _Entry:
+    __slots__ = ("value", "good", "as_of", "next_check", "error", "refreshing")
+
+    def __init__(self):
+        self.value = None; self.good = False; self.as_of = None
+        self.next_check = 0.0; self.error = None; self.refreshing = False
+
+class SwrFunction:
+    def __init__(self, fn, ttl, valid, seed=None):
+        functools.update_wrapper(self, fn)
+        self.fn = fn; self.ttl = ttl; self.valid = valid; self.seed = seed
+        self.name = fn.__name__
+        self.signature = inspect.signature(fn)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # Schlüssel -> _Entry
+        self._loading = {}             # Schlüssel -> Lock des laufenden blockierenden Abrufs
+        self.stats = cache_registry.register(fn, self, {"ttl": ttl, "max_entries": SWR_MAX_KEYS})
+
+    def _key(self, args, kwargs):
+        try:
+            bound = self.signature.bind(*args, **kwargs); bound.apply_defaults()
+            return tuple(bound.arguments.values())
+        except TypeError:
+            return (args, tuple(sorted(kwargs.items())))
+
+    def _load(self, args, kwargs, fn=None):
+        """Ruft die Funktion (oder seed) auf -> (wert, gültig, stand). Ausnahmen gehen an den Aufrufer."""
+        _local.as_of = None
+        try: value = (fn or self.fn)(*args, **kwargs)
+        finally: as_of = getattr(_local, "as_of", None); _local.as_of = None
+        return value, self.valid(value), as_of or time.time()
+
+    def _store(self, key, value, ok, as_of, error, fresh=True):
+        """Übernimmt ein Ergebnis. Ein gültiger Stand wird nie durch einen fehlgeschlagenen ersetzt.
+        fresh=False: gültig, aber sofort zu aktualisieren (seed)."""
+        now = time.time()
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None: e = self._entries[key] = _Entry()
+            e.refreshing = False
+            if ok:
+                e.value = value; e.good = True; e.as_of = as_of; e.error = None; e.next_check = now + self.ttl if fresh else now
+            else:
+                if not e.good: e.value = value  # leere Antwort kurz merken, damit nicht jeder Aufruf die API trifft
+                e.error = error; e.next_check = now + SWR_RETRY_S
+            self._entries.move_to_end(key)
+            while len(self._entries) > SWR_MAX_KEYS: self._entries.popitem(last=False)
+
+    def _refresh(self, key, args, kwargs):
+        error = None
+        with tracing.span(f"{self.name} (Hintergrund)", "api"):
+            try:
+                value, ok, as_of = self._load(args, kwargs)
+                if not ok: error = "keine Daten"
+            except Exception as e:
+                value, ok, as_of, error = None, False, None, f"{type(e).__name__}: {e}"
+        if error: print(f"SWR {self.name}{args}: Aktualisierung fehlgeschlagen ({error}) - alter Stand bleibt")
+        self._store(key, value, ok, as_of, error)
+        if ok: self.stats.record_refresh(args, kwargs, value)
+
+    def _cached(self, key, args, kwargs, now):
+        """Vorhandener Stand oder None; startet bei Bedarf die Aktualisierung im Hintergrund. Nur unter self._lock."""
+        e = self._entries.get(key)
+        if e is None or not (e.good or now < e.next_check): return None
+        if e.good and now >= e.next_check and not e.refreshing:
+            e.refreshing = True
+            try: _executor().submit(self._refresh, key, args, kwargs)
+            except RuntimeError: e.refreshing = False  # Interpreter fährt herunter
+        return e
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        with tracing.span(self.name, "api"):
+            with self._lock: e = self._cached(key, args, kwargs, time.time())
+            if e is not None:
+                tracing.mark_cache(True); self.stats.record(args, kwargs, False)
+                return copy.deepcopy(e.value)
+            with self._lock: loading = self._loading.setdefault(key, threading.Lock())
+            with loading:
+                # Wer auf den Abruf eines anderen Aufrufers gewartet hat, bekommt dessen Ergebnis
+                with self._lock: e = self._cached(key, args, kwargs, time.time())
+                if e is not None:
+                    tracing.mark_cache(True); self.stats.record(args, kwargs, False)
+                    return copy.deepcopy(e.value)
+                try:
+                    if self.seed is not None:
+                        value, ok, as_of = self._load(args, kwargs, self.seed)
+                        if ok:
+                            # Startwert einmal ausliefern, die eigentliche Abfrage läuft sofort im Hintergrund
+                            self._store(key, value, ok, as_of, None, fresh=False)
+                            with self._lock: self._cached(key, args, kwargs, time.time())
+                            self.stats.record(args, kwargs, True, value)
+                            return copy.deepcopy(value)
+                    tracing.mark_cache(False)
+                    value, ok, as_of = self._load(args, kwargs)
+                finally:
+                    with self._lock: self._loading.pop(key, None)
+                self._store(key, value, ok, as_of, None if ok else "keine Daten")
+                self.stats.record(args, kwargs, True, value)
+                return copy.deepcopy(value)
+
+    def state(self, *args, **kwargs):
+        """{"as_of", "age_s", "stale", "refreshing", "error"} des Stands oder None."""
+        key = self._key(args, kwargs); now = time.time()
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None or not e.good: return None
+            return {"as_of": e.as_of, "age_s": now - e.as_of, "stale": now >= e.next_check or e.error is not None,
+                    "refreshing": e.refreshing, "error": e.error}
+
+    def clear(self, *args, **kwargs):
+        """Ohne Argumente alles, sonst nur den Stand für diese Argumente (wie st.cache_data .clear())."""
+        with self._lock:
+            if not args and not kwargs: self._entries.clear()
+            else: self._entries.pop(self._key(args, kwargs), None)
+
+def swr_fetcher(ttl, valid=has_data, seed=None):
+    """Dekorator: ttl in Sekunden, valid(wert) entscheidet, ob ein Ergebnis einen alten Stand ersetzen darf.
+    seed(*args) liefert optional einen Startwert ohne API (oder None), der nur bis zur ersten Aktualisierung gilt."""
+    def deco(fn):
+        return SwrFunction(fn, ttl, valid, seed)
+    return deco
+
+# --- ANZEIGE ---
+_BERLIN = pytz.timezone("Europe/Berlin")
+
+
+def format_as_of(state):
+    if not state: return None
+    dt = datetime.fromtimestamp(state["as_of"], _BERLIN)
+    text = f"Daten Stand: {dt.strftime('%H:%M Uhr' if dt.date() == datetime.now(_BERLIN).date() else '%d.%m.%Y %H:%M Uhr')}"
+    if state["error"]: text += " · API gerade nicht erreichbar, letzter gültiger Stand"
+    elif state["refreshing"]: text += " · wird im Hintergrund aktualisiert"
+    return text
+
+def render_as_of(fn, *args, **kwargs):
+    """Caption mit dem Zeitstempel des Stands, z.B. render_as_of(fetch_schedule, tid, season)."""
+    text = format_as_of(fn.state(*args, **kwargs)) if isinstance(fn, SwrFunction) else None
+    if text: st.caption(text)
+# --- END OF FILE src/swr.py ---
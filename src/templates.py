@@ -0,0 +1,179 @@
+# --- START OF FILE src/templates.py ---
+# Vorkompilierte HTML-Bausteine für Report (src/html_gen.py) und OBS-Overlays (src/overlays.py).
+# Vorlagen werden in string.Template-Syntax (${name}) geschrieben und beim Registrieren einmal in eine
+# Python-Funktion mit f-String übersetzt (wie Jinja2 Vorlagen zu Bytecode kompiliert). render() kostet
+# danach so viel wie ein handgeschriebener f-String; Zeilen werden per join statt += zusammengesetzt.
+import keyword
+from string import Template
+
+class HtmlTemplate:
+    def __init__(self, name, source):
+        tpl = Template(source)
+        if not tpl.is_valid(): raise ValueError(f"Ungültige Vorlage: {name}")
+        self.name = name
+        self.fields = tuple(tpl.get_identifiers())
+        bad = [f for f in self.fields if keyword.iskeyword(f)]
+        if bad: raise ValueError(f"Vorlage {name}: ungültige Platzhalter {bad}")
+        self._fn = _compile(name, source, self.fields)
+
+    def render(self, values=None, /, **kw):
+        """Werte als dict und/oder Schlüsselwörter; zusätzliche Schlüssel werden ignoriert."""
+        if values: return self._fn(**values, **kw)
+        return self._fn(**kw)
+
+    def render_each(self, rows):
+        fn = self._fn
+        return "".join([fn(**r) for r in rows])
+
+def _compile(name, source, fields):
+    """${name} -> {name} in einem f-String, $$ -> $, geschweifte Klammern im Text verdoppeln."""
+    out = []; pos = 0
+    for m in Template.pattern.finditer(source):
+        out.append(source[pos:m.start()].replace("{", "{{").replace("}", "}}"))
+        if m.group("escaped") is not None: out.append("$")
+        else: out.append("{" + (m.group("named") or m.group("braced")) + "}")
+        pos = m.end()
+    out.append(source[pos:].replace("{", "{{").replace("}", "}}"))
+    params = "".join(f"{f}, " for f in fields)
+    code = f"def _render(*, {params}**_):\n    return f{''.join(out)!r}\n"
+    namespace = {}
+    exec(compile(code, f"<template {name}>", "exec"), namespace)
+    return namespace["_render"]
+
+_REGISTRY = {}
+
+def register(name, source):
+    _REGISTRY[name] = HtmlTemplate(name, source)
+    return _REGISTRY[name]
+
+def get(name):
+    return _REGISTRY[name]
+
+def render(name, values=None, /, **kw):
+    return _REGISTRY[name].render(values, **kw)
+
+def render_each(name, rows):
+    return _REGISTRY[name].render_each(rows)
+
+# --- REPORT (src/html_gen.py) ---
+
+register("top3_box", "<div class='stat-box'><div class='stat-title' style='border-top: 4px solid ${color}; color: ${color}; font-size: 18px; padding: 5px; font-weight:bold;'>${title}</div><table class='top3-table'><tr>${head}</tr>${rows}</table></div>")
+register("top3_th", "<th>${head}</th>")
+register("top3_row", "<tr>${cells}</tr>")
+register("top3_td", "<td style='text-align:${align}; font-size: ${size};${bold}'>${val}</td>")
+register("top3_container", "<div class='top3-container'>${boxes}</div>")
+
+register("card_cell", "<td>${v}</td>")
+register("card_note_row", '<tr class="note-row"><td colspan="6">${l}</td><td colspan="12" class="note-right" style="color: #d9534f; font-weight: bold;">${r}</td></tr>')
+register("card", """
+<div class="player-card">
+<div class="card-header" style="background-color: ${color};"><span>#${nr} ${name}</span><span>${height} m | Pos: ${pos}</span></div>
+<div class="card-body">
+<table class="layout-table"><tr>
+<td class="layout-img-cell"><img src="${img}" class="player-img"></td>
+<td class="layout-stats-cell">
+<table class="stats-table">
+<tr class="bg-gray"><th rowspan="2">Min</th><th rowspan="2">PPG</th><th colspan="3">2P FG</th><th colspan="3">3P FG</th><th colspan="3">FT</th><th colspan="3">REB</th><th rowspan="2">AS</th><th rowspan="2">TO</th><th rowspan="2">ST</th><th rowspan="2">PF</th></tr><tr class="bg-gray"><th>M</th><th>A</th><th>%</th><th>M</th><th>A</th><th>%</th><th>M</th><th>A</th><th>%</th><th>D</th><th>O</th><th>TOT</th></tr>
+<tr class="font-bold">${stats}</tr>
+${notes}
+</table>
+</td>
+</tr></table>
+</div>
+</div>""")
+
+register("custom_section", "<h3 style='border-bottom: 2px solid #333; margin-bottom:10px; font-size: 20px;'>${title}</h3><table style='width:100%; border-collapse:collapse; margin-bottom:20px;'>${rows}</table>")
+register("custom_row", "<tr><td style='width:25%; border:1px solid #ccc; padding:6px; font-weight:bold; vertical-align:top; font-size:14px; background:#f9f9f9;'>${c1}</td><td style='border:1px solid #ccc; padding:6px; vertical-align:top; font-size:14px;'>${c2}</td></tr>")
+
+register("comparison", """<div style="margin: 20px 0; font-family: sans-serif;"><h3 style="text-align: center; border-bottom: 2px solid #333; padding-bottom: 10px; margin-bottom: 0;">Head-to-Head (Saison-Schnitt)</h3><table style="width: 100%; border-collapse: collapse; font-size: 16px;"><tr style="background-color: #333; color: white;"><th style="padding: 12px; text-align: right; width: 35%;">${h_name}</th><th style="padding: 12px; text-align: center; width: 30%; background-color: #555;">Statistik</th><th style="padding: 12px; text-align: left; width: 35%;">${g_name}</th></tr>${rows}</table></div>""")
+register("comparison_row", """<tr><td style="${style_h}">${fmt_h}</td><td style="${style_label}">${label}</td><td style="${style_g}">${fmt_g}</td></tr>""")
+
+# --- OBS-OVERLAYS (src/overlays.py) ---
+
+register("obs_starting5", "<div class='overlay-container' style='position:fixed; bottom:40px; left:50%; transform:translateX(-50%); width:1550px; display:flex; flex-direction:column; z-index:9999;'>"
+         "<div class='header-bar' style='background:linear-gradient(90deg, #001f5b 0%, #00338d 100%); color:white; padding:12px 35px; display:flex; align-items:center; justify-content:space-between; border-top:5px solid #ff6600; border-radius:10px 10px 0 0; box-shadow: 0 5px 15px rgba(0,0,0,0.5);'>"
+         "<div style='display:flex; align-items:center; gap:20px;'>${logo}"
+         "<div style='font-size:34px; font-weight:900; text-transform:uppercase; font-family:sans-serif;'>${team_name}</div></div>"
+         "<div style='text-align:right; font-size:16px; color:#ddd; text-transform:uppercase; font-family:sans-serif;'>Head Coach<span style='font-weight:bold; color:white; display:block; font-size:22px;'>${coach_name}</span></div></div>"
+         "<div style='display:flex; justify-content:space-between; background:white; padding:20px; border-radius:0 0 10px 10px; border-bottom:5px solid #001f5b;'>"
+         "${players}</div></div>")
+register("obs_starting5_logo", "<img src='${url}' style='height:65px; object-fit:contain;'>")
+register("obs_starting5_player", "<div style='width:19%; text-align:center; position:relative; display:flex; flex-direction:column; align-items:center;'>"
+         "<div style='position:relative; width:150px; height:150px; margin-bottom:10px;'>"
+         "<img src='${img}' style='width:100%; height:100%; object-fit:cover; border-radius:8px; border:3px solid #001f5b; background:#eee;'>"
+         "<div style='position:absolute; bottom:-8px; left:-8px; background:#ff6600; color:white; font-weight:900; width:42px; height:42px; display:flex; align-items:center; justify-content:center; font-size:22px; border:2px solid white; border-radius:5px; font-family:sans-serif;'>${nr}</div></div>"
+         "<div style='font-size:20px; font-weight:bold; color:#001f5b; text-transform:uppercase; font-family:sans-serif;'>${name}</div></div>")
+
+register("obs_standings", "<div style='position:fixed; top:50%; left:50%; transform:translate(-50%, -50%); width:1400px; background:white; border-radius:15px; border:3px solid #00338d; overflow:hidden; box-shadow:0 0 50px rgba(0,0,0,0.8); font-family:sans-serif;'>"
+         "<div style='background:linear-gradient(90deg, #001f5b 0%, #00338d 100%); color:white; padding:10px 40px; display:flex; align-items:center; justify-content:space-between; border-bottom:5px solid #ff6600; height:120px;'>"
+         "<span style='font-size:40px; font-weight:900; text-transform:uppercase; letter-spacing:1px;'>${title}</span>"
+         "<img src='${logo}' style='height:100px; width:auto; object-fit:contain; filter:drop-shadow(0 0 8px rgba(255,255,255,0.8));'></div>"
+         "<table style='width:100%; font-size:26px; border-collapse:collapse; text-align:center;'><thead>"
+         "<tr style='background:#eee; color:#001a4d; text-transform:uppercase; font-size:22px; border-bottom:3px solid #001a4d;'><th style='padding:15px; width:60px;'>#</th><th style='text-align:left; padding:15px;'>Team</th><th>Sp</th><th>S</th><th>N</th><th>Diff</th></tr></thead><tbody>"
+         "${rows}</tbody></table></div>")
+register("obs_standings_row", "<tr style='background-color:${bg}; border-left:8px solid ${border}; border-bottom:1px solid #ccc; color:#333; font-weight:bold;'>"
+         "<td style='padding:12px;'>${platz}</td><td style='text-align:left; padding:12px;'>${team}</td><td>${sp}</td><td>${s}</td><td>${n}</td><td style='color:${diff_color};'>${diff}</td></tr>")
+
+register("obs_comparison", "<div style='position:fixed; top:50%; left:50%; transform:translate(-50%, -50%); width:1100px; background:#FFD700; border-radius:15px; padding:0; overflow:hidden; box-shadow:0 20px 60px rgba(0,0,0,0.8); font-family:sans-serif; z-index:9999; border: 4px solid #000;'>"
+         "<table style='width:100%; border-collapse:collapse;'>"
+         "<tr><th style='background:#000; color:#FFD700; padding:15px; font-size:24px; font-weight:900; width:40%; text-align:center; text-transform:uppercase; border-bottom:4px solid #000;'>${hname}</th>"
+         "<th style='background:#222; color:white; width:20%; text-align:center; font-size:16px; letter-spacing:2px; border-bottom:4px solid #000;'>STATS</th>"
+         "<th style='background:#000; color:#FFD700; padding:15px; font-size:24px; font-weight:900; width:40%; text-align:center; text-transform:uppercase; border-bottom:4px solid #000;'>${gname}</th></tr>"
+         "${rows}</table></div>")
+register("obs_comparison_row", "<tr style='border-bottom:1px solid #d4b000; text-align:center;'>"
+         "<td style='${s_h}'>${f_h}</td>"
+         "<td style='background:#fff; color:#000; font-size:16px; font-weight:bold; text-transform:uppercase; letter-spacing:0.5px; border-left:1px solid #d4b000; border-right:1px solid #d4b000;'>${label}</td>"
+         "<td style='${s_g}'>${f_g}</td></tr>")
+
+register("obs_potg", "<div style='width:450px; margin:100px auto; background:#FFD700; border:4px solid #000; border-radius:20px; padding:30px; text-align:center; color:#000; font-family:sans-serif; box-shadow:0 0 50px rgba(0,0,0,0.8);'>"
+         "<h2 style='color:#000; margin:0 0 15px 0; font-size:24px; text-transform:uppercase; font-weight:900;'>Player of the Game</h2>"
+         "<img src='${img}' style='width:220px; height:220px; border-radius:50%; border:5px solid #000; object-fit:cover;'>"
+         "<h1 style='margin:15px 0 5px 0; font-size:32px; color:#000; font-weight:900;'>${name}</h1>"
+         "<h2 style='margin:0; color:#333;'>#${nr}</h2>"
+         "<div style='display:flex; justify-content:center; gap:15px; margin-top:25px; background:#fff; padding:15px; border-radius:10px; border:1px solid #000;'>"
+         "<div><div style='font-size:12px; color:#666;'>MIN</div><div style='font-size:24px; font-weight:900;'>${min}</div></div>"
+         "<div><div style='font-size:12px; color:#666;'>PTS</div><div style='font-size:24px; font-weight:900;'>${pts}</div></div>"
+         "<div><div style='font-size:12px; color:#666;'>REB</div><div style='font-size:24px; font-weight:900;'>${reb}</div></div>"
+         "<div><div style='font-size:12px; color:#666;'>EFF</div><div style='font-size:24px; font-weight:900; color:#001f5b;'>${eff}</div></div></div></div>")
+
+register("obs_final_banner", "<div style='position:fixed; bottom:80px; left:50%; transform:translateX(-50%); width:1600px; font-family:sans-serif; box-shadow:0 15px 50px rgba(0,0,0,0.7);'>"
+         "<div style='background:linear-gradient(90deg, #001040 0%, #002060 100%); color:white; height:95px; display:flex; align-items:center; justify-content:space-between; padding:0 40px; border-top:6px solid #ff6600;'>"
+         "<div style='font-size:${h_fs}; font-weight:900; text-transform:uppercase; width:45%; line-height:1.1;'>${h_name}</div>"
+         "<div style='font-size:24px; font-weight:900; color:#ff6600; font-style:italic;'>VS</div>"
+         "<div style='font-size:${g_fs}; font-weight:900; text-transform:uppercase; width:45%; text-align:right; line-height:1.1;'>${g_name}</div></div>"
+         "<div style='background:white; height:110px; display:flex; align-items:center; justify-content:space-between; padding:0 40px; position:relative; border-bottom:4px solid #ccc;'>"
+         "${h_logo}"
+         "<div style='position:absolute; top:-35px; left:50%; transform:translateX(-50%); background:white; padding:15px 60px; border-radius:12px 12px 0 0; text-align:center; border-top:5px solid #ff6600; box-shadow:0 -5px 20px rgba(0,0,0,0.15);'>"
+         "<div style='font-size:16px; font-weight:900; color:#ff6600;'>FINAL SCORE</div><div style='font-size:60px; font-weight:900; color:#001f5b;'>${sh} | ${sg}</div></div>"
+         "${g_logo}"
+         "</div></div>")
+register("obs_final_logo", "<img src='${url}' style='height:90px; filter:drop-shadow(0 4px 4px rgba(0,0,0,0.1));'>")
+register("obs_scoreboard", "<div style='position:fixed; top:30px; left:30px; width:860px; font-family:sans-serif; box-shadow:0 10px 40px rgba(0,0,0,0.6);'>"
+         "<style>.sb-dots span { display:inline-block; width:14px; height:14px; margin:0 3px; border-radius:50%; background:#d0d0d0; } .sb-dots span.on { background:#e30613; }</style>"
+         "<div style='display:flex; align-items:stretch; background:#001040; color:white; border-top:5px solid #ff6600;'>"
+         "<div style='flex:1; display:flex; align-items:center; gap:12px; padding:10px 16px;'>${h_logo}<div><div style='font-size:22px; font-weight:900; text-transform:uppercase; line-height:1.1;'>${home}</div><div class='sb-dots' id='sb-hf'>${h_dots}</div></div></div>"
+         "<div style='background:white; color:#001f5b; min-width:190px; text-align:center; padding:6px 10px;'><div style='font-size:46px; font-weight:900;'><span id='sb-hs'>${h_score}</span>:<span id='sb-gs'>${g_score}</span></div>"
+         "<div style='font-size:18px; font-weight:900; color:#ff6600;'><span id='sb-period'>${period_label}</span> | <span id='sb-clock'>${clock}</span></div></div>"
+         "<div style='flex:1; display:flex; align-items:center; justify-content:flex-end; gap:12px; padding:10px 16px; text-align:right;'><div><div style='font-size:22px; font-weight:900; text-transform:uppercase; line-height:1.1;'>${guest}</div><div class='sb-dots' id='sb-gf'>${g_dots}</div></div>${g_logo}</div>"
+         "</div></div>")
+register("obs_scoreboard_logo", "<img src='${url}' style='height:56px; object-fit:contain; background:white; border-radius:6px; padding:3px;'>")
+register("obs_scoreboard_dot", "<span class='${cls}'></span>")
+
+# --- OBS-SERVER (src/obs_server.py) ---
+
+register("obs_page", "<!DOCTYPE html><html><head><meta charset='utf-8'>${refresh}<title>${title}</title>"
+         "<style>html, body { background: transparent; margin: 0; padding: 0; overflow: hidden; }</style></head><body>${body}</body></html>")
+register("obs_refresh", "<meta http-equiv='refresh' content='${seconds}'>")
+# Live-Scoreboard: Updates per Server-Sent Events, ohne die Seite neu zu laden
+register("obs_scoreboard_script", "<script>(function () {"
+         "var src = new EventSource('${events_url}');"
+         "function dots(n) { var s = ''; for (var i = 0; i < 5; i++) s += '<span class=\"' + (i < n ? 'on' : '') + '\"></span>'; return s; }"
+         "function set(id, v) { var el = document.getElementById(id); if (el) el.textContent = v; }"
+         "src.onmessage = function (e) { var d = JSON.parse(e.data);"
+         "if (!document.getElementById('sb-hs')) { src.close(); location.reload(); return; }"
+         "set('sb-hs', d.h_score); set('sb-gs', d.g_score); set('sb-clock', d.clock); set('sb-period', d.period_label);"
+         "var hf = document.getElementById('sb-hf'), gf = document.getElementById('sb-gf');"
+         "if (hf) hf.innerHTML = dots(d.h_fouls); if (gf) gf.innerHTML = dots(d.g_fouls);"
+         "if (d.final) src.close(); };"
+         "})();</script>")
+# --- END OF FILE src/templates.py ---
@@ -0,0 +1,236 @@
+# --- START OF FILE src/tracing.py ---
+# Leichte Zeitmessung für die heißen Pfade: API-Abrufe (src/api.py), HTTP (src/http_client.py),
+# HTML-Bausteine (src/html_gen.py), Bilder (src/image_store.py), pandas-Aufbereitung und wkhtmltopdf.
+# Pro Name werden Aufrufe, Zeit, übertragene Bytes, HTTP-Anfragen, Retries und Cache-Treffer gesammelt:
+#   - prozessweit (metrics_text() -> Prometheus-Format, /metrics im OBS-Server)
+#   - pro Streamlit-Durchlauf einer Sitzung (begin_run() am Skriptanfang, Entwickler-Panel in der Sidebar)
+# Spans derselben Thread-Kette sind verschachtelt: Bytes/Anfragen/Retries zählen auch beim aufrufenden Span mit.
+import time
+import functools
+import threading
+from collections import OrderedDict
+import streamlit as st
+from src.config import TRACING_ENABLED, TRACING_RUN_MAX_SPANS
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+_FIELDS = ("calls", "seconds", "max_s", "errors", "bytes", "requests", "retries", "hits", "misses")
+
+_lock = threading.Lock()
+_totals = {}               # (kind, name) -> {feld: wert}
+_runs = OrderedDict()      # session_id -> {"started", "spans": [...], "dropped"}
+_local = threading.local()
+
+def _session_id():
+    if get_script_run_ctx is None: return None
+    try: ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception: return None
+    return ctx.session_id if ctx else None
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None: stack = _local.stack = []
+    return stack
+
+class Span:
+    __slots__ = ("name", "kind", "start", "seconds", "child_s", "bytes", "requests", "retries", "cache", "error")
+
+    def __init__(self, name, kind):
+        self.name = name; self.kind = kind
+        self.bytes = self.requests = self.retries = 0
+        self.cache = None; self.error = False; self.seconds = self.child_s = 0.0
+
+    def __enter__(self):
+        _stack().append(self); self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        self.error = exc_type is not None
+        stack = _stack(); stack.pop()
+        if stack:
+            parent = stack[-1]
+            parent.bytes += self.bytes; parent.requests += self.requests; parent.retries += self.retries
+            parent.child_s += self.seconds
+        _record(self)
+        return False
+
+class _NoSpan:
+    """Ersatz bei TRACING_ENABLED = False."""
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NO_SPAN = _NoSpan()
+
+def span(name, kind="code"):
+    """Kontextmanager: with span("wkhtmltopdf", "pdf"): ..."""
+    return Span(name, kind) if TRACING_ENABLED else _NO_SPAN
+
+def _record(s):
+    with _lock:
+        t = _totals.get((s.kind, s.name))
+        if t is None: t = _totals[(s.kind, s.name)] = dict.fromkeys(_FIELDS, 0)
+        t["calls"] += 1; t["seconds"] += s.seconds; t["max_s"] = max(t["max_s"], s.seconds)
+        t["errors"] += s.error; t["bytes"] += s.bytes; t["requests"] += s.requests; t["retries"] += s.retries
+        if s.cache == "hit": t["hits"] += 1
+        elif s.cache == "miss": t["misses"] += 1
+    sid = _session_id()
+    if sid is None: return
+    with _lock:
+        run = _runs.get(sid)
+        if run is None: return
+        if len(run["spans"]) >= TRACING_RUN_MAX_SPANS: run["dropped"] += 1; return
+        run["spans"].append((s.kind, s.name, s.seconds, s.seconds - s.child_s, s.bytes, s.requests, s.retries, s.cache, s.error))
+
+def record(name, kind, seconds, bytes=0, error=False):
+    """Von außen gemessene Dauer eintragen (z.B. PDF aus dem Worker-Prozess)."""
+    if not TRACING_ENABLED: return
+    with _lock:
+        t = _totals.get((kind, name))
+        if t is None: t = _totals[(kind, name)] = dict.fromkeys(_FIELDS, 0)
+        t["calls"] += 1; t["seconds"] += seconds; t["max_s"] = max(t["max_s"], seconds); t["bytes"] += bytes; t["errors"] += error
+
+def add_http(nbytes, retries):
+    """Von src/http_client.py pro Antwort aufgerufen (auf dem innersten offenen Span)."""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        s = stack[-1]; s.bytes += nbytes; s.requests += 1; s.retries += retries
+
+def mark_cache(hit):
+    """Treffer/Fehlschuss eines Caches für den innersten Span (nur der erste Eintrag zählt)."""
+    stack = getattr(_local, "stack", None)
+    if stack and stack[-1].cache is None: stack[-1].cache = "hit" if hit else "miss"
+
+# --- DEKORATOREN ---
+
+def traced(kind, name=None):
+    """@traced("html") - misst jeden Aufruf der Funktion."""
+    def deco(fn):
+        if not TRACING_ENABLED: return fn
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(label, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def cached_fetcher(**cache_kwargs):
+    """Ersatz für @st.cache_data(...) bei API-Abrufen: misst jeden Aufruf, unterscheidet Cache-Treffer
+    (Funktionsrumpf läuft nicht) von Fehlschüssen und führt Buch in src/cache_registry.py. .clear() wie bisher."""
+    from src import cache_registry
+    def deco(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            mark_cache(False)
+            frames = getattr(_local, "cache_frames", None)
+            if frames: frames[-1]["miss"] = True
+            return fn(*args, **kwargs)
+        cached = st.cache_data(**cache_kwargs)(body)
+        stats = cache_registry.register(fn, cached, cache_kwargs)
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            frames = getattr(_local, "cache_frames", None)
+            if frames is None: frames = _local.cache_frames = []
+            frame = {"miss": False}; frames.append(frame)
+            try:
+                with span(fn.__name__, "api") as s:
+                    result = cached(*args, **kwargs)
+                    if getattr(s, "cache", "") is None: s.cache = "hit"
+            finally: frames.pop()
+            stats.record(args, kwargs, frame["miss"], result if frame["miss"] else None)
+            return result
+        wrapper.clear = cached.clear
+        return wrapper
+    return deco
+
+# --- DURCHLÄUFE ---
+
+def begin_run():
+    """Am Anfang jedes Skriptdurchlaufs: startet die Messung für diese Sitzung neu."""
+    sid = _session_id()
+    if sid is None or not TRACING_ENABLED: return
+    with _lock:
+        _runs[sid] = {"started": time.time(), "spans": [], "dropped": 0}; _runs.move_to_end(sid)
+        while len(_runs) > 64: _runs.popitem(last=False)
+
+def run_summary(session_id=None):
+    """Aggregat des laufenden Durchlaufs: {"elapsed", "dropped", "by_kind": {...}, "by_name": [...]}.
+    by_name enthält die Zeit inklusive aufgerufener Spans, by_kind nur die eigene Zeit je Art."""
+    sid = session_id or _session_id()
+    with _lock:
+        run = _runs.get(sid)
+        if run is None: return None
+        spans = list(run["spans"]); started = run["started"]; dropped = run["dropped"]
+    by_name = {}; by_kind = {}
+    for kind, name, sec, self_s, nbytes, reqs, retries, cache, error in spans:
+        row = by_name.setdefault((kind, name), {"kind": kind, "name": name, **dict.fromkeys(_FIELDS, 0)})
+        row["calls"] += 1; row["seconds"] += sec; row["max_s"] = max(row["max_s"], sec); row["errors"] += error
+        row["bytes"] += nbytes; row["requests"] += reqs; row["retries"] += retries
+        if cache == "hit": row["hits"] += 1
+        elif cache == "miss": row["misses"] += 1
+        k = by_kind.setdefault(kind, {"calls": 0, "seconds": 0.0})
+        k["calls"] += 1; k["seconds"] += self_s  # ohne verschachtelte Spans, damit sich die Arten nicht doppelt zählen
+    rows = sorted(by_name.values(), key=lambda r: r["seconds"], reverse=True)
+    return {"elapsed": time.time() - started, "dropped": dropped, "by_kind": by_kind, "by_name": rows}
+
+def totals():
+    with _lock: return {key: dict(v) for key, v in _totals.items()}
+
+def reset():
+    with _lock: _totals.clear()
+
+# --- EXPORT ---
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+# Feld -> (Metrik-Suffix, Typ, Beschreibung)
+_METRICS = [
+    ("calls", "calls_total", "counter", "Aufrufe"),
+    ("seconds", "seconds_total", "counter", "Gesamtzeit in Sekunden"),
+    ("max_s", "seconds_max", "gauge", "Längster Aufruf in Sekunden"),
+    ("errors", "errors_total", "counter", "Aufrufe mit Ausnahme"),
+    ("bytes", "bytes_total", "counter", "Übertragene Bytes (HTTP)"),
+    ("requests", "requests_total", "counter", "HTTP-Anfragen"),
+    ("retries", "retries_total", "counter", "HTTP-Wiederholungen"),
+    ("hits", "cache_hits_total", "counter", "Cache-Treffer"),
+    ("misses", "cache_misses_total", "counter", "Cache-Fehlschüsse"),
+]
+
+def metrics_text(prefix="scouting"):
+    """Prozessweite Summen im Prometheus-Textformat."""
+    data = sorted(totals().items()); lines = []
+    for field, suffix, mtype, help_text in _METRICS:
+        metric = f"{prefix}_span_{suffix}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {mtype}"]
+        for (kind, name), v in data:
+            lines.append(f'{metric}{{kind="{_label(kind)}",name="{_label(name)}"}} {v[field]:.6g}')
+    return "\n".join(lines) + "\n"
+
+# --- ENTWICKLER-PANEL ---
+
+def render_dev_panel():
+    """Sidebar: Zeitaufteilung dieses Durchlaufs (API / HTTP / HTML / Bilder / pandas / PDF) und Prozess-Summen."""
+    import pandas as pd
+    with st.sidebar.expander("🛠️ Laufzeit (Entwickler)", expanded=True):
+        summary = run_summary()
+        if not summary or not summary["by_name"]:
+            st.caption("Keine Messungen in diesem Durchlauf."); return
+        st.caption(f"Durchlauf: {summary['elapsed'] * 1000:.0f} ms" + (f" · {summary['dropped']} Spans verworfen" if summary["dropped"] else ""))
+        st.dataframe(pd.DataFrame([{"Art": k, "Aufrufe": v["calls"], "eigene ms": round(v["seconds"] * 1000, 1)} for k, v in sorted(summary["by_kind"].items())]),
+                     hide_index=True, use_container_width=True)
+        df = pd.DataFrame(summary["by_name"])
+        df["ms"] = (df["seconds"] * 1000).round(1); df["KiB"] = (df["bytes"] / 1024).round(1)
+        st.dataframe(df[["kind", "name", "calls", "ms", "KiB", "requests", "retries", "hits", "misses", "errors"]],
+                     hide_index=True, use_container_width=True, height=300)
+        if st.checkbox("Prozess-Summen", key="dev_totals"):
+            rows = [{"kind": k, "name": n, **v} for (k, n), v in totals().items()]
+            if rows:
+                tot = pd.DataFrame(rows).sort_values("seconds", ascending=False)
+                tot["ms"] = (tot["seconds"] * 1000).round(1)
+                st.dataframe(tot[["kind", "name", "calls", "ms", "bytes", "requests", "retries", "hits", "misses", "errors"]], hide_index=True, use_container_width=True)
+# --- END OF FILE src/tracing.py ---
@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
-import requests
 import base64
-from io import BytesIO
-from PIL import Image
 from src.config import API_HEADERS
+from src.http_client import api_get
+from src import image_store
 
 # Grauer Platzhalter (Base64)
 GRAY_BOX_B64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
@@ -16,7 +15,7 @@ def get_logo_url(team_id, season_id):
 def optimize_image_base64(url):
     if not url: return ""
     try:
-        response = requests.get(url, timeout=3)
+        response = api_get(url, endpoint="image", timeout=3)
         if response.status_code == 200:
             # Bilddaten in Base64 umwandeln
             encoded = base64.b64encode(response.content).decode()
@@ -50,40 +49,22 @@ def clean_pos(pos_str):
 
 @st.cache_data(show_spinner=False)
 def optimize_image_base64(url):
+    """PDF-taugliches Bild (max. 300px hoch, weiß hinterlegt, JPEG) aus dem persistenten Bild-Speicher."""
     if not url or "placeholder" in url:
         return GRAY_BOX_B64
     try:
-        response = requests.get(url, headers=API_HEADERS, timeout=2)
-        if response.status_code == 200:
-            img = Image.open(BytesIO(response.content))
-            
-            # 1. Größe anpassen
-            base_height = 300
-            if img.size[1] > base_height:
-                w_percent = base_height / float(img.size[1])
-                w_size = int(float(img.size[0]) * float(w_percent))
-                img = img.resize((w_size, base_height), Image.Resampling.LANCZOS)
-
-            # 2. Transparenz durch Weiß ersetzen (Fix für schwarze Hintergründe)
-            new_img = Image.new("RGB", img.size, (255, 255, 255))
-            
-            if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                new_img.paste(img, mask=img.split()[3])
-            else:
-                new_img.paste(img)
-
-            # 3. Als JPEG speichern
-            buffer = BytesIO()
-            new_img.save(buffer, format="JPEG", quality=90)
-            img_str = base64.b64encode(buffer.getvalue()).decode()
-            
-            return f"data:image/jpeg;base64,{img_str}"
-            
+        uri = image_store.data_uri(url, "pdf", headers=API_HEADERS)
+        if uri: return uri
     except Exception:
         pass
     return GRAY_BOX_B64
+
+@st.cache_data(show_spinner=False)
+def image_variant_uri(url, variant, fallback=""):
+    """Bild in einer der Größen aus image_store.VARIANTS (obs, potg, ui) als Data-URI."""
+    if not url or "placeholder" in url: return fallback
+    try: return image_store.data_uri(url, variant, headers=API_HEADERS) or fallback
+    except Exception: return fallback
 def clean_pos(pos_str):
     if not pos_str: return "-"
     # Ersetzt Unterstriche durch Leerzeichen und macht den ersten Buchstaben groß
@@ -0,0 +1,146 @@
+# --- START OF FILE src/warehouse.py ---
+# Liga-Datenbestand: lädt Spielerstatistik, Team-Saisonwerte und Spielpläne aller Teams aus TEAMS_DB
+# parallel und legt sie als drei Tabellen ab (players / teams / games).
+# Ranglisten und ligaweite Ansichten laufen danach als reine DataFrame-Abfragen im Speicher.
+#
+# CLI:
+#   python -m src.warehouse build [--staffel Nord] [--format parquet] [--out .cache/warehouse]
+#   python -m src.warehouse top PPG [--staffel Süd] [--n 10]
+import os
+import time
+import argparse
+import pandas as pd
+import streamlit as st
+from src.config import TEAMS_DB, SEASON_ID, CACHE_DIR, WAREHOUSE_WORKERS
+from src.api import fetch_team_data, fetch_schedule
+from src.parallel import run_parallel
+from src.leaderboard import league_leaders
+
+try:
+    import pyarrow  # noqa: F401 (für to_parquet / to_feather)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+WAREHOUSE_DIR = os.path.join(CACHE_DIR, "warehouse")
+TABLES = ("players", "teams", "games")
+
+# Spalten aus fetch_team_data, die in die Spielertabelle übernommen werden (Rohspalten der API variieren je Team)
+PLAYER_COLUMNS = ["PLAYER_ID", "NAME_FULL", "NR", "AGE", "NATIONALITY", "HEIGHT_ROSTER", "GP", "TOTAL_MINUTES", "MIN_DISPLAY",
+                  "TOTAL_PTS", "TOTAL_REB", "TOTAL_AST", "TOTAL_STL", "TOTAL_TO", "TOTAL_BLK", "TOTAL_PF", "TOTAL_OR", "TOTAL_DR",
+                  "TOTAL_FGM", "TOTAL_FGA", "TOTAL_2M", "TOTAL_2A", "TOTAL_3M", "TOTAL_3A", "TOTAL_FTM", "TOTAL_FTA",
+                  "PPG", "TOT", "AS", "ST", "TO", "BS", "PF", "OR", "DR", "2M", "2A", "3M", "3A", "FTM", "FTA",
+                  "FG%", "2PCT", "3PCT", "FTPCT"]
+
+def _load_team(args):
+    team_id, season_id = args
+    df, ts = fetch_team_data(team_id, season_id)
+    games = fetch_schedule(team_id, season_id)
+    return team_id, df, ts, games
+
+def _team_record(team_id, games):
+    wins = losses = 0
+    for g in games:
+        if not g.get("has_result"): continue
+        is_home = str(g.get("homeTeamId")) == str(team_id)
+        own = g["home_score"] if is_home else g["guest_score"]; opp = g["guest_score"] if is_home else g["home_score"]
+        if own > opp: wins += 1
+        elif own < opp: losses += 1
+    return wins, losses
+
+def build_warehouse(season_id=SEASON_ID, staffel=None, max_workers=WAREHOUSE_WORKERS):
+    """Lädt alle Teams (optional nur eine Staffel) parallel. Gibt {"players", "teams", "games"} als DataFrames zurück."""
+    team_ids = [tid for tid, info in TEAMS_DB.items() if staffel is None or info.get("staffel") == staffel]
+    results = run_parallel(_load_team, [(tid, season_id) for tid in team_ids], max_workers)
+
+    players, teams, games = [], [], []
+    for team_id, df, ts, sched in results:
+        info = TEAMS_DB.get(team_id, {})
+        base = {"TEAM_ID": team_id, "TEAM_NAME": info.get("name", str(team_id)), "STAFFEL": info.get("staffel", "-")}
+        if df is not None and not df.empty:
+            p = df[[c for c in PLAYER_COLUMNS if c in df.columns]].copy()
+            for k, v in base.items(): p.insert(0, k, v)
+            players.append(p)
+        wins, losses = _team_record(team_id, sched)
+        teams.append({**base, "W": wins, "L": losses, "GAMES": wins + losses, **{k.upper(): v for k, v in (ts or {}).items()}})
+        for g in sched: games.append({**g, "TEAM_ID": team_id})
+
+    df_players = pd.concat(players, ignore_index=True) if players else pd.DataFrame(columns=["TEAM_ID", "TEAM_NAME", "STAFFEL"] + PLAYER_COLUMNS)
+    df_teams = pd.DataFrame(teams)
+    df_games = pd.DataFrame(games)
+    if not df_games.empty: df_games = df_games.drop_duplicates(subset="id").reset_index(drop=True)
+    return {"players": df_players, "teams": df_teams, "games": df_games, "built_at": time.time(), "season_id": season_id}
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def load_league_warehouse(season_id, staffel=None):
+    return build_warehouse(season_id, staffel)
+
+# --- ABFRAGEN ---
+
+def top_players(wh, stat, n=10, staffel=None, min_games=1, ascending=False):
+    if wh["players"].empty or stat not in wh["players"].columns: return wh["players"].head(0)
+    return league_leaders(wh, {stat: (stat, ascending, None)}, n, staffel, min_games)[stat]
+
+def team_rankings(wh, stat="PPG", staffel=None, ascending=False):
+    df = wh["teams"]
+    if df.empty or stat not in df.columns: return df.head(0)
+    if staffel: df = df[df["STAFFEL"] == staffel]
+    out = df.sort_values(stat, ascending=ascending, kind="stable").reset_index(drop=True)
+    out.insert(0, "RANG", range(1, len(out) + 1))
+    return out
+
+def players_of_team(wh, team_id):
+    df = wh["players"]
+    return df[df["TEAM_ID"] == team_id].reset_index(drop=True)
+
+# --- SPEICHERN / LADEN ---
+
+def _export_frame(df):
+    # Spalten mit gemischten Typen (z.B. AGE: 24 oder "-") als Text speichern, sonst lehnt Arrow sie ab
+    obj = [c for c in df.columns if df[c].dtype == object]
+    return df.astype({c: str for c in obj}) if obj else df
+
+def save_warehouse(wh, directory=WAREHOUSE_DIR, fmt="parquet"):
+    """Schreibt players/teams/games als Parquet oder Feather. Benötigt pyarrow."""
+    if not HAS_PYARROW: raise RuntimeError("pyarrow ist nicht installiert (pip install pyarrow).")
+    if fmt not in ("parquet", "feather"): raise ValueError(f"Unbekanntes Format: {fmt}")
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name in TABLES:
+        path = os.path.join(directory, f"{name}.{fmt}")
+        df = _export_frame(wh[name]).reset_index(drop=True)
+        if fmt == "parquet": df.to_parquet(path, index=False)
+        else: df.to_feather(path)
+        paths[name] = path
+    return paths
+
+def load_warehouse_file(directory=WAREHOUSE_DIR, fmt="parquet"):
+    if not HAS_PYARROW: raise RuntimeError("pyarrow ist nicht installiert (pip install pyarrow).")
+    reader = pd.read_parquet if fmt == "parquet" else pd.read_feather
+    wh = {name: reader(os.path.join(directory, f"{name}.{fmt}")) for name in TABLES}
+    wh["built_at"] = os.path.getmtime(os.path.join(directory, f"players.{fmt}")); wh["season_id"] = None
+    return wh
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.warehouse", description="Liga-Datenbestand bauen und abfragen.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="Alle Teams laden und speichern")
+    p_build.add_argument("--season", default=SEASON_ID); p_build.add_argument("--staffel", default=None)
+    p_build.add_argument("--format", default="parquet", choices=["parquet", "feather"]); p_build.add_argument("--out", default=WAREHOUSE_DIR)
+    p_top = sub.add_parser("top", help="Rangliste aus gespeichertem Bestand")
+    p_top.add_argument("stat"); p_top.add_argument("--staffel", default=None); p_top.add_argument("--n", type=int, default=10)
+    p_top.add_argument("--format", default="parquet", choices=["parquet", "feather"]); p_top.add_argument("--dir", default=WAREHOUSE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        t = time.time(); wh = build_warehouse(args.season, args.staffel)
+        print(f"{len(wh['teams'])} Teams, {len(wh['players'])} Spieler, {len(wh['games'])} Spiele in {time.time() - t:.1f}s")
+        for name, path in save_warehouse(wh, args.out, args.format).items(): print(f"  {name:<8} -> {path}")
+    elif args.cmd == "top":
+        wh = load_warehouse_file(args.dir, args.format)
+        print(top_players(wh, args.stat, args.n, args.staffel)[["TEAM_NAME", "NAME_FULL", "GP", args.stat]].to_string(index=False))
+
+if __name__ == "__main__":
+    main()
+# --- END OF FILE src/warehouse.py ---